@@ -0,0 +1,76 @@
+from fastapi import APIRouter
+
+from app.services.answer_queue import answer_queue
+from app.services.embed_service import get_embedding_cache_stats
+from app.services.ingredient_llm_mapper import get_ingredient_cache_stats
+from app.services.recipe_snapshot import snapshot_holder
+from app.services.session_manager import get_session_stats
+from app.services.tag_cache import get_tag_cache_stats
+from app.services.upstream import upstream_stats
+from app.utils.latency import latency_metrics
+
+router = APIRouter()
+
+
+@router.post("/admin/reload")
+def reload_snapshot():
+    """
+    벡터 / 카탈로그 / 카테고리를 백그라운드에서 다시 읽어 교체
+    (진행 중인 요청은 기존 snapshot 으로 끝까지 처리)
+    """
+    started = snapshot_holder.reload_async()
+    return {
+        "started": started,
+        "reloading": snapshot_holder.reloading,
+        "current": snapshot_holder.current().info(),
+    }
+
+
+@router.get("/admin/snapshot")
+def snapshot_info():
+    return {
+        "reloading": snapshot_holder.reloading,
+        "last_error": snapshot_holder.last_error,
+        "current": snapshot_holder.current().info(),
+    }
+
+
+@router.get("/admin/upstreams")
+def upstreams_info():
+    """
+    Ollama / Spring 요청 수, 재시도, 실패, 서킷 상태
+    """
+    return upstream_stats()
+
+
+@router.get("/admin/caches")
+def caches_info():
+    return {
+        "embedding": get_embedding_cache_stats(),
+        "tags": get_tag_cache_stats(),
+        "ingredients": get_ingredient_cache_stats(),
+    }
+
+
+@router.get("/admin/answers")
+def answers_info():
+    """
+    백그라운드 답변 생성 큐 (대기 / 생성 / fallback / 거절 수)
+    """
+    return answer_queue.info()
+
+
+@router.get("/admin/sessions")
+def sessions_info():
+    """
+    세션 수 / 기록 수 / LRU 제거 / 만료 제거
+    """
+    return get_session_stats()
+
+
+@router.get("/admin/latency")
+def latency_info():
+    """
+    구간별 지연 시간 p50 / p90 / p99 (최근 요청 기준)
+    """
+    return latency_metrics.stats()
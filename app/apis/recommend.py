@@ -1,13 +1,31 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from uuid import uuid4
-
-from app.services.llm_client import analyze_text, normalize_tags
-from app.services.llm_response import generate_response
-from app.services.ingredient_llm_mapper import normalize_ingredients_with_llm
+import asyncio
+import json
+import time
+
+from app.services.tag_cache import extract_tags, extract_tags_async
+from app.services.llm_response import (
+    generate_response,
+    generate_response_async,
+    generate_response_stream,
+)
+from app.services.ingredient_llm_mapper import (
+    normalize_ingredients_with_llm,
+    normalize_ingredients_with_llm_async,
+)
+from app.services.answer_queue import answer_queue
 from app.services.rule_adjust import rule_adjust
-from app.services.recommend_engine import get_next_recipe
+from app.services.recommend_engine import get_candidates, get_next_recipe, TOP_K, MAX_TOP_K
+from app.services.embed_service import get_embedding
 from app.services.session_manager import get_seen, add_seen, get_last_seen
-from models.recipe_loader import load_all_recipe_categories
+from app.services.query_vector import warm_query_vectors
+from app.services.recipe_snapshot import RecipeSnapshot, snapshot_holder
+from app.utils.latency import latency_metrics
+from app.utils.normalize import normalize_query
+from app.utils.stage_pipeline import StagePipeline
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -15,8 +33,13 @@ router = APIRouter()
 
 
 
-# 🔥 레시피 ID → 카테고리 매핑 (AI 내부 판단용)
-ALL_CATEGORY_MAP = load_all_recipe_categories()
+# 🔥 벡터 / 레시피 카탈로그 / 카테고리 맵 적재 (이후 조회는 전부 메모리)
+#    파일·카탈로그가 바뀌면 백그라운드에서 새 snapshot 으로 교체
+snapshot_holder.current()
+snapshot_holder.start_watcher()
+
+# 🔥 카테고리/재료 임베딩 미리 계산
+warm_query_vectors()
 
 # 🔥 후속 발화 판단 키워드
 FOLLOWUP_KEYWORDS = ["말고", "더", "좀", "조금", "다른"]
@@ -26,20 +49,24 @@ def is_followup_query(query: str) -> bool:
     return any(k in query for k in FOLLOWUP_KEYWORDS)
 
 
-def inherit_previous_category(tags: dict, query: str, user_id: str):
+def inherit_previous_category(
+    tags: dict, query: str, user_id: str, snapshot: RecipeSnapshot, last_seen: dict | None = None
+):
     """
     후속 발화이고 category가 비어 있으면
     이전 추천 레시피의 카테고리를 상속
+    (카테고리는 요청이 잡은 snapshot 의 테이블에서, last_seen 을 미리 조회해 뒀으면 그대로 사용)
     """
     if not is_followup_query(query):
         return tags
 
-    last_seen = get_last_seen(user_id)
+    if last_seen is None:
+        last_seen = get_last_seen(user_id)
     if not last_seen:
         return tags
 
     last_recipe_id = last_seen["recipe_id"]
-    last_categories = ALL_CATEGORY_MAP.get(str(last_recipe_id), [])
+    last_categories = snapshot.categories.categories_of(last_recipe_id)
 
     if last_categories:
         tags["category"] = [last_categories[0]]
@@ -47,21 +74,112 @@ def inherit_previous_category(tags: dict, query: str, user_id: str):
     return tags
 
 
+def session_state(user_id: str) -> tuple[frozenset, dict | None]:
+    """
+    (seen, last_seen) — 세션 저장소 조회 (sqlite 백엔드면 디스크 I/O, async 라우트는 스레드풀에서 호출)
+    """
+    return get_seen(user_id), get_last_seen(user_id)
+
+
+def build_chat_tags(
+    tags: dict, query: str, user_id: str, snapshot: RecipeSnapshot, last_seen: dict | None = None
+) -> dict:
+    tags = rule_adjust(tags, query)
+    tags = inherit_previous_category(tags, query, user_id, snapshot, last_seen)
+    return tags
+
+
+def same_tags(a: dict | None, b: dict | None) -> bool:
+    # 후보 계산 결과가 같아지는 조건 (재료 순서는 무관)
+    if a is None or b is None:
+        return False
+    return (
+        a.get("category") == b.get("category")
+        and set(a.get("ingredients", [])) == set(b.get("ingredients", []))
+    )
+
+
+def fridge_tags(normalized_ingredients: list[str]) -> dict:
+    return {
+        "mode": "fridge",   # 🔥 반드시 필요
+        "category": [],
+        "ingredients": normalized_ingredients
+    }
+
+
+def normalize_fridge_recipe_id(recipe: dict | None) -> dict | None:
+    # 🔥🔥🔥 여기서 키 정규화 (핵심)
+    if recipe and "recipe_id" not in recipe:
+        if "recipeId" in recipe:
+            recipe["recipe_id"] = recipe["recipeId"]
+        elif "id" in recipe:
+            recipe["recipe_id"] = recipe["id"]
+    return recipe
+
+
+def deferred_answer(recipe: dict, **kwargs) -> dict:
+    """
+    답변 생성을 백그라운드 큐에 넣고 티켓만 반환 (GET /recommend/answer/{ticket} 로 조회)
+    """
+    ticket = answer_queue.submit(recipe, **kwargs)
+    return {"answer": None, "answer_ticket": ticket.id}
+
+
 @router.get("/recommend/chat")
-def recommend_chat(query: str, user_id: str | None = None):
+def recommend_chat(
+    query: str,
+    user_id: str | None = None,
+    top_k: int = Query(TOP_K, ge=1, le=MAX_TOP_K),
+    defer_answer: bool = False,
+):
 
     if user_id is None:
         user_id = f"guest-{uuid4()}"
 
-    raw_tags = analyze_text(query)
-    tags = normalize_tags(raw_tags)
+    # --------------------------------------------------------
+    # 단계 DAG (LLM 태그 추출을 기다리는 동안 나머지를 미리)
+    #   snapshot / seen / last_seen / 문장 임베딩  ── 서로 독립
+    #   spec_tags(사전 매칭 추정) + seen → spec_candidates(본 레시피 뺀 투기적 후보 랭킹)
+    #   tags(LLM, 요청 스레드) → 추정과 같으면 spec_candidates 재사용, 다르면 취소
+    # --------------------------------------------------------
+    normalized_query = normalize_query(query)
+
+    pipe = StagePipeline("chat")
+    pipe.stage("snapshot", snapshot_holder.current)
+    pipe.stage("seen", lambda: get_seen(user_id))
+    pipe.stage("last_seen", lambda: get_last_seen(user_id))
+    pipe.stage("embedding", lambda: get_embedding(normalized_query))
+    pipe.stage(
+        "spec_tags",
+        lambda snapshot, last_seen: build_chat_tags(
+            snapshot.rule_tagger.extract(query, strict=False) or {"category": [], "ingredients": []},
+            query, user_id, snapshot, last_seen,
+        ),
+        "snapshot", "last_seen",
+    )
+    pipe.stage(
+        "spec_candidates",
+        lambda snapshot, spec_tags, seen, _: get_candidates(normalized_query, spec_tags, top_k, snapshot, seen),
+        "snapshot", "spec_tags", "seen", "embedding",
+    )
+
+    raw_tags = pipe.call("tags", extract_tags, query)
+    tags = build_chat_tags(raw_tags, query, user_id, pipe.result("snapshot"), pipe.result("last_seen"))
 
-    tags = rule_adjust(tags, query)
-    tags = inherit_previous_category(tags, query, user_id)
+    candidates = None
+    if same_tags(tags, pipe.optional_result("spec_tags")):
+        candidates = pipe.optional_result("spec_candidates")
+    else:
+        pipe.cancel("spec_candidates")
 
-    seen_ids = get_seen(user_id)
+    recipe = pipe.call(
+        "rank",
+        get_next_recipe,
+        query, tags, pipe.result("seen"),
+        top_k=top_k, snapshot=pipe.result("snapshot"), candidates=candidates,
+    )
 
-    recipe = get_next_recipe(query, tags, seen_ids)
+    print("⏱ CHAT STAGES", pipe.finish())
 
     # ✅ 여기서 recipeId 기준으로 검사
     if not recipe or not recipe.get("recipeId"):
@@ -77,6 +195,15 @@ def recommend_chat(query: str, user_id: str | None = None):
     recipe_id = recipe["recipeId"]
     add_seen(user_id, recipe_id)
 
+    if defer_answer:
+        return {
+            "user_id": user_id,
+            "query": query,
+            "recipe_id": recipe_id,
+            "tags": tags,
+            **deferred_answer(recipe, user_query=query, prev_recipe=None),
+        }
+
     answer = generate_response(
         user_query=query,
         recipe=recipe,
@@ -96,6 +223,7 @@ def recommend_chat(query: str, user_id: str | None = None):
 class FridgeRecommendRequest(BaseModel):
     ingredients: List[str]
     user_id: Optional[str] = None
+    defer_answer: bool = False
     
 @router.post("/recommend/fridge")
 def recommend_fridge(req: FridgeRecommendRequest):
@@ -108,11 +236,7 @@ def recommend_fridge(req: FridgeRecommendRequest):
 
     normalized_ingredients = normalize_ingredients_with_llm(req.ingredients)
     print("🧊 NORMALIZED INGREDIENTS =", normalized_ingredients)
-    tags = {
-        "mode": "fridge",   # 🔥 반드시 필요
-        "category": [],
-        "ingredients": normalized_ingredients
-    }
+    tags = fridge_tags(normalized_ingredients)
 
     seen_ids = get_seen(user_id)
 
@@ -122,14 +246,7 @@ def recommend_fridge(req: FridgeRecommendRequest):
         seen_ids=seen_ids
     )
 
-    
-
-    # 🔥🔥🔥 여기서 키 정규화 (핵심)
-    if recipe and "recipe_id" not in recipe:
-        if "recipeId" in recipe:
-            recipe["recipe_id"] = recipe["recipeId"]
-        elif "id" in recipe:
-            recipe["recipe_id"] = recipe["id"]
+    recipe = normalize_fridge_recipe_id(recipe)
 
     print("🔥 FINAL FRIDGE RECIPE =", recipe)
 
@@ -144,6 +261,20 @@ def recommend_fridge(req: FridgeRecommendRequest):
     recipe_id = recipe["recipe_id"]
     add_seen(user_id, recipe_id)
 
+    if req.defer_answer:
+        return {
+            "user_id": user_id,
+            "recipe_id": recipe_id,
+            "tags": tags,
+            **deferred_answer(
+                recipe,
+                user_query="냉장고 재료로 추천",
+                prev_recipe=None,
+                mode="fridge",
+                fridge_ingredients=normalized_ingredients,
+            ),
+        }
+
     answer = generate_response(
     user_query="냉장고 재료로 추천",
     recipe=recipe,
@@ -157,4 +288,233 @@ def recommend_fridge(req: FridgeRecommendRequest):
         "recipe_id": recipe_id,
         "answer": answer,
         "tags": tags
-    }
\ No newline at end of file
+    }
+
+
+# ==============================
+# 비동기 파이프라인
+# - LLM 호출은 keep-alive 풀 + 동시 요청 수 제한 (app.services.upstream)
+# - 임베딩 / 행렬 연산은 CPU 작업이라 스레드풀에서 실행
+# ==============================
+@router.get("/recommend/chat/async")
+async def recommend_chat_async(
+    query: str,
+    user_id: str | None = None,
+    top_k: int = Query(TOP_K, ge=1, le=MAX_TOP_K),
+    defer_answer: bool = False,
+):
+
+    if user_id is None:
+        user_id = f"guest-{uuid4()}"
+
+    # 요청 하나는 처음 잡은 snapshot 만 사용 (카테고리 상속 / 후보 랭킹 모두)
+    snapshot = snapshot_holder.current()
+
+    # LLM 태그 추출을 기다리는 동안 세션 조회 (이벤트 루프에서 블로킹 I/O 없음)
+    raw_tags, (seen_ids, last_seen) = await asyncio.gather(
+        extract_tags_async(query),
+        run_in_threadpool(session_state, user_id),
+    )
+    tags = build_chat_tags(raw_tags, query, user_id, snapshot, last_seen)
+
+    recipe = await run_in_threadpool(get_next_recipe, query, tags, seen_ids, top_k=top_k, snapshot=snapshot)
+
+    if not recipe or not recipe.get("recipeId"):
+        return {
+            "user_id": user_id,
+            "query": query,
+            "recipe_id": None,
+            "answer": "조건에 맞는 레시피를 찾지 못했어요.",
+            "tags": tags
+        }
+
+    recipe_id = recipe["recipeId"]
+    await run_in_threadpool(add_seen, user_id, recipe_id)
+
+    if defer_answer:
+        return {
+            "user_id": user_id,
+            "query": query,
+            "recipe_id": recipe_id,
+            "tags": tags,
+            **deferred_answer(recipe, user_query=query, prev_recipe=None),
+        }
+
+    answer = await generate_response_async(
+        user_query=query,
+        recipe=recipe,
+        prev_recipe=None
+    )
+
+    return {
+        "user_id": user_id,
+        "query": query,
+        "recipe_id": recipe_id,
+        "answer": answer,
+        "tags": tags
+    }
+
+
+@router.post("/recommend/fridge/async")
+async def recommend_fridge_async(req: FridgeRecommendRequest):
+
+    user_id = req.user_id or f"guest-{uuid4()}"
+
+    normalized_ingredients, seen_ids = await asyncio.gather(
+        normalize_ingredients_with_llm_async(req.ingredients),
+        run_in_threadpool(get_seen, user_id),
+    )
+    tags = fridge_tags(normalized_ingredients)
+
+    recipe = await run_in_threadpool(
+        get_next_recipe,
+        user_query="냉장고 재료 기반 추천",
+        tags=tags,
+        seen_ids=seen_ids
+    )
+    recipe = normalize_fridge_recipe_id(recipe)
+
+    if not recipe or not recipe.get("recipe_id"):
+        return {
+            "user_id": user_id,
+            "recipe_id": None,
+            "answer": "해당 재료로 만들 수 있는 레시피를 찾지 못했어요.",
+            "tags": tags
+        }
+
+    recipe_id = recipe["recipe_id"]
+    await run_in_threadpool(add_seen, user_id, recipe_id)
+
+    if req.defer_answer:
+        return {
+            "user_id": user_id,
+            "recipe_id": recipe_id,
+            "tags": tags,
+            **deferred_answer(
+                recipe,
+                user_query="냉장고 재료로 추천",
+                prev_recipe=None,
+                mode="fridge",
+                fridge_ingredients=normalized_ingredients,
+            ),
+        }
+
+    answer = await generate_response_async(
+        user_query="냉장고 재료로 추천",
+        recipe=recipe,
+        prev_recipe=None,
+        mode="fridge",
+        fridge_ingredients=normalized_ingredients
+    )
+
+    return {
+        "user_id": user_id,
+        "recipe_id": recipe_id,
+        "answer": answer,
+        "tags": tags
+    }
+
+
+# ==============================
+# 답변 티켓 조회 (defer_answer=true 로 받은 answer_ticket)
+# ==============================
+ANSWER_MAX_WAIT_MS = 10000
+
+
+@router.get("/recommend/answer/{ticket}")
+async def recommend_answer(
+    ticket: str,
+    wait_ms: int = Query(0, ge=0, le=ANSWER_MAX_WAIT_MS),
+):
+    """
+    - ready: LLM 답변
+    - pending: 아직 생성 중 (answer 는 템플릿 문장, 다시 조회 가능)
+    - fallback: 시간 초과 / 실패 → 템플릿 문장으로 확정
+    wait_ms 동안은 완성될 때까지 기다렸다가 응답 (long polling)
+    """
+    found = answer_queue.get(ticket)
+    if found is None:
+        raise HTTPException(status_code=404, detail="unknown or expired answer ticket")
+
+    if wait_ms:
+        await found.wait_async(wait_ms / 1000)
+
+    return found.to_dict()
+
+
+# ==============================
+# 스트리밍 (SSE)
+# - event: recipe → 추천 결과 (recipe_id, tags) 를 LLM 을 기다리지 않고 먼저 전송
+# - event: token  → 한국어 필터를 거친 답변 조각
+# - event: done   → 완성된 답변 + 서버 측 지연 시간
+# ==============================
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/recommend/chat/stream")
+async def recommend_chat_stream(
+    query: str,
+    user_id: str | None = None,
+    top_k: int = Query(TOP_K, ge=1, le=MAX_TOP_K),
+):
+    started = time.perf_counter()
+
+    if user_id is None:
+        user_id = f"guest-{uuid4()}"
+
+    # 요청 하나는 처음 잡은 snapshot 만 사용 (카테고리 상속 / 후보 랭킹 모두)
+    snapshot = snapshot_holder.current()
+
+    # LLM 태그 추출을 기다리는 동안 세션 조회 (이벤트 루프에서 블로킹 I/O 없음)
+    raw_tags, (seen_ids, last_seen) = await asyncio.gather(
+        extract_tags_async(query),
+        run_in_threadpool(session_state, user_id),
+    )
+    tags = build_chat_tags(raw_tags, query, user_id, snapshot, last_seen)
+
+    recipe = await run_in_threadpool(get_next_recipe, query, tags, seen_ids, top_k=top_k, snapshot=snapshot)
+
+    recipe_id = recipe.get("recipeId") if recipe else None
+    if recipe_id:
+        await run_in_threadpool(add_seen, user_id, recipe_id)
+
+    async def events():
+        yield _sse("recipe", {
+            "user_id": user_id,
+            "query": query,
+            "recipe_id": recipe_id,
+            "tags": tags,
+        })
+        ttfb = time.perf_counter() - started
+        latency_metrics.record("chat_stream.ttfb", ttfb)
+
+        if not recipe_id:
+            answer = "조건에 맞는 레시피를 찾지 못했어요."
+            yield _sse("token", {"text": answer})
+        else:
+            parts = []
+            async for text in generate_response_stream(
+                user_query=query,
+                recipe=recipe,
+                prev_recipe=None
+            ):
+                if not parts:
+                    latency_metrics.record("chat_stream.first_token", time.perf_counter() - started)
+                parts.append(text)
+                yield _sse("token", {"text": text})
+            answer = "".join(parts).strip()
+
+        total = time.perf_counter() - started
+        latency_metrics.record("chat_stream.total", total)
+        yield _sse("done", {
+            "answer": answer,
+            "ttfb_ms": round(ttfb * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
+from app.apis.admin import router as admin_router
 from app.apis.analyze import router as analyze_router
 from app.apis.recommend import router as recommend_router
+from app.services.upstream import close_async_upstreams
 
 app = FastAPI()
 
@@ -10,6 +12,14 @@ app.include_router(analyze_router, prefix="/api")
 # /api/recommend
 app.include_router(recommend_router, prefix="/api")
 
+# /api/admin
+app.include_router(admin_router, prefix="/api")
+
+# 비동기 upstream 커넥션 풀 정리
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_upstreams()
+
 @app.get("/")
 def root():
     return {"message": "Yammy API Running!"}
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+
+import numpy as np
+
+from app.services.vector_store import VECTORS_PATH, cosine_scores, ids_digest, l2_normalize
+from app.utils.topk import top_k_indices
+
+ANN_PATH = os.path.join(os.path.dirname(VECTORS_PATH), "recipe_ivf.npz")
+
+# 검색 기본값 (recall ↔ latency)
+DEFAULT_NPROBE = 8              # 탐색할 클러스터 수 (클수록 정확, 느림)
+EXACT_SEARCH_MAX_ROWS = 20000   # 필터 후 후보가 이보다 적으면 그냥 전수 계산
+
+# 학습 기본값
+KMEANS_ITERS = 10
+KMEANS_SAMPLE_PER_LIST = 64     # 클러스터당 학습 샘플 수
+ASSIGN_CHUNK_ROWS = 65536
+
+
+def default_nlist(n: int) -> int:
+    # 클러스터당 최소 40행 정도는 되도록
+    return max(1, min(int(4 * np.sqrt(n)), n // 40))
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    각 행 → 가장 가까운(내적 최대) 클러스터
+    """
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        block = np.asarray(vectors[start:start + ASSIGN_CHUNK_ROWS], dtype=np.float32)
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iters: int = KMEANS_ITERS, seed: int = 0) -> np.ndarray:
+    """
+    spherical k-means (정규화 벡터 → 내적 기준), 샘플로만 학습
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+
+    sample_rows = np.sort(rng.choice(n, size=min(n, nlist * KMEANS_SAMPLE_PER_LIST), replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(iters):
+        labels = _assign(sample, centroids)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+
+        # 빈 클러스터는 임의 샘플로 다시 시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+
+        centroids = l2_normalize(sums)
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    IVF(inverted file) 근사 최근접 탐색
+
+    - centroids: (nlist, dim) 정규화된 클러스터 중심
+    - list_offsets / list_rows: 클러스터별 recipe_ids 행 번호 (CSR)
+    - 질의와 가까운 nprobe 개 클러스터의 행만 점수 계산
+    - ids_sha1: 만들 때의 recipe_ids 순서 (행 번호가 현재 벡터 파일과 같은 레시피를 가리키는지 확인)
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        list_rows: np.ndarray,
+        ids_sha1: str = "",
+    ):
+        self.centroids = centroids.astype(np.float32)
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+        self.ids_sha1 = ids_sha1
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def count(self) -> int:
+        return len(self.list_rows)
+
+    # --------------------------------------------------------
+    # 빌드 / 저장
+    # --------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        nlist: int | None = None,
+        seed: int = 0,
+        recipe_ids: np.ndarray | None = None,
+    ) -> "IVFIndex":
+        nlist = nlist or default_nlist(len(vectors))
+        centroids = train_centroids(vectors, nlist, seed=seed)
+        labels = _assign(vectors, centroids)
+
+        list_rows = np.argsort(labels, kind="stable").astype(np.int32)
+        counts = np.bincount(labels, minlength=nlist)
+        list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        return cls(
+            centroids, list_offsets, list_rows,
+            ids_digest(recipe_ids) if recipe_ids is not None else "",
+        )
+
+    def save(self, path: str = ANN_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp,
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+            ids_sha1=np.array(self.ids_sha1),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = ANN_PATH) -> "IVFIndex":
+        data = np.load(path)
+        # ids_sha1 없는 예전 파일 → "" (불일치로 처리, 다시 빌드 필요)
+        ids_sha1 = str(data["ids_sha1"]) if "ids_sha1" in data.files else ""
+        return cls(data["centroids"], data["list_offsets"], data["list_rows"], ids_sha1)
+
+    # --------------------------------------------------------
+    # 검색
+    # --------------------------------------------------------
+    def _probe_rows(self, q: np.ndarray, nprobe: int, allowed: np.ndarray | None = None) -> np.ndarray:
+        centroid_scores = self.centroids @ q
+
+        if allowed is not None:
+            # 허용 행이 하나도 없는 클러스터는 건너뛰고 그 다음 가까운 클러스터를 탐색
+            in_list = np.concatenate([[0], np.cumsum(allowed[self.list_rows])])
+            allowed_counts = in_list[self.list_offsets[1:]] - in_list[self.list_offsets[:-1]]
+            centroid_scores = np.where(allowed_counts > 0, centroid_scores, -np.inf)
+            nprobe = min(nprobe, int(np.count_nonzero(allowed_counts)))
+
+        lists = top_k_indices(centroid_scores, min(nprobe, self.nlist))
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]]
+            for c in lists
+        ])
+
+        if allowed is not None:
+            rows = rows[allowed[rows]]
+        return rows
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        query_vec: np.ndarray,
+        k: int,
+        allowed_rows: np.ndarray | None = None,
+        nprobe: int = DEFAULT_NPROBE,
+        excluded: np.ndarray | None = None,
+    ):
+        """
+        상위 k개 (행 번호, 점수)
+        allowed_rows 가 있으면 그 행들 안에서만 찾는다 (카테고리 필터)
+        excluded(행 마스크)에 표시된 행은 점수 계산 전에 뺀다 (이미 본 레시피)
+        """
+        q = l2_normalize(np.asarray(query_vec, dtype=np.float32))
+
+        if excluded is not None and allowed_rows is not None:
+            allowed_rows = np.asarray(allowed_rows)
+            allowed_rows = allowed_rows[~excluded[allowed_rows]]
+
+        # 필터 후 후보가 적으면 근사할 이유가 없음 → 정확 탐색
+        if allowed_rows is not None and len(allowed_rows) <= EXACT_SEARCH_MAX_ROWS:
+            return _exact(vectors, q, k, np.asarray(allowed_rows))
+
+        allowed = None
+        if allowed_rows is not None:
+            allowed = np.zeros(self.count, dtype=bool)
+            allowed[allowed_rows] = True
+        elif excluded is not None:
+            allowed = ~excluded
+
+        # 후보가 k개 미만이면 탐색 범위를 넓힌다
+        while True:
+            rows = self._probe_rows(q, nprobe, allowed)
+            if len(rows) >= k or nprobe >= self.nlist:
+                break
+            nprobe *= 2
+
+        rows = np.sort(rows)
+        return _exact(vectors, q, k, rows)
+
+
+def _exact(vectors: np.ndarray, q: np.ndarray, k: int, rows: np.ndarray):
+    scores = cosine_scores(vectors[rows], q)
+    top = top_k_indices(scores, k)
+    return rows[top], scores[top]
+
+
+def load_ann_index(recipe_ids: np.ndarray, path: str = ANN_PATH) -> IVFIndex | None:
+    """
+    인덱스 파일이 있고 현재 recipe_ids 와 같을 때만 사용
+    (행 수만 같고 순서 / 구성이 다르면 행 번호가 엉뚱한 레시피를 가리킴)
+    """
+    if not os.path.exists(path):
+        return None
+
+    index = IVFIndex.load(path)
+    if index.count != len(recipe_ids) or index.ids_sha1 != ids_digest(recipe_ids):
+        print("⚠ ANN 인덱스가 현재 벡터 파일과 다름 → 전수 탐색 사용 (python -m models.build_ann_index)")
+        return None
+
+    return index
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from uuid import uuid4
+
+from app.services.llm_response import fallback_answer, generate_response
+from app.services.upstream import UPSTREAMS
+from app.utils.counters import Counters
+from app.utils.ttl_cache import TTLCache
+
+# ==============================
+# 답변 생성 작업 큐 (추천 결과 먼저 반환 → 설명은 백그라운드)
+# ==============================
+# 워커 수 = 동시에 보내는 LLM 요청 수 (ollama 동시 요청 제한과 맞춤)
+ANSWER_WORKERS = int(os.getenv("ANSWER_WORKERS", UPSTREAMS["ollama"].max_concurrency))
+ANSWER_QUEUE_SIZE = int(os.getenv("ANSWER_QUEUE_SIZE", "256"))
+
+# 이 시간(초) 안에 만들지 못하면 템플릿 문장으로 확정 (큐에서 오래 기다린 작업은 LLM 호출 생략)
+ANSWER_DEADLINE = float(os.getenv("ANSWER_DEADLINE", "20"))
+
+# 끝난 티켓 보관 (조회가 끝난 뒤에도 잠시 남겨 둠)
+# 진행 중인 티켓은 LRU 에서 밀려나지 않도록 따로 보관 (큐 크기 + 워커 수 이하)
+ANSWER_TICKET_TTL = 600
+ANSWER_TICKET_SIZE = 10000
+
+PENDING, READY, FALLBACK = "pending", "ready", "fallback"
+
+
+class AnswerTicket:
+    def __init__(self, recipe: dict, kwargs: dict):
+        self.id = uuid4().hex
+        self.recipe = recipe
+        self.kwargs = kwargs
+        self.created_at = time.time()
+        self.status = PENDING
+        self.answer: str | None = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    def resolve(self, status: str, answer: str):
+        with self._lock:
+            self.status = status
+            self.answer = answer
+            self._done.set()
+            waiters, self._waiters = self._waiters, []
+
+        # 워커 스레드 → 기다리는 이벤트 루프에 알림
+        for loop, done in waiters:
+            try:
+                loop.call_soon_threadsafe(done.set)
+            except RuntimeError:
+                pass    # 루프가 이미 닫힘
+
+    async def wait_async(self, timeout: float) -> bool:
+        """
+        이벤트 루프를 막지 않고 완료될 때까지 대기 (스레드풀 슬롯도 쓰지 않음)
+        """
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+        with self._lock:
+            if self._done.is_set():
+                return True
+            self._waiters.append((loop, done))
+
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if (loop, done) in self._waiters:
+                    self._waiters.remove((loop, done))
+
+    @property
+    def expired(self) -> bool:
+        return time.time() - self.created_at >= ANSWER_DEADLINE
+
+    def to_dict(self) -> dict:
+        """
+        아직 없거나 늦으면 템플릿 문장 (status 로 확정 여부 구분)
+        """
+        status = self.status
+        if status == PENDING and self.expired:
+            status = FALLBACK
+        return {
+            "ticket": self.id,
+            "status": status,
+            "answer": self.answer if status == READY else fallback_answer(self.recipe),
+        }
+
+
+class AnswerQueue:
+    """
+    generate_response 를 처리하는 고정 크기 워커 스레드 풀
+    - 큐가 가득 차면 바로 템플릿 문장으로 확정 (추천 응답은 막지 않음)
+    - 워커 스레드는 첫 작업이 들어올 때 시작
+    """
+
+    def __init__(self, workers: int = ANSWER_WORKERS, maxsize: int = ANSWER_QUEUE_SIZE):
+        self.workers = workers
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._tickets = TTLCache(ANSWER_TICKET_SIZE, ttl=ANSWER_TICKET_TTL)
+        self._pending: dict[str, AnswerTicket] = {}
+        self._pending_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+        # 요청 스레드 / 이벤트 루프 / 워커 스레드가 동시에 올림
+        self.stats = Counters("submitted", "generated", "fallback", "rejected")
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"answer-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, recipe: dict, **kwargs) -> AnswerTicket:
+        """
+        kwargs 는 generate_response 인자 그대로 (user_query, prev_recipe, mode, fridge_ingredients)
+        """
+        self._ensure_workers()
+
+        ticket = AnswerTicket(recipe, kwargs)
+        with self._pending_lock:
+            self._pending[ticket.id] = ticket
+        self.stats.incr("submitted")
+
+        try:
+            self._queue.put_nowait(ticket)
+        except queue.Full:
+            self.stats.incr("rejected")
+            self._resolve(ticket, FALLBACK, fallback_answer(recipe))
+        return ticket
+
+    def _resolve(self, ticket: AnswerTicket, status: str, answer: str):
+        # 끝난 티켓만 LRU 로 옮김 (먼저 넣고 빼야 조회 사이에 비는 순간이 없음)
+        ticket.resolve(status, answer)
+        self._tickets.set(ticket.id, ticket)
+        with self._pending_lock:
+            self._pending.pop(ticket.id, None)
+
+    def get(self, ticket_id: str) -> AnswerTicket | None:
+        with self._pending_lock:
+            ticket = self._pending.get(ticket_id)
+        return ticket or self._tickets.get(ticket_id)
+
+    def _work(self):
+        while True:
+            ticket = self._queue.get()
+            try:
+                if ticket.expired:
+                    # 이미 템플릿 문장이 나갔을 시간 → LLM 호출 생략
+                    self.stats.incr("fallback")
+                    self._resolve(ticket, FALLBACK, fallback_answer(ticket.recipe))
+                else:
+                    answer = generate_response(recipe=ticket.recipe, **ticket.kwargs)
+                    self.stats.incr("generated")
+                    # 마감 뒤에 끝났으면 이미 fallback 으로 확정된 것으로 보고 바꾸지 않음
+                    if ticket.expired:
+                        self._resolve(ticket, FALLBACK, fallback_answer(ticket.recipe))
+                    else:
+                        self._resolve(ticket, READY, answer)
+            except Exception as e:
+                print(f"[ERROR] Answer worker: {e}")
+                self.stats.incr("fallback")
+                self._resolve(ticket, FALLBACK, fallback_answer(ticket.recipe))
+            finally:
+                self._queue.task_done()
+
+    def info(self) -> dict:
+        return {
+            **self.stats.snapshot(),
+            "queued": self._queue.qsize(),
+            "workers": self.workers,
+            "tickets": len(self._tickets),
+            "pending_tickets": len(self._pending),
+        }
+
+
+# 서버 프로세스 당 하나
+answer_queue = AnswerQueue()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.services.category_service import CategoryTable
+
+
+class CategoryIndex:
+    """
+    카테고리 → recipe_ids 행 마스크 (bool 배열)
+
+    - 카테고리 종류는 수십 개 수준이라 로드 시점에 전부 만들어 둔다
+    - 질의 카테고리 매칭 규칙은 기존과 동일
+      (target_cat in c or c in target_cat)
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, table: CategoryTable):
+        self.recipe_ids = np.asarray(recipe_ids)
+
+        self.categories = list(table.names)
+        self._masks: dict[str, np.ndarray] = {
+            c: np.isin(self.recipe_ids, table.recipes_in(c))
+            for c in self.categories
+        }
+
+        # 질의 카테고리 → 합쳐진 마스크
+        self._target_masks: dict[str, np.ndarray] = {}
+
+    def mask_for(self, target_cat: str) -> np.ndarray:
+        """
+        target_cat 과 부분 문자열로 겹치는 카테고리에 속한 행
+        """
+        mask = self._target_masks.get(target_cat)
+        if mask is not None:
+            return mask
+
+        mask = np.zeros(len(self.recipe_ids), dtype=bool)
+        for c in self.categories:
+            if target_cat in c or c in target_cat:
+                mask |= self._masks[c]
+
+        # 질의 카테고리는 LLM 허용 목록 수준이라 개수가 제한적
+        self._target_masks[target_cat] = mask
+        return mask
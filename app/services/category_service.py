@@ -0,0 +1,137 @@
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+
+from models.recipe_loader import fetch_all_recipe_categories
+
+# ==============================
+# Shared recipe category service
+# ==============================
+CATEGORY_TTL = 60 * 10   # 10분 (초)
+CATEGORY_RETRY_INTERVAL = 5   # 받아오지 못했을 때 다시 시도하기까지 (초)
+
+
+class CategoryTable:
+    """
+    레시피 ↔ 카테고리 (읽기 전용, 압축 형태)
+
+    - names: 카테고리 이름 (intern 된 id = 리스트 인덱스)
+    - recipe_ids / offsets / cat_ids: 레시피별 카테고리 id 배열 (CSR)
+    - 조회는 전부 O(1): 레시피 → 카테고리, 카테고리 → 레시피 id 배열
+    """
+
+    def __init__(self, category_map: dict):
+        self.names: list[str] = []
+        self.name_to_id: dict[str, int] = {}
+
+        items = sorted((int(rid), cats) for rid, cats in category_map.items())
+        self.recipe_ids = np.array([rid for rid, _ in items], dtype=np.int32)
+
+        cat_ids = []
+        offsets = [0]
+        for _, cats in items:
+            for c in cats or []:
+                cid = self.name_to_id.get(c)
+                if cid is None:
+                    cid = self.name_to_id[c] = len(self.names)
+                    self.names.append(c)
+                cat_ids.append(cid)
+            offsets.append(len(cat_ids))
+
+        self.cat_ids = np.array(cat_ids, dtype=np.int16)
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+        self._row_of = {rid: row for row, (rid, _) in enumerate(items)}
+
+        # 카테고리 id → 레시피 id (정렬된 배열)
+        rows = np.repeat(np.arange(len(items)), np.diff(self.offsets))
+        self._recipes_by_cat = [
+            self.recipe_ids[rows[self.cat_ids == cid]]
+            for cid in range(len(self.names))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def categories_of(self, recipe_id) -> list[str]:
+        row = self._row_of.get(int(recipe_id))
+        if row is None:
+            return []
+        return [self.names[c] for c in self.cat_ids[self.offsets[row]:self.offsets[row + 1]]]
+
+    def recipes_in(self, category: str) -> np.ndarray:
+        cid = self.name_to_id.get(category)
+        if cid is None:
+            return np.empty(0, dtype=np.int32)
+        return self._recipes_by_cat[cid]
+
+
+def _digest(category_map: dict) -> str:
+    raw = json.dumps(category_map, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CategoryService:
+    """
+    /api/recipes/categories 를 프로세스 당 한 번만 받아 공유
+    - TTL 마다 ETag 조건부 요청으로 갱신 (snapshot watcher / 재생성에서만 호출)
+    - 조회(table / categories_of / recipes_in)는 메모리만 읽음 → 요청 경로에서 HTTP 없음
+    - 실패하면 CATEGORY_RETRY_INTERVAL 뒤에 다시 시도 (TTL 만큼 빈 테이블로 버티지 않음)
+    - 내용이 바뀐 경우에만 version 증가 (snapshot 재생성 트리거)
+    """
+
+    def __init__(self, ttl: float = CATEGORY_TTL):
+        self.ttl = ttl
+        self.version = 0
+
+        self._table = CategoryTable({})
+        self._digest: str | None = None
+        self._etag: str | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        카테고리 맵 갱신. 내용이 바뀌었으면 True
+        """
+        with self._lock:
+            if not force and time.time() < self._next_check:
+                return False
+
+            try:
+                category_map, etag = fetch_all_recipe_categories(None if force else self._etag)
+            except Exception as e:
+                print(f"[ERROR] Category refresh failed: {e}")
+                self._next_check = time.time() + min(self.ttl, CATEGORY_RETRY_INTERVAL)
+                return False
+
+            self._next_check = time.time() + self.ttl
+            if category_map is None:   # 304 Not Modified
+                return False
+
+            self._etag = etag
+            digest = _digest(category_map)
+            if digest == self._digest:
+                return False
+
+            self._table = CategoryTable(category_map)   # 참조 교체는 원자적
+            self._digest = digest
+            self.version += 1
+            print(f"🏷 CATEGORY TABLE v{self.version}: {len(self._table)} recipes, {len(self._table.names)} categories")
+            return True
+
+    def table(self) -> CategoryTable:
+        return self._table
+
+    def categories_of(self, recipe_id) -> list[str]:
+        return self.table().categories_of(recipe_id)
+
+    def recipes_in(self, category: str) -> np.ndarray:
+        return self.table().recipes_in(category)
+
+
+# 서버 프로세스 당 하나
+category_service = CategoryService()
@@ -1,15 +1,245 @@
-from sentence_transformers import SentenceTransformer
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
 import numpy as np
 
+from app.utils.sqlite_cache import SqliteCache
+from app.utils.ttl_cache import TTLCache
+
+MODEL_NAME = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+
+# 인코더 구현: torch (SentenceTransformer) | onnx (int8 양자화, app.services.onnx_encoder)
+#   onnx 는 onnxruntime + tokenizers 필요 (requirements.txt)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+
+
+def load_model(backend: str = EMBED_BACKEND):
+    if backend == "onnx":
+        from app.services.onnx_encoder import OnnxEncoder
+        return OnnxEncoder(MODEL_NAME)
+    if backend != "torch":
+        raise ValueError(f"unknown EMBED_BACKEND: {backend}")
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+
 # SBERT 모델 로딩 (서버 시작 시 한 번만)
-model = SentenceTransformer("snunlp/KR-SBERT-V40K-klueNLI-augSTS")
+model = load_model()
+
+# ==============================
+# 질의 임베딩 캐시
+# ==============================
+EMBED_CACHE_SIZE = 4096
+EMBED_CACHE_TTL = 60 * 60 * 24   # 24시간 (초)
+
+# 디스크 캐시 경로 (비어 있으면 메모리 캐시만 사용)
+EMBED_CACHE_DB = os.getenv("EMBED_CACHE_DB", "")
+
+# onnx 는 벡터가 조금 다르므로 디스크 캐시를 따로 (torch 는 기존 키 그대로)
+EMBED_CACHE_NAMESPACE = f"embedding:{MODEL_NAME}" + ("" if EMBED_BACKEND == "torch" else f":{EMBED_BACKEND}")
+
+embedding_cache = TTLCache(EMBED_CACHE_SIZE, ttl=EMBED_CACHE_TTL)
+disk_cache = (
+    SqliteCache(EMBED_CACHE_DB, namespace=EMBED_CACHE_NAMESPACE, ttl=EMBED_CACHE_TTL)
+    if EMBED_CACHE_DB else None
+)
+
+
+# ==============================
+# 동시 요청 micro-batching
+# ==============================
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "3"))
+
+
+class EmbeddingBatcher:
+    """
+    여러 요청 스레드의 문장을 잠깐(max_wait) 모아서 encode 한 번으로 처리
+    - 첫 문장이 들어온 뒤 max_wait 이 지나거나 max_batch 개가 모이면 실행
+    - 같은 배치 안의 중복 문장은 한 번만 인코딩
+    - 결과는 각 호출자의 Future 로 돌려줌
+    """
+
+    def __init__(self, encode_fn, max_batch: int = EMBED_BATCH_MAX_SIZE, max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self.batches = 0
+        self.items = 0
+        self.restarts = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._worker = self._start_worker()
+
+    def _start_worker(self) -> threading.Thread:
+        worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        worker.start()
+        return worker
+
+    def _ensure_worker(self):
+        # 워커가 예상 밖 예외로 죽었으면 새로 띄움 (큐에 남은 문장은 새 워커가 처리)
+        if self._worker.is_alive():
+            return
+        with self._start_lock:
+            if not self._worker.is_alive():
+                print("⚠ embedding batcher worker died → restarting")
+                self.restarts += 1
+                self._worker = self._start_worker()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        return self.submit(text).result()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # 이미 쌓여 있는 것은 기다리지 않고 같이 처리
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _process(self, batch: list):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+
+        try:
+            vectors = self.encode_fn(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+        self.batches += 1
+        self.items += len(batch)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._process(batch)
+            except Exception as e:
+                print(f"[ERROR] Embedding batcher: {e}")
+            finally:
+                # 어떤 이유로 빠져나가도(BaseException 포함) 꺼낸 문장의 호출자가 영원히 기다리지 않도록
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("embedding batch aborted"))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "restarts": self.restarts,
+        }
+
+
+def _encode_batch(texts: list[str]) -> np.ndarray:
+    return model.encode(texts, batch_size=len(texts))
+
+
+embedding_batcher = EmbeddingBatcher(_encode_batch)
+
+
+def _cache_key(text: str) -> str:
+    # 공백만 다른 문장은 토큰이 같으므로 같은 키
+    return " ".join(text.split())
+
+
+def _freeze(embedding: np.ndarray) -> np.ndarray:
+    # 캐시된 배열을 호출 측에서 수정하지 못하도록
+    embedding = np.asarray(embedding, dtype=np.float32)
+    embedding.flags.writeable = False
+    return embedding
+
+
+def _lookup(key: str) -> np.ndarray | None:
+    # 메모리 → 디스크 (디스크에서 찾으면 메모리에도 올림)
+    embedding = embedding_cache.get(key)
+    if embedding is not None:
+        return embedding
+
+    if disk_cache is not None:
+        raw = disk_cache.get(key)
+        if raw is not None:
+            embedding = _freeze(np.frombuffer(raw, dtype=np.float32).copy())
+            embedding_cache.set(key, embedding)
+            return embedding
+
+    return None
+
+
+def _store(key: str, vector) -> np.ndarray:
+    embedding = _freeze(vector)
+    embedding_cache.set(key, embedding)
+
+    if disk_cache is not None:
+        disk_cache.set(key, embedding.tobytes())
+
+    return embedding
+
 
 def get_embedding(text: str) -> np.ndarray:
     """
     문장 하나를 KR-SBERT 임베딩(768차원)으로 변환
+    같은 문장은 캐시(메모리 → 디스크)에서 바로 반환
     """
     if not isinstance(text, str):
         text = str(text)
 
-    embedding = model.encode(text)
-    return embedding
\ No newline at end of file
+    key = _cache_key(text)
+
+    embedding = _lookup(key)
+    if embedding is not None:
+        return embedding
+
+    return _store(key, embedding_batcher.encode(key))
+
+
+def get_embedding_cache_stats() -> dict:
+    return embedding_cache.stats()
+
+
+def get_embeddings(texts: list[str]) -> list[np.ndarray]:
+    """
+    여러 문장을 한 번에 임베딩
+    캐시(메모리 → 디스크)에 없는 것만 batcher 로 (동시에 들어온 다른 요청 문장과 같은 배치로 묶임)
+    """
+    keys = [_cache_key(t if isinstance(t, str) else str(t)) for t in texts]
+
+    found = {}
+    futures = {}
+    for key in dict.fromkeys(keys):
+        embedding = _lookup(key)
+        if embedding is not None:
+            found[key] = embedding
+        else:
+            futures[key] = embedding_batcher.submit(key)
+
+    for key, future in futures.items():
+        found[key] = _store(key, future.result())
+
+    return [found[key] for key in keys]
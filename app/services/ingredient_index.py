@@ -0,0 +1,163 @@
+import os
+import re
+
+import numpy as np
+
+from app.services.recipe_store import recipe_text
+from app.utils.normalize import INGREDIENT_MAP
+from app.utils.ttl_cache import TTLCache
+
+# 사전 등록되지 않은 재료의 posting 은 어휘 사전에서 합쳐 만든 뒤 LRU 로 보관
+MAX_CACHED_TERMS = int(os.getenv("INGREDIENT_TERM_CACHE_SIZE", "5000"))
+
+# 이 재료가 있어야만 면 요리를 허용
+NOODLE_INGREDIENTS = ["면", "라면", "파스타"]
+
+# 재료 텍스트의 토큰 구분자 (토큰 = 구분자가 없는 가장 긴 구간)
+_SEPARATOR_RE = re.compile(r"[\s,·/|()\[\]{}:;]+")
+
+
+class IngredientIndex:
+    """
+    재료 → posting list (recipe_ids 기준 행 번호, 정렬된 int32 배열)
+
+    - 매칭 규칙은 기존과 동일: 레시피 재료 텍스트에 부분 문자열로 포함되는지
+    - 빌드 시점에 재료 텍스트를 토큰으로 나눠 토큰 → 행 번호 posting 을 만듦
+      구분자가 없는 term 은 어떤 토큰의 부분 문자열일 때만 텍스트에 포함되므로
+      "term 을 포함하는 토큰들의 posting 합집합" 으로 행 스캔 없이 계산 (어휘 크기만큼만 확인)
+    - INGREDIENT_MAP 동의어는 빌드 시점에 미리 계산, 그 외는 LRU 캐시
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, recipes: dict[int, dict], version: int = 0):
+        self.recipe_ids = np.asarray(recipe_ids)
+        self.version = version
+
+        # 카탈로그에 없는 레시피는 None → 어떤 재료와도 매칭되지 않음
+        self._texts = [
+            recipe_text(recipes[int(rid)]) if int(rid) in recipes else None
+            for rid in self.recipe_ids
+        ]
+        self._present = np.array([text is not None for text in self._texts], dtype=bool)
+
+        # 토큰 어휘 → 행 번호 (행 순서대로 넣으므로 이미 정렬됨)
+        token_rows: dict[str, list[int]] = {}
+        for i, text in enumerate(self._texts):
+            if text is None:
+                continue
+            for token in set(_SEPARATOR_RE.split(text)):
+                if token:
+                    token_rows.setdefault(token, []).append(i)
+        self._token_rows = {token: np.array(rows, dtype=np.int32) for token, rows in token_rows.items()}
+
+        # 사전 재료는 고정, 나머지는 LRU (스레드 안전)
+        self._postings: dict[str, np.ndarray] = {}
+        self._ingredient_postings: dict[str, np.ndarray] = {}
+        self._term_cache = TTLCache(MAX_CACHED_TERMS)
+        self._ingredient_cache = TTLCache(MAX_CACHED_TERMS)
+
+        for canonical, synonyms in INGREDIENT_MAP.items():
+            for term in synonyms:
+                self._postings[term] = self._compute_term_rows(term)
+        for canonical in INGREDIENT_MAP:
+            self._ingredient_postings[canonical] = self._compute_ingredient_rows(canonical)
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    # --------------------------------------------------------
+    # posting list
+    # --------------------------------------------------------
+    def _compute_term_rows(self, term: str) -> np.ndarray:
+        if not term or _SEPARATOR_RE.search(term):
+            # 구분자를 넘나드는 term 은 토큰으로 판단할 수 없음 → 행 스캔
+            return np.fromiter(
+                (i for i, text in enumerate(self._texts) if text is not None and term in text),
+                dtype=np.int32,
+            )
+
+        postings = [rows for token, rows in self._token_rows.items() if term in token]
+        if not postings:
+            return np.empty(0, dtype=np.int32)
+        if len(postings) == 1:
+            return postings[0]
+        return np.unique(np.concatenate(postings))
+
+    def term_rows(self, term: str) -> np.ndarray:
+        """
+        텍스트에 term 이 포함된 행 번호
+        """
+        rows = self._postings.get(term)
+        if rows is not None:
+            return rows
+
+        rows = self._term_cache.get(term)
+        if rows is None:
+            rows = self._compute_term_rows(term)
+            self._term_cache.set(term, rows)
+        return rows
+
+    def _compute_ingredient_rows(self, ingredient: str) -> np.ndarray:
+        synonyms = INGREDIENT_MAP.get(ingredient, [ingredient])
+        rows = self.term_rows(synonyms[0])
+        for term in synonyms[1:]:
+            rows = np.union1d(rows, self.term_rows(term))
+        return rows
+
+    def ingredient_rows(self, ingredient: str) -> np.ndarray:
+        """
+        대표 재료 기준 행 번호 (INGREDIENT_MAP 동의어 합집합)
+        """
+        rows = self._ingredient_postings.get(ingredient)
+        if rows is not None:
+            return rows
+
+        rows = self._ingredient_cache.get(ingredient)
+        if rows is None:
+            rows = self._compute_ingredient_rows(ingredient)
+            self._ingredient_cache.set(ingredient, rows)
+        return rows
+
+    def contains_all_mask(self, ingredients: list[str]) -> np.ndarray:
+        """
+        재료를 전부 (원문 그대로) 포함하는 행 마스크
+        """
+        mask = self._present.copy()
+        for ing in ingredients:
+            term_mask = np.zeros(len(self.recipe_ids), dtype=bool)
+            term_mask[self.term_rows(ing)] = True
+            mask &= term_mask
+        return mask
+
+    def match_counts(self, ingredients: list[str]) -> np.ndarray:
+        """
+        행마다 매칭된 재료 개수
+        """
+        counts = np.zeros(len(self.recipe_ids), dtype=np.int32)
+        for ing in ingredients:
+            counts[self.ingredient_rows(ing)] += 1
+        return counts
+
+    # --------------------------------------------------------
+    # 냉장고 모드 후보
+    # --------------------------------------------------------
+    def top_matches(self, ingredients: list[str], seen_ids=()) -> list:
+        """
+        매칭 개수가 가장 많은 recipe_id 목록 (id 내림차순)
+        - 하나도 안 맞는 레시피 제외
+        - 면 재료가 없으면 면 요리 제외
+        - 이미 본 레시피 제외
+        """
+        counts = self.match_counts(ingredients)
+
+        if not any(ing in NOODLE_INGREDIENTS for ing in ingredients):
+            counts[self.ingredient_rows("면")] = 0
+
+        if len(seen_ids):
+            counts[np.isin(self.recipe_ids, list(seen_ids))] = 0
+
+        best_score = counts.max(initial=0)
+        if best_score == 0:
+            return []
+
+        top = self.recipe_ids[counts == best_score]
+        return list(np.sort(top)[::-1])
@@ -1,31 +1,67 @@
-import requests
+import hashlib
 import json
-from app.utils.json_guard import safe_json_array_parse
+import os
+import re
 
+from fastapi.concurrency import run_in_threadpool
 
-OLLAMA_URL = "http://localhost:11434/api/chat"
+from app.services.recipe_snapshot import snapshot_holder
+from app.services.upstream import async_upstream, upstream
+from app.utils.counters import Counters
+from app.utils.normalize import ITEM_SYNONYMS, clean_ingredient_item, dictionary_ingredient
+from app.utils.sqlite_cache import SqliteCache
+from app.utils.ttl_cache import TTLCache
+
+
+OLLAMA_CHAT_PATH = "/api/chat"
 MODEL = "qwen2.5:7b"
 
 SYSTEM_PROMPT = """
 너는 요리 레시피 데이터베이스용 재료 정규화 도우미야.
 
 규칙:
-1. 입력은 사용자가 가진 재료 목록이다.
-2. 출력은 레시피 DB에 들어갈 법한 '표준 재료명' 리스트다.
+1. 입력은 사용자가 가진 재료 목록(JSON 배열)이다.
+2. 각 항목을 레시피 DB에 들어갈 법한 '표준 재료명' 하나로 바꾼다.
 3. 수량, 단위, 형용사는 제거한다.
 4. 동의어는 하나의 대표 재료명으로 통일한다.
-5. JSON 배열만 출력한다.
+5. 식재료가 아니면 null 로 둔다.
+6. {"입력 항목": "표준 재료명"} 형태의 JSON 객체만 출력한다.
 """
 
-def normalize_ingredients_with_llm(user_ingredients: list[str]) -> list[str]:
+# 프롬프트 / 모델이 바뀌면 캐시 키가 바뀜
+MAPPER_PROMPT_VERSION = hashlib.sha1(f"{MODEL}\n{SYSTEM_PROMPT}".encode("utf-8")).hexdigest()[:12]
+
+# ==============================
+# 항목 단위 정규화 캐시 (LLM 결과만 저장, 사전으로 풀리는 항목은 저장 안 함)
+# ==============================
+INGREDIENT_CACHE_SIZE = 20000
+INGREDIENT_CACHE_TTL = 60 * 60 * 24 * 30   # 30일 (초)
+
+# 디스크 캐시 경로 (비어 있으면 메모리 캐시만 사용)
+INGREDIENT_CACHE_DB = os.getenv("INGREDIENT_CACHE_DB", "")
+
+item_cache = TTLCache(INGREDIENT_CACHE_SIZE, ttl=INGREDIENT_CACHE_TTL)
+disk_cache = (
+    SqliteCache(
+        INGREDIENT_CACHE_DB,
+        namespace=f"ingredients:{MAPPER_PROMPT_VERSION}",
+        ttl=INGREDIENT_CACHE_TTL,
+    )
+    if INGREDIENT_CACHE_DB else None
+)
+
+stats = Counters("requests", "dict_hits", "cache_hits", "llm_items", "llm_calls")
+
+
+def _mapper_request_body(items: list[str]) -> dict:
     user_prompt = f"""
 사용자 재료 목록:
-{user_ingredients}
+{json.dumps(items, ensure_ascii=False)}
 
-정규화된 재료 목록만 JSON 배열로 출력해.
+각 항목의 표준 재료명을 JSON 객체로만 출력해.
 """
 
-    body = {
+    return {
         "model": MODEL,
         "stream": False,
         "messages": [
@@ -35,18 +71,161 @@ def normalize_ingredients_with_llm(user_ingredients: list[str]) -> list[str]:
         "temperature": 0.1
     }
 
+
+def _loads(text: str):
     try:
-        res = requests.post(OLLAMA_URL, json=body, timeout=20)
-        res.raise_for_status()
-        raw = res.json()["message"]["content"]
-    except Exception as e:
-        print("⚠ LLM 호출 실패:", e)
-        return user_ingredients
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def _name(value) -> str | None:
+    return (str(value).strip() or None) if value is not None else None
+
+
+def _parse_mapper_response(raw: str, items: list[str]) -> dict[str, str | None]:
+    """
+    항목 → 표준 재료명 (해석하지 못한 항목은 빠짐)
+    객체가 아니라 배열로 답하면 개수가 같을 때만 순서대로 대응
+    """
+    match = re.search(r"\{[\s\S]*\}", raw or "")
+    if match:
+        data = _loads(re.sub(r",\s*\}", "}", match.group(0)))
+        if isinstance(data, dict):
+            return {item: _name(data[item]) for item in items if item in data}
+
+    # null(식재료 아님)이 "None" 문자열이 되거나 빠져서 순서가 밀리지 않도록 직접 파싱
+    match = re.search(r"\[[\s\S]*\]", raw or "")
+    if match:
+        data = _loads(re.sub(r",\s*\]", "]", match.group(0)))
+        if isinstance(data, list) and len(data) == len(items):
+            return {item: _name(value) for item, value in zip(items, data)}
+
+    print("⚠ JSON 파싱 실패, 원본 사용:", raw)
+    return {}
+
+
+# ==============================
+# 사전 → 캐시 → (모르는 항목만) LLM
+# ==============================
+def _plan(user_ingredients: list[str]) -> tuple[list[str], dict[str, str | None], list[str]]:
+    """
+    (항목별 키, 이미 아는 키 → 재료명, LLM 에 물어볼 키)
+    """
+    stats.incr("requests")
+    known = snapshot_holder.current().rule_tagger.ingredients
+
+    keys = []
+    resolved: dict[str, str | None] = {}
+    unseen = []
+
+    for item in user_ingredients:
+        key = clean_ingredient_item(item)
+        if not key:
+            continue
+        keys.append(key)
+        if key in resolved or key in unseen:
+            continue
+
+        name = dictionary_ingredient(key, known)
+        if name is not None:
+            stats.incr("dict_hits")
+            resolved[key] = name
+            continue
+
+        cached = item_cache.get(key)
+        if cached is None and disk_cache is not None:
+            raw = disk_cache.get(key)
+            if raw is not None:
+                cached = json.loads(raw)
+                item_cache.set(key, cached)
+        if cached is not None:
+            stats.incr("cache_hits")
+            resolved[key] = cached["name"]
+            continue
+
+        unseen.append(key)
+
+    return keys, resolved, unseen
+
+
+def _canonical(name: str | None) -> str | None:
+    # LLM 답변도 사전 규칙으로 한 번 더 정리 ("계란 2개" → "달걀")
+    if name is None:
+        return None
+    core = clean_ingredient_item(name)
+    return ITEM_SYNONYMS.get(core, core) or None
+
+
+def _store(mapped: dict[str, str | None]):
+    for key, name in mapped.items():
+        value = {"name": name}
+        item_cache.set(key, value)
+        if disk_cache is not None:
+            disk_cache.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def _resolve_unseen(unseen: list[str], resolved: dict, mapped: dict[str, str | None]):
+    # LLM 이 답하지 않은 항목은 정리된 원문 그대로 (캐시하지 않음 → 다음에 다시 시도)
+    for key in unseen:
+        resolved[key] = mapped[key] if key in mapped else key
+
+
+def _finish(keys: list[str], resolved: dict[str, str | None]) -> list[str]:
+    # 입력 순서 유지 + 중복 제거 (식재료가 아니라고 답한 항목은 제외)
+    result = []
+    for key in keys:
+        name = resolved.get(key, key)
+        if name and name not in result:
+            result.append(name)
+    return result
+
+
+def normalize_ingredients_with_llm(user_ingredients: list[str]) -> list[str]:
+    keys, resolved, unseen = _plan(user_ingredients)
+
+    mapped = {}
+    if unseen:
+        stats.incr("llm_calls")
+        stats.incr("llm_items", len(unseen))
+        try:
+            res = upstream("ollama").post(OLLAMA_CHAT_PATH, json=_mapper_request_body(unseen), timeout=20)
+            res.raise_for_status()
+            parsed = _parse_mapper_response(res.json()["message"]["content"], unseen)
+            # 전부 정리된 뒤에만 반영 (중간에 실패하면 정리 안 된 값이 캐시에 남지 않도록)
+            mapped = {key: _canonical(name) for key, name in parsed.items()}
+        except Exception as e:
+            print("⚠ LLM 호출 실패:", e)
+        else:
+            _store(mapped)
+        _resolve_unseen(unseen, resolved, mapped)
+
+    return _finish(keys, resolved)
+
+
+async def normalize_ingredients_with_llm_async(user_ingredients: list[str]) -> list[str]:
+    keys, resolved, unseen = _plan(user_ingredients)
+
+    mapped = {}
+    if unseen:
+        stats.incr("llm_calls")
+        stats.incr("llm_items", len(unseen))
+        try:
+            res = await async_upstream("ollama").post(
+                OLLAMA_CHAT_PATH, json=_mapper_request_body(unseen), timeout=20
+            )
+            res.raise_for_status()
+            parsed = _parse_mapper_response(res.json()["message"]["content"], unseen)
+            mapped = {key: _canonical(name) for key, name in parsed.items()}
+        except Exception as e:
+            print("⚠ LLM 호출 실패:", e)
+        else:
+            # 디스크 캐시 쓰기는 스레드풀에서
+            await run_in_threadpool(_store, mapped)
+        _resolve_unseen(unseen, resolved, mapped)
 
-    parsed = safe_json_array_parse(raw)
+    return _finish(keys, resolved)
 
-    if not parsed:
-        print("⚠ JSON 파싱 실패, 원본 사용:", raw)
-        return user_ingredients
 
-    return parsed
\ No newline at end of file
+def get_ingredient_cache_stats() -> dict:
+    return {**item_cache.stats(), **stats.snapshot(), "prompt_version": MAPPER_PROMPT_VERSION}
@@ -0,0 +1,250 @@
+import os
+import re
+
+import numpy as np
+
+from app.services.vector_store import VECTORS_PATH, ids_digest
+from app.utils.topk import top_k_indices
+
+LEXICAL_PATH = os.path.join(os.path.dirname(VECTORS_PATH), "recipe_bm25.npz")
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 필드별 가중치 (이름에 나온 단어가 조리 방법에 나온 단어보다 중요)
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "ingredient": 2.0,
+    "spicy_ingredient": 1.0,
+    "method": 0.5,
+}
+
+# RRF 상수 (순위 1위와 10위의 차이를 얼마나 줄일지)
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"[0-9a-zA-Z가-힣]+")
+_HAS_DIGIT = re.compile(r"\d")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    띄어쓰기 단위 → 2글자 이하는 그대로, 더 길면 글자 bigram + 원형
+    - 한국어는 붙여 쓰는 경우가 많아 bigram 으로 부분 일치 ("김치찌개" ↔ "찌개")
+    - 숫자가 섞인 토큰(수량 "200g", "1큰술")은 버림
+    """
+    tokens = []
+    for word in _TOKEN_RE.findall((text or "").lower()):
+        if _HAS_DIGIT.search(word):
+            continue
+        if len(word) <= 2:
+            tokens.append(word)
+            continue
+        tokens.append(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _recipe_fields(recipe: dict) -> dict[str, str]:
+    return {
+        "name": recipe.get("name") or "",
+        "ingredient": recipe.get("ingredient") or "",
+        "spicy_ingredient": recipe.get("spicy_ingredient") or recipe.get("spicyIngredient") or "",
+        "method": recipe.get("method") or "",
+    }
+
+
+class LexicalIndex:
+    """
+    레시피 텍스트 BM25 역색인 (이름 / 재료 / 양념 / 조리 방법)
+
+    - 단어 → posting (recipe_ids 기준 행 번호, 미리 계산한 BM25 가중치) CSR
+    - 필드 가중치를 곱한 tf 하나로 합쳐서 계산 (BM25F 단순화)
+    - 질의 점수 = Σ idf(t) · w(t, d), 질의 단어의 posting 만 훑음
+    """
+
+    def __init__(
+        self,
+        vocab: dict[str, int],
+        idf: np.ndarray,
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        weights: np.ndarray,
+        count: int,
+        ids_sha1: str = "",
+    ):
+        self.vocab = vocab
+        self.idf = idf
+        self.offsets = offsets
+        self.rows = rows
+        self.weights = weights
+        self.count = count
+        self.ids_sha1 = ids_sha1
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    # --------------------------------------------------------
+    # 빌드 / 저장
+    # --------------------------------------------------------
+    @classmethod
+    def build(cls, recipe_ids: np.ndarray, recipes: dict[int, dict]) -> "LexicalIndex":
+        n = len(recipe_ids)
+        vocab: dict[str, int] = {}
+        postings: list[dict[int, float]] = []   # 단어 id → {행: 가중 tf}
+        doc_len = np.zeros(n, dtype=np.float32)
+
+        for row, rid in enumerate(recipe_ids):
+            recipe = recipes.get(int(rid))
+            if recipe is None:
+                continue   # 카탈로그에 없는 레시피 → 빈 문서
+
+            for field, text in _recipe_fields(recipe).items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    tid = vocab.get(token)
+                    if tid is None:
+                        tid = vocab[token] = len(postings)
+                        postings.append({})
+                    postings[tid][row] = postings[tid].get(row, 0.0) + weight
+                    doc_len[row] += weight
+
+        avg_len = float(doc_len[doc_len > 0].mean()) if (doc_len > 0).any() else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len)
+
+        offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        rows_list, weights_list = [], []
+        df = np.zeros(len(postings), dtype=np.float32)
+
+        for tid, posting in enumerate(postings):
+            p_rows = np.fromiter(sorted(posting), dtype=np.int32, count=len(posting))
+            tf = np.array([posting[r] for r in p_rows], dtype=np.float32)
+            rows_list.append(p_rows)
+            weights_list.append(tf * (BM25_K1 + 1) / (tf + norm[p_rows]))
+            df[tid] = len(p_rows)
+            offsets[tid + 1] = offsets[tid] + len(p_rows)
+
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        return cls(
+            vocab,
+            idf,
+            offsets,
+            np.concatenate(rows_list) if rows_list else np.empty(0, dtype=np.int32),
+            np.concatenate(weights_list).astype(np.float32) if weights_list else np.empty(0, dtype=np.float32),
+            n,
+            ids_digest(recipe_ids),
+        )
+
+    def save(self, path: str = LEXICAL_PATH):
+        terms = sorted(self.vocab, key=self.vocab.get)
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp,
+            terms=np.array(terms, dtype=str),
+            idf=self.idf,
+            offsets=self.offsets,
+            rows=self.rows,
+            weights=self.weights,
+            count=np.int64(self.count),
+            ids_sha1=np.array(self.ids_sha1),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = LEXICAL_PATH) -> "LexicalIndex":
+        data = np.load(path)
+        vocab = {str(t): i for i, t in enumerate(data["terms"])}
+        return cls(
+            vocab, data["idf"], data["offsets"], data["rows"], data["weights"],
+            int(data["count"]), str(data["ids_sha1"]),
+        )
+
+    # --------------------------------------------------------
+    # 검색
+    # --------------------------------------------------------
+    def scores(self, query: str) -> np.ndarray | None:
+        """
+        행마다 BM25 점수 (질의 단어가 하나도 색인에 없으면 None)
+        """
+        terms = {self.vocab[t] for t in tokenize(query) if t in self.vocab}
+        if not terms:
+            return None
+
+        scores = np.zeros(self.count, dtype=np.float32)
+        for tid in terms:
+            start, end = self.offsets[tid], self.offsets[tid + 1]
+            # posting 안의 행은 중복이 없으므로 fancy index 누적으로 충분
+            scores[self.rows[start:end]] += self.idf[tid] * self.weights[start:end]
+        return scores
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed_rows: np.ndarray | None = None,
+        excluded: np.ndarray | None = None,
+    ):
+        """
+        점수 > 0 인 상위 k개 (행 번호, 점수), 점수 내림차순
+        """
+        scores = self.scores(query)
+        if scores is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if excluded is not None:
+            scores[excluded] = 0
+
+        rows = np.flatnonzero(scores) if allowed_rows is None else allowed_rows[scores[allowed_rows] > 0]
+        top = rows[top_k_indices(scores[rows], k)]
+        return top, scores[top]
+
+
+def load_lexical_index(recipe_ids: np.ndarray, path: str = LEXICAL_PATH) -> LexicalIndex | None:
+    """
+    미리 만든 인덱스 파일이 있고 현재 recipe_ids 와 같을 때만 사용
+    """
+    if not os.path.exists(path):
+        return None
+
+    index = LexicalIndex.load(path)
+    if index.ids_sha1 != ids_digest(recipe_ids):
+        print("⚠ BM25 인덱스가 현재 벡터 파일과 다름 → 메모리에서 다시 생성")
+        return None
+
+    return index
+
+
+# --------------------------------------------------------
+# 어휘(BM25) + 의미(SBERT) 결과 합치기
+# --------------------------------------------------------
+def reciprocal_rank_fusion(ranked_rows: list[np.ndarray], k: int, c: int = RRF_K) -> np.ndarray:
+    """
+    Σ 1 / (c + 순위) 로 상위 k개 행 (점수 척도가 다른 목록끼리 합칠 때)
+    """
+    fused: dict[int, float] = {}
+    for rows in ranked_rows:
+        for rank, row in enumerate(rows.tolist()):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (c + rank + 1)
+
+    rows = np.fromiter(fused, dtype=np.int64, count=len(fused))
+    scores = np.fromiter(fused.values(), dtype=np.float64, count=len(fused))
+    return rows[top_k_indices(scores, k)]
+
+
+def weighted_fusion(
+    rows: np.ndarray,
+    dense_scores: np.ndarray,
+    lexical_scores: np.ndarray,
+    k: int,
+    dense_weight: float,
+) -> np.ndarray:
+    """
+    dense_weight · 코사인 + (1 - dense_weight) · BM25 / 최대 BM25 로 상위 k개 행
+    """
+    top_lexical = lexical_scores.max(initial=0)
+    if top_lexical > 0:
+        lexical_scores = lexical_scores / top_lexical
+
+    fused = dense_weight * dense_scores + (1 - dense_weight) * lexical_scores
+    return rows[top_k_indices(fused, k)]
@@ -1,9 +1,10 @@
-import requests
+import hashlib
 import json
 import re
+from app.services.upstream import async_upstream, upstream
 from app.utils.normalize import normalize_query
 
-OLLAMA_URL = "http://localhost:11434/v1/chat/completions"
+OLLAMA_CHAT_PATH = "/v1/chat/completions"
 MODEL_NAME = "qwen2.5:7b"  # 현재 쓰는 모델
 
 
@@ -64,17 +65,18 @@ USER_PROMPT_TEMPLATE = """
 반드시 JSON만 출력하라.
 """
 
+# 모델 / 프롬프트가 바뀌면 값이 바뀜 → 태그 캐시 키에 포함
+PROMPT_VERSION = hashlib.sha1(
+    f"{MODEL_NAME}\n{SYSTEM_PROMPT}\n{USER_PROMPT_TEMPLATE}".encode("utf-8")
+).hexdigest()[:12]
 
-def analyze_text(user_query: str) -> dict:
-    """
-    Ollama(Qwen2.5:7B)에 user_query를 보내서
-    category(List[str]), ingredients(List[str])를 추출한다.
-    """
+
+def _tag_request_body(user_query: str) -> dict:
     user_query = normalize_query(user_query)
     
     user_prompt = USER_PROMPT_TEMPLATE.format(user_query=user_query)
 
-    body = {
+    return {
         "model": MODEL_NAME,
         "stream": False,
         "messages": [
@@ -83,10 +85,8 @@ def analyze_text(user_query: str) -> dict:
         ],
     }
 
-    res = requests.post(OLLAMA_URL, json=body)
-    res.raise_for_status()
 
-    data = res.json()
+def _parse_tag_response(data: dict) -> dict:
     raw = data["choices"][0]["message"]["content"].strip()
 
     # 혹시 앞뒤에 말이 붙어도 {} 블록만 추출
@@ -105,6 +105,31 @@ def analyze_text(user_query: str) -> dict:
     return parsed
 
 
+def analyze_text(user_query: str) -> dict:
+    """
+    Ollama(Qwen2.5:7B)에 user_query를 보내서
+    category(List[str]), ingredients(List[str])를 추출한다.
+    """
+    body = _tag_request_body(user_query)
+
+    res = upstream("ollama").post(OLLAMA_CHAT_PATH, json=body)
+    res.raise_for_status()
+
+    return _parse_tag_response(res.json())
+
+
+async def analyze_text_async(user_query: str) -> dict:
+    """
+    analyze_text 의 비동기 버전 (keep-alive 풀 + 동시 요청 수 제한)
+    """
+    body = _tag_request_body(user_query)
+
+    res = await async_upstream("ollama").post(OLLAMA_CHAT_PATH, json=body)
+    res.raise_for_status()
+
+    return _parse_tag_response(res.json())
+
+
 def _clean_ingredients_list(ing_list):
     """
     LLM이 뱉은 ingredients 리스트를 정제:
@@ -1,8 +1,10 @@
-import requests
+import json
 import re
 from typing import Optional, List
 
-OLLAMA_URL = "http://localhost:11434/v1/chat/completions"
+from app.services.upstream import async_upstream, upstream
+
+OLLAMA_CHAT_PATH = "/v1/chat/completions"
 MODEL_NAME = "qwen2.5:7b"
 
 # ===============================
@@ -73,13 +75,14 @@ def ensure_korean_only(text: str) -> str:
 # ===============================
 # 응답 생성 함수
 # ===============================
-def generate_response(
+def _response_request_body(
     user_query: str,
     recipe: dict,
     prev_recipe: Optional[dict] = None,
-    mode: str = "chat",  # "chat" | "fridge"
+    mode: str = "chat",
     fridge_ingredients: Optional[List[str]] = None,
-) -> str:
+    stream: bool = False,
+) -> dict:
 
     # 🔹 모드에 따른 SYSTEM PROMPT 선택
     system_prompt = SYSTEM_PROMPT_CHAT
@@ -120,28 +123,125 @@ def generate_response(
 사용자에게 이 레시피를 가볍게 추천하는 한 문장을 써줘.
 """
 
-    body = {
+    return {
         "model": MODEL_NAME,
         "temperature": 0.2,
-        "stream": False,
+        "stream": stream,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
     }
 
+
+def fallback_answer(recipe: dict) -> str:
+    # LLM 답변이 없을 때 쓰는 템플릿 문장
+    return f"{recipe.get('name', '이 요리')} 먹기 딱 좋은 타이밍이에요."
+
+
+def _finalize_answer(content: str, recipe: dict) -> str:
+    # 🔹 한국어 강제 필터
+    content = ensure_korean_only(content).strip()
+
+    # 🔹 최종 fallback
+    if not content:
+        content = fallback_answer(recipe)
+
+    return content
+
+
+def generate_response(
+    user_query: str,
+    recipe: dict,
+    prev_recipe: Optional[dict] = None,
+    mode: str = "chat",  # "chat" | "fridge"
+    fridge_ingredients: Optional[List[str]] = None,
+) -> str:
+
+    body = _response_request_body(user_query, recipe, prev_recipe, mode, fridge_ingredients)
+
     try:
-        res = requests.post(OLLAMA_URL, json=body, timeout=20)
+        res = upstream("ollama").post(OLLAMA_CHAT_PATH, json=body, timeout=20)
         res.raise_for_status()
         content = res.json()["choices"][0]["message"]["content"].strip()
     except Exception:
         content = ""
 
-    # 🔹 한국어 강제 필터
-    content = ensure_korean_only(content).strip()
+    return _finalize_answer(content, recipe)
 
-    # 🔹 최종 fallback
-    if not content:
-        content = f"{recipe.get('name', '이 요리')} 먹기 딱 좋은 타이밍이에요."
 
-    return content
\ No newline at end of file
+async def generate_response_async(
+    user_query: str,
+    recipe: dict,
+    prev_recipe: Optional[dict] = None,
+    mode: str = "chat",
+    fridge_ingredients: Optional[List[str]] = None,
+) -> str:
+    """
+    generate_response 의 비동기 버전 (실패 시 동일한 fallback 문장)
+    """
+    body = _response_request_body(user_query, recipe, prev_recipe, mode, fridge_ingredients)
+
+    try:
+        res = await async_upstream("ollama").post(OLLAMA_CHAT_PATH, json=body, timeout=20)
+        res.raise_for_status()
+        content = res.json()["choices"][0]["message"]["content"].strip()
+    except Exception:
+        content = ""
+
+    return _finalize_answer(content, recipe)
+
+
+def _parse_stream_line(line: str) -> Optional[str]:
+    # OpenAI 호환 SSE: "data: {...choices[0].delta.content...}" / "data: [DONE]"
+    if not line.startswith("data:"):
+        return None
+    payload = line[5:].strip()
+    if not payload or payload == "[DONE]":
+        return None
+    try:
+        return json.loads(payload)["choices"][0]["delta"].get("content") or None
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+        return None
+
+
+async def generate_response_stream(
+    user_query: str,
+    recipe: dict,
+    prev_recipe: Optional[dict] = None,
+    mode: str = "chat",
+    fridge_ingredients: Optional[List[str]] = None,
+):
+    """
+    generate_response 의 스트리밍 버전 (한국어 필터를 조각마다 적용한 텍스트를 차례로 yield)
+    - ensure_korean_only 는 글자 단위 필터라 조각별로 적용해도 결과가 같음
+    - 앞쪽 공백은 첫 글자가 나올 때까지 버림 (_finalize_answer 의 strip 과 동일)
+    - 아무것도 못 받았으면 (실패 포함) fallback 문장 하나
+    """
+    body = _response_request_body(
+        user_query, recipe, prev_recipe, mode, fridge_ingredients, stream=True
+    )
+
+    started = False
+    try:
+        async with async_upstream("ollama").stream("POST", OLLAMA_CHAT_PATH, json=body, timeout=20) as res:
+            res.raise_for_status()
+            async for line in res.aiter_lines():
+                delta = _parse_stream_line(line)
+                if delta is None:
+                    continue
+
+                text = ensure_korean_only(delta)
+                if not started:
+                    text = text.lstrip()
+                if not text:
+                    continue
+
+                started = True
+                yield text
+    except Exception as e:
+        # 이미 보낸 조각은 그대로 두고 여기서 끝냄
+        print(f"[WARN] answer stream stopped: {e}")
+
+    if not started:
+        yield _finalize_answer("", recipe)
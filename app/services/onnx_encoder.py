@@ -0,0 +1,148 @@
+import json
+import os
+
+import numpy as np
+
+# ==============================
+# KR-SBERT ONNX(int8) 인코더 — torch 없이 onnxruntime + tokenizers 만 사용
+# ==============================
+# models.export_onnx_encoder 로 만든 디렉터리 (model_int8.onnx / tokenizer.json / encoder.json)
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "models/kr_sbert_onnx")
+
+# 연산 스레드 수 (0 이면 onnxruntime 기본값 = 물리 코어 수)
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+# 원본(PyTorch) 임베딩과의 최소 코사인 유사도 (export 때 검증한 값이 이보다 낮으면 사용 안 함)
+ONNX_COSINE_TOLERANCE = float(os.getenv("ONNX_COSINE_TOLERANCE", "0.99"))
+
+ONNX_MODEL_FILE = "model_int8.onnx"
+ENCODER_CONFIG_FILE = "encoder.json"
+
+
+def mean_pooling(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """
+    padding 토큰을 뺀 토큰 벡터 평균 (sentence-transformers mean pooling 과 동일)
+    """
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (hidden * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxEncoder:
+    """
+    SentenceTransformer.encode 와 같은 방식으로 부르는 ONNX Runtime 인코더
+
+    - 토크나이저: tokenizers(Rust) → 문장 묶음을 한 번에 padding / truncation
+    - 모델: 가중치 int8 동적 양자화, CPU 실행
+    - pooling / 정규화 / 최대 길이는 export 때 기록한 encoder.json 을 따름
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: str = ONNX_MODEL_DIR,
+        intra_op_threads: int = ONNX_INTRA_OP_THREADS,
+        tolerance: float = ONNX_COSINE_TOLERANCE,
+    ):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                f"❌ EMBED_BACKEND=onnx 에 필요한 패키지 없음: {e.name} (pip install onnxruntime tokenizers)"
+            ) from e
+
+        config_path = os.path.join(model_dir, ENCODER_CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise RuntimeError(f"❌ ONNX 인코더 없음: {config_path} (python -m models.export_onnx_encoder)")
+
+        with open(config_path, encoding="utf-8") as f:
+            self.config = json.load(f)
+
+        if self.config.get("model") != model_name:
+            raise RuntimeError(f"❌ ONNX 인코더 모델 불일치: {self.config.get('model')} != {model_name}")
+        if self.config.get("min_cosine", 0.0) < tolerance:
+            raise RuntimeError(
+                f"❌ ONNX 인코더 오차 초과: min_cosine={self.config.get('min_cosine')} < {tolerance}"
+            )
+
+        self.pooling = self.config.get("pooling", "mean")
+        self.normalize = self.config.get("normalize", False)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.config.get("max_seq_length", 128))
+        self.tokenizer.enable_padding(
+            pad_id=self.config.get("pad_token_id", 0),
+            pad_token=self.config.get("pad_token", "[PAD]"),
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, self.config.get("onnx_file", ONNX_MODEL_FILE)),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        print(f"🧩 ONNX encoder loaded: {model_dir} (threads={intra_op_threads or 'auto'}, "
+              f"min_cosine={self.config.get('min_cosine')})")
+
+    def _encode_chunk(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+
+        hidden = self.session.run(None, feeds)[0]
+
+        if self.pooling == "cls":
+            vectors = hidden[:, 0]
+        else:
+            vectors = mean_pooling(hidden, attention_mask)
+
+        if self.normalize:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors.astype(np.float32)
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        show_progress_bar: bool | None = None,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+    ):
+        """
+        문장 하나 → (dim,), 문장 목록 → (n, dim)
+        SentenceTransformer.encode 인자 중 여기서 의미가 있는 것만 받음 (나머지는 TypeError)
+        - show_progress_bar: 받기만 하고 무시
+        - convert_to_numpy=False: 문장별 벡터 리스트
+        - normalize_embeddings: encoder.json 설정과 상관없이 L2 정규화
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32) if convert_to_numpy else []
+
+        batch_size = max(int(batch_size), 1)
+        vectors = np.vstack([
+            self._encode_chunk(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ])
+        if normalize_embeddings and not self.normalize:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+        if single:
+            return vectors[0]
+        return vectors if convert_to_numpy else list(vectors)
@@ -0,0 +1,105 @@
+import os
+import threading
+
+import numpy as np
+
+from app.services.embed_service import get_embedding, get_embeddings
+from app.services.vector_store import l2_normalize
+from app.utils.normalize import INGREDIENT_MAP, SYNONYM_MAP
+
+# --------------------------------------------------------
+# Semantic booster (카테고리 의미 강화)
+# --------------------------------------------------------
+CATEGORY_KEYWORDS = {
+    "밑반찬": "간단한 반찬 간단요리 무침 볶음 조림 짭짤한 집반찬",
+    "메인반찬": "메인요리 고기 해물 든든한 구이 튀김 볶음 메인 디너",
+    "국-탕": "국물 따뜻한 시원한 탕 깊은육수 한식국물 얼큰 개운한",
+    "찌개": "찌개 얼큰 자작 국물 진한 맛 칼칼한 구수한 깊은맛 한식찌개",
+    "면": "면요리 라면 칼국수 국수 우동 쫄깃한 면식",
+    "파스타": "파스타 오일파스타 토마토파스타 크림파스타 양식 면요리 이탈리안",
+    "밥": "밥 한식 백반 든든한 집밥 따뜻한 공기밥 기본식사",
+    "볶음밥": "볶음밥 고슬고슬 볶은밥 한그릇요리 간단한 메뉴 볶음 맛있는",
+    "덮밥": "덮밥 한그릇요리 밥위에 올린 음식 소스 든든한 덮어먹는 메뉴",
+    "양식": "양식 버터 치즈 오븐 스테이크 수프 샐러드 서양식 요리",
+    "샐러드": "샐러드 상큼 야채 건강식 가벼운 식사 드레싱 채소 신선한",
+    "빵": "빵 토스트 샌드위치 베이커리 브런치 간단식 밀가루 버터 오븐",
+    "떡볶이": "떡볶이 매운떡 국물떡볶이 분식 매콤한 쌀떡 밀떡 인기 간식",
+    "간식": "간식 달달한 주전부리 과자 군것질 간단한 스낵",
+    "디저트": "디저트 달콤한 케이크 쿠키 아이스크림 후식 브런치",
+    "기타": "기타 요리 독특한 음식 단일메뉴 특별한요리",
+}
+
+FALLBACK_QUERY = "요리 음식 레시피 한식 집밥"
+
+# 질의 벡터 = 가중치 × (문장, 카테고리, 재료 평균) 의 합
+# (예전: 재료 문자열을 3번 더 붙여서 가중치를 줬음)
+QUERY_WEIGHT_TEXT = float(os.getenv("QUERY_WEIGHT_TEXT", "1.0"))
+QUERY_WEIGHT_CATEGORY = float(os.getenv("QUERY_WEIGHT_CATEGORY", "0.5"))
+QUERY_WEIGHT_INGREDIENT = float(os.getenv("QUERY_WEIGHT_INGREDIENT", "1.0"))
+
+# 서버 시작 시 미리 임베딩해 둘 재료
+COMMON_INGREDIENTS = sorted(
+    set(INGREDIENT_MAP)
+    | {s for synonyms in INGREDIENT_MAP.values() for s in synonyms}
+    | set(SYNONYM_MAP.values())
+    | {"김치", "고춧가루", "청양고추", "두부", "돼지고기", "소고기", "닭고기", "감자", "양파", "마늘"}
+)
+
+_category_vectors: dict[str, np.ndarray] = {}
+_lock = threading.Lock()
+
+
+def warm_query_vectors():
+    """
+    카테고리 키워드 문장 + 자주 쓰는 재료 임베딩을 한 번에 계산
+    (재료 벡터는 embed_service 캐시에 들어가므로 여기서는 카테고리만 보관)
+    """
+    global _category_vectors
+
+    with _lock:
+        if _category_vectors:
+            return
+
+        categories = list(CATEGORY_KEYWORDS)
+        vectors = get_embeddings([CATEGORY_KEYWORDS[c] for c in categories])
+        _category_vectors = {
+            c: l2_normalize(np.asarray(v, dtype=np.float32))
+            for c, v in zip(categories, vectors)
+        }
+
+        get_embeddings(COMMON_INGREDIENTS)
+
+
+def category_vector(category: str) -> np.ndarray | None:
+    if not _category_vectors:
+        warm_query_vectors()
+    return _category_vectors.get(category)
+
+
+def build_query_vector(user_query: str, categories: list[str], ingredients: list[str]) -> np.ndarray:
+    """
+    사용자 문장 임베딩 + 카테고리 벡터 + 재료 벡터 평균을 가중합
+    (SBERT 에는 사용자 문장만 보내므로 입력 길이가 짧아짐)
+    """
+    parts = []
+
+    if user_query.strip():
+        parts.append((QUERY_WEIGHT_TEXT, get_embedding(user_query)))
+
+    if categories:
+        vec = category_vector(categories[0])
+        if vec is not None:
+            parts.append((QUERY_WEIGHT_CATEGORY, vec))
+
+    if ingredients:
+        ing_vecs = [l2_normalize(np.asarray(v, dtype=np.float32)) for v in get_embeddings(ingredients)]
+        parts.append((QUERY_WEIGHT_INGREDIENT, np.mean(ing_vecs, axis=0)))
+
+    if not parts:
+        return get_embedding(FALLBACK_QUERY)
+
+    query_vec = np.zeros_like(parts[0][1], dtype=np.float32)
+    for weight, vec in parts:
+        query_vec += weight * l2_normalize(np.asarray(vec, dtype=np.float32))
+
+    return l2_normalize(query_vec)
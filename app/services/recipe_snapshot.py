@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from app.services.ann_index import ANN_PATH, load_ann_index
+from app.services.category_index import CategoryIndex
+from app.services.category_service import category_service
+from app.services.ingredient_index import IngredientIndex
+from app.services.lexical_index import LEXICAL_PATH, LexicalIndex, load_lexical_index
+from app.services.recipe_store import recipe_store
+from app.services.rule_tagger import RuleTagger
+from app.services.vector_store import IDS_PATH, VECTORS_PATH, load_recipe_vectors, meta_path
+
+# 근사 탐색(IVF): 카탈로그가 충분히 클 때만, 인덱스 파일이 있을 때만 사용
+ANN_MIN_ROWS = 50_000
+
+# 파일 변경 / 카탈로그 변경 감시 주기 (초, 0 이면 감시 안 함)
+SNAPSHOT_WATCH_INTERVAL = float(os.getenv("SNAPSHOT_WATCH_INTERVAL", "30"))
+
+WATCHED_FILES = [VECTORS_PATH, IDS_PATH, meta_path(VECTORS_PATH), ANN_PATH, LEXICAL_PATH]
+
+
+def _file_stamp() -> tuple:
+    stamp = []
+    for path in WATCHED_FILES:
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+class RecipeSnapshot:
+    """
+    한 시점의 추천 데이터 묶음 (읽기 전용)
+    - 벡터(mmap) / ids / ANN 인덱스
+    - 카테고리 테이블 / 카테고리 마스크
+    - 레시피 카탈로그 + 재료 역색인
+    - BM25 역색인 (이름 / 재료 / 양념 / 조리 방법)
+    - 규칙 기반 태그 사전 (카탈로그 카테고리 / 재료)
+
+    요청은 시작할 때 snapshot 하나를 잡고 끝까지 그것만 사용한다.
+    새 snapshot 으로 교체돼도 진행 중인 요청은 영향을 받지 않고,
+    마지막 참조가 사라지면 이전 snapshot 메모리(mmap 포함)가 해제된다.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.loaded_at = time.time()
+        self.file_stamp = _file_stamp()
+
+        self.recipe_vectors, self.recipe_ids, self.vector_meta = load_recipe_vectors()
+
+        # recipe_id → 행 번호 (정렬 순서만 들고 있다가 이진 탐색, dict 보다 메모리 적음)
+        self._id_order = np.argsort(self.recipe_ids, kind="stable")
+        self._sorted_ids = self.recipe_ids[self._id_order]
+
+        self.ann_index = None
+        if len(self.recipe_ids) >= ANN_MIN_ROWS:
+            self.ann_index = load_ann_index(self.recipe_ids)
+
+        # 최초 빌드 / 실패 후 재시도 (TTL 안이면 바로 반환)
+        category_service.refresh()
+        self.category_version = category_service.version
+        self.categories = category_service.table()
+        self.category_index = CategoryIndex(self.recipe_ids, self.categories)
+
+        self.store_version = recipe_store.version
+        self.recipes = recipe_store.all()
+        self.ingredient_index = IngredientIndex(self.recipe_ids, self.recipes, version=self.store_version)
+        self.rule_tagger = RuleTagger(self.recipes, self.categories.names)
+
+        # 미리 만든 파일(models/build_lexical_index)이 현재 ids 와 맞으면 사용, 아니면 카탈로그로 생성
+        self.lexical_index = (
+            load_lexical_index(self.recipe_ids)
+            or LexicalIndex.build(self.recipe_ids, self.recipes)
+        )
+
+    def rows_for(self, recipe_ids) -> np.ndarray:
+        """
+        recipe_id 들의 행 번호 (벡터가 없는 id 는 빠짐)
+        """
+        ids = np.fromiter(recipe_ids, dtype=self._sorted_ids.dtype, count=len(recipe_ids))
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        found = self._sorted_ids[pos] == ids
+        return self._id_order[pos[found]]
+
+    def get_recipe(self, recipe_id: int) -> dict | None:
+        recipe = self.recipes.get(int(recipe_id))
+        # 호출 측에서 키를 추가해도 snapshot 은 건드리지 않도록 복사
+        return dict(recipe) if recipe is not None else None
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "recipes": len(self.recipes),
+            "vectors": int(len(self.recipe_ids)),
+            "vector_meta": self.vector_meta,
+            "store_version": self.store_version,
+            "category_version": self.category_version,
+            "ann": self.ann_index is not None,
+            "rule_lexicon": len(self.rule_tagger),
+            "bm25_terms": len(self.lexical_index),
+        }
+
+
+class SnapshotHolder:
+    """
+    현재 snapshot 참조 + 백그라운드 재생성 / 원자적 교체
+    """
+
+    def __init__(self):
+        self._current: RecipeSnapshot | None = None
+        self._version = 0
+        self._init_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self.last_error: str | None = None
+
+    def current(self) -> RecipeSnapshot:
+        snapshot = self._current
+        if snapshot is not None:
+            return snapshot
+
+        # 최초 1회는 동기 로드
+        with self._init_lock:
+            if self._current is None:
+                self._swap(self._build())
+            return self._current
+
+    def _build(self) -> RecipeSnapshot:
+        self._version += 1
+        snapshot = RecipeSnapshot(self._version)
+
+        # 읽는 도중 빌드가 파일을 교체했으면 섞였을 수 있음 → 다음 주기에 재시도
+        if _file_stamp() != snapshot.file_stamp:
+            raise RuntimeError("vector files changed while loading")
+        return snapshot
+
+    def _swap(self, snapshot: RecipeSnapshot):
+        weakref.finalize(snapshot, print, f"♻ RECIPE SNAPSHOT v{snapshot.version} released")
+        self._current = snapshot   # 참조 교체는 원자적
+        print(f"🔄 RECIPE SNAPSHOT v{snapshot.version} active: {snapshot.info()['vectors']} vectors")
+
+    def reload(self, refresh_store: bool = True) -> bool:
+        """
+        새 snapshot 을 만들어 교체 (이미 재생성 중이면 False)
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        try:
+            if refresh_store:
+                recipe_store.refresh(force=True)
+                category_service.refresh(force=True)
+            self._swap(self._build())
+            self.last_error = None
+        except Exception as e:
+            # 실패하면 기존 snapshot 으로 계속 서비스
+            self.last_error = str(e)
+            print(f"[ERROR] Snapshot reload failed: {e}")
+        finally:
+            self._reload_lock.release()
+        return True
+
+    def reload_async(self) -> bool:
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, name="snapshot-reload", daemon=True).start()
+        return True
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    # --------------------------------------------------------
+    # 변경 감시 (벡터 파일 교체 / 카탈로그 변경)
+    # --------------------------------------------------------
+    def _needs_reload(self) -> bool:
+        snapshot = self.current()
+
+        if _file_stamp() != snapshot.file_stamp:
+            return True
+
+        recipe_store.refresh()
+        category_service.refresh()
+        return (
+            recipe_store.version != snapshot.store_version
+            or category_service.version != snapshot.category_version
+        )
+
+    def _watch(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                if self._needs_reload():
+                    self.reload(refresh_store=False)
+            except Exception as e:
+                print(f"[ERROR] Snapshot watcher: {e}")
+
+    def start_watcher(self, interval: float = SNAPSHOT_WATCH_INTERVAL):
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="snapshot-watcher", daemon=True
+        )
+        self._watcher.start()
+
+
+# 서버 프로세스 당 하나
+snapshot_holder = SnapshotHolder()
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Dict
+
+from models.recipe_loader_spring import fetch_all_recipes_from_spring
+
+# ==============================
+# In-memory recipe store
+# ==============================
+REFRESH_INTERVAL = 60 * 5   # 5분 (초)
+
+
+def recipe_id_of(recipe: dict) -> int | None:
+    """
+    Spring 응답마다 다른 id 키(recipeId / recipe_id / id)를 통일
+    """
+    for key in ("recipeId", "recipe_id", "id"):
+        if recipe.get(key) is not None:
+            return int(recipe[key])
+    return None
+
+
+def recipe_text(recipe: dict) -> str:
+    """
+    재료 매칭용 텍스트 (재료 + 양념)
+    단건 API(spicy_ingredient) / 전체 API(spicyIngredient) 키 모두 지원
+    """
+    spicy = recipe.get("spicy_ingredient") or recipe.get("spicyIngredient") or ""
+    return (recipe.get("ingredient") or "") + " " + spicy
+
+
+def _fingerprint(recipe: dict) -> str:
+    raw = json.dumps(recipe, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class RecipeStore:
+    """
+    전체 레시피를 한 번에 받아 id 기준으로 메모리에 보관
+    - 조회는 전부 메모리에서 처리 (Spring 왕복 없음)
+    - REFRESH_INTERVAL 마다 ETag 조건부 요청으로 변경분만 반영
+    - 실제 내용이 바뀐 경우에만 version 증가 (인덱스 재생성 트리거)
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.version = 0
+
+        self._recipes: Dict[int, dict] = {}
+        self._fingerprints: Dict[int, str] = {}
+        self._etag: str | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # 갱신
+    # --------------------------------------------------------
+    def refresh(self, force: bool = False) -> bool:
+        """
+        카탈로그 갱신. 내용이 바뀌었으면 True
+        """
+        with self._lock:
+            if not force and time.time() - self._checked_at < self.refresh_interval:
+                return False
+
+            etag = None if force else self._etag
+            try:
+                recipes, new_etag = fetch_all_recipes_from_spring(etag)
+            except Exception as e:
+                print(f"[ERROR] Recipe store refresh failed: {e}")
+                # 실패해도 기존 데이터로 계속 서비스, 다음 주기에 재시도
+                self._checked_at = time.time()
+                return False
+
+            self._checked_at = time.time()
+
+            if recipes is None:   # 304 Not Modified
+                return False
+
+            return self._apply(recipes, new_etag)
+
+    def _apply(self, recipes: list[dict], etag: str | None) -> bool:
+        new_recipes: Dict[int, dict] = {}
+        new_fingerprints: Dict[int, str] = {}
+        changed = 0
+
+        for r in recipes:
+            rid = recipe_id_of(r)
+            if rid is None:
+                continue
+
+            fp = _fingerprint(r)
+            if self._fingerprints.get(rid) == fp:
+                # 변경 없는 레시피는 기존 객체 재사용
+                new_recipes[rid] = self._recipes[rid]
+            else:
+                new_recipes[rid] = r
+                changed += 1
+            new_fingerprints[rid] = fp
+
+        removed = len(self._recipes.keys() - new_recipes.keys())
+
+        self._etag = etag
+        if not changed and not removed:
+            return False
+
+        # dict 통째로 교체 → 읽는 쪽은 락 없이 일관된 스냅샷을 본다
+        self._recipes = new_recipes
+        self._fingerprints = new_fingerprints
+        self.version += 1
+
+        print(
+            f"🍳 RECIPE STORE v{self.version}: "
+            f"{len(new_recipes)} recipes ({changed} changed, {removed} removed)"
+        )
+        return True
+
+    def _ensure_fresh(self):
+        if not self._recipes or time.time() - self._checked_at >= self.refresh_interval:
+            self.refresh()
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+    def get(self, recipe_id: int) -> dict | None:
+        self._ensure_fresh()
+
+        recipe = self._recipes.get(int(recipe_id))
+        if recipe is None:
+            return None
+
+        # 호출 측에서 키를 추가/수정해도 저장본은 건드리지 않도록 복사
+        return dict(recipe)
+
+    def all(self) -> Dict[int, dict]:
+        """
+        id → recipe 전체 (읽기 전용으로 사용)
+        """
+        self._ensure_fresh()
+        return self._recipes
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+
+# 서버 프로세스 당 하나
+recipe_store = RecipeStore()
+
+
+def get_recipe(recipe_id: int) -> dict | None:
+    return recipe_store.get(recipe_id)
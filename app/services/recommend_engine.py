@@ -1,151 +1,205 @@
+import os
 import numpy as np
-from numpy.linalg import norm
 import random
 
-from app.services.embed_service import get_embedding
-from models.recipe_loader import (
-    get_recipe_by_id,
-    load_all_recipe_categories,
-)
+from app.services.ann_index import DEFAULT_NPROBE
+from app.services.lexical_index import reciprocal_rank_fusion, weighted_fusion
+from app.services.query_vector import build_query_vector
+from app.services.recipe_snapshot import RecipeSnapshot, snapshot_holder
+from app.services.vector_store import cosine_scores
 from app.utils.normalize import normalize_query
+from app.utils.topk import top_k_indices
 
 
 
 
 
-# 레시피 임베딩 로드
-recipe_vectors = np.load("models/recipe_vectors.npy")   # (N, 768)
-recipe_ids = np.load("models/recipe_ids.npy")           # (N,)
+# 후보 개수 (요청마다 top_k 로 변경 가능)
+TOP_K = 10
+MAX_TOP_K = 100
 
+# 근사 탐색(IVF) 탐색 클러스터 수
+ANN_NPROBE = DEFAULT_NPROBE
 
-# --------------------------------------------------------
-# Semantic booster (카테고리 의미 강화)
-# --------------------------------------------------------
-CATEGORY_KEYWORDS = {
-    "밑반찬": "간단한 반찬 간단요리 무침 볶음 조림 짭짤한 집반찬",
-    "메인반찬": "메인요리 고기 해물 든든한 구이 튀김 볶음 메인 디너",
-    "국-탕": "국물 따뜻한 시원한 탕 깊은육수 한식국물 얼큰 개운한",
-    "찌개": "찌개 얼큰 자작 국물 진한 맛 칼칼한 구수한 깊은맛 한식찌개",
-    "면": "면요리 라면 칼국수 국수 우동 쫄깃한 면식",
-    "파스타": "파스타 오일파스타 토마토파스타 크림파스타 양식 면요리 이탈리안",
-    "밥": "밥 한식 백반 든든한 집밥 따뜻한 공기밥 기본식사",
-    "볶음밥": "볶음밥 고슬고슬 볶은밥 한그릇요리 간단한 메뉴 볶음 맛있는",
-    "덮밥": "덮밥 한그릇요리 밥위에 올린 음식 소스 든든한 덮어먹는 메뉴",
-    "양식": "양식 버터 치즈 오븐 스테이크 수프 샐러드 서양식 요리",
-    "샐러드": "샐러드 상큼 야채 건강식 가벼운 식사 드레싱 채소 신선한",
-    "빵": "빵 토스트 샌드위치 베이커리 브런치 간단식 밀가루 버터 오븐",
-    "떡볶이": "떡볶이 매운떡 국물떡볶이 분식 매콤한 쌀떡 밀떡 인기 간식",
-    "간식": "간식 달달한 주전부리 과자 군것질 간단한 스낵",
-    "디저트": "디저트 달콤한 케이크 쿠키 아이스크림 후식 브런치",
-    "기타": "기타 요리 독특한 음식 단일메뉴 특별한요리",
-}
-
+# 어휘(BM25) + 의미(SBERT) 결합 방식: rrf | weighted | off
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "rrf")
+HYBRID_DENSE_WEIGHT = float(os.getenv("HYBRID_DENSE_WEIGHT", "0.7"))   # weighted 일 때 코사인 비중
 
-# --------------------------------------------------------
-# 🔥 재료 하드 필터용 함수 (핵심)
-# --------------------------------------------------------
-def recipe_contains_ingredients(recipe_id: int, ingredients: list[str]) -> bool:
-    recipe = get_recipe_by_id(recipe_id)
-    if not recipe:
-        return False
+# 두 순위 목록에서 각각 상위 몇 개까지 합칠지
+FUSION_DEPTH = 50
 
-    text = (
-        (recipe.get("ingredient") or "") + " " +
-        (recipe.get("spicy_ingredient") or "")
-    )
+# 후보가 이만큼 많으면 BM25 상위 LEXICAL_SHORTLIST 개 안에서만 코사인 계산
+LEXICAL_SHORTLIST = int(os.getenv("LEXICAL_SHORTLIST", "2000"))
+LEXICAL_SHORTLIST_MIN_ROWS = int(os.getenv("LEXICAL_SHORTLIST_MIN_ROWS", "50000"))
 
-    return all(ing in text for ing in ingredients)
 
 # --------------------------------------------------------
 # STEP 1. 후보 필터링 + query 강화
 # --------------------------------------------------------
-def get_candidates(user_query: str, tags: dict):
-    ALL_CATEGORY_MAP = load_all_recipe_categories()
+def seen_row_mask(snapshot: RecipeSnapshot, seen_ids) -> np.ndarray | None:
+    """
+    이미 본 레시피의 행 마스크 (없으면 None)
+    카탈로그 전체를 이미 봤으면 None → 다시 보여줄 수밖에 없음
+    """
+    if not seen_ids:
+        return None
+
+    rows = snapshot.rows_for(seen_ids)
+    if not len(rows) or len(rows) >= len(snapshot.recipe_ids):
+        return None
+
+    mask = np.zeros(len(snapshot.recipe_ids), dtype=bool)
+    mask[rows] = True
+    return mask
+
+
+def dense_top_k(
+    snapshot: RecipeSnapshot,
+    query_vec: np.ndarray,
+    k: int,
+    candidate_rows: np.ndarray | None = None,
+    seen_mask: np.ndarray | None = None,
+):
+    """
+    코사인 상위 k개 (행 번호, 점수) — IVF 인덱스가 있으면 근사, 없으면 전수
+    """
+    recipe_vectors = snapshot.recipe_vectors
+
+    if snapshot.ann_index is not None:
+        return snapshot.ann_index.search(
+            recipe_vectors, query_vec, k,
+            allowed_rows=candidate_rows, nprobe=ANN_NPROBE, excluded=seen_mask
+        )
+
+    # 전체 행에 대해 계산 후 후보 행만 고름 (벡터 행렬 복사 없음)
+    scores = cosine_scores(recipe_vectors, query_vec)
+
+    if candidate_rows is None:
+        if seen_mask is not None:
+            scores[seen_mask] = -np.inf
+        top_rows = top_k_indices(scores, k)
+        # 안 본 레시피가 k개보다 적으면 -inf 가 섞임
+        top_rows = top_rows[np.isfinite(scores[top_rows])]
+    else:
+        top_rows = candidate_rows[top_k_indices(scores[candidate_rows], k)]
+
+    return top_rows, scores[top_rows]
+
+
+def fuse_rows(
+    recipe_vectors: np.ndarray,
+    query_vec: np.ndarray,
+    dense_rows: np.ndarray,
+    lexical_rows: np.ndarray,
+    lexical_scores: np.ndarray,
+    k: int,
+) -> np.ndarray:
+    """
+    의미 순위 + BM25 순위 → 상위 k개 행 (HYBRID_SEARCH 방식)
+    """
+    if HYBRID_SEARCH == "weighted":
+        rows = np.union1d(dense_rows, lexical_rows)
+        lexical = dict(zip(lexical_rows.tolist(), lexical_scores.tolist()))
+        return weighted_fusion(
+            rows,
+            cosine_scores(recipe_vectors[rows], query_vec),
+            np.array([lexical.get(row, 0.0) for row in rows.tolist()], dtype=np.float32),
+            k,
+            HYBRID_DENSE_WEIGHT,
+        )
+
+    return reciprocal_rank_fusion([dense_rows, lexical_rows], k)
+
+
+def get_candidates(
+    user_query: str,
+    tags: dict,
+    top_k: int = TOP_K,
+    snapshot: RecipeSnapshot | None = None,
+    seen_ids=(),
+):
+    """
+    seen_ids: 이미 본 recipe_id — 상위 k개를 고르기 전에 제외 (전부 봤을 때만 다시 포함)
+    """
+    snapshot = snapshot or snapshot_holder.current()
+    recipe_vectors, recipe_ids = snapshot.recipe_vectors, snapshot.recipe_ids
 
     categories = tags.get("category", []) or []
     ingredients = tags.get("ingredients", []) or []
 
     # 기본값: 전체
-    filtered_ids = recipe_ids
-    filtered_vecs = recipe_vectors
+    candidate_rows = None
 
-
-    
     # ----------------------------------------------------
-    # 1) category + ingredient 하드 필터
+    # 1) category + ingredient 하드 필터 (사전 계산된 마스크)
     # ----------------------------------------------------
     if categories:
-        target_cat = categories[0]
-
-        new_ids = []
-        new_vecs = []
-
-        for rid, vec in zip(recipe_ids, recipe_vectors):
-
-            cat_list = ALL_CATEGORY_MAP.get(str(rid), [])
-
-            if categories:
-                if not any(
-                    target_cat in c or c in target_cat
-                    for c in cat_list
-                ):
-                    continue
+        mask = snapshot.category_index.mask_for(categories[0])
 
-            if ingredients:
-                if not recipe_contains_ingredients(rid, ingredients):
-                    continue
-            
-            new_ids.append(rid)
-            new_vecs.append(vec)
+        if ingredients:
+            mask = mask & snapshot.ingredient_index.contains_all_mask(ingredients)
 
-        if new_ids:
-            filtered_ids = np.array(new_ids)
-            filtered_vecs = np.array(new_vecs)
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            candidate_rows = rows
 
- 
     # ----------------------------------------------------
-    # 2) query_text 생성 (semantic boosting)
+    # 1-1) 이미 본 레시피 제외 (필터 안에서 전부 봤으면 그대로 둠)
     # ----------------------------------------------------
-    query_parts = []
+    seen_mask = seen_row_mask(snapshot, seen_ids)
 
-    # 사용자 원문
-    query_parts.append(user_query)
+    if seen_mask is not None and candidate_rows is not None:
+        fresh_rows = candidate_rows[~seen_mask[candidate_rows]]
+        if len(fresh_rows):
+            candidate_rows = fresh_rows
+        seen_mask = None
 
-    # 카테고리 의미 강화
-    if categories:
-        key = CATEGORY_KEYWORDS.get(categories[0])
-        if key:
-            query_parts.append(key)
-
-    # 재료 의미 강화 (가중치)
-    if ingredients:
-        ing_text = " ".join(ingredients)
-        query_parts.append(ing_text)
-        query_parts.append((ing_text + " ") * 3)
+    # ----------------------------------------------------
+    # 2) query 벡터 합성 (문장 + 카테고리 + 재료, 가중합)
+    # ----------------------------------------------------
+    query_vec = build_query_vector(user_query, categories, ingredients)
 
-    # fallback
-    if not query_parts:
-        query_parts.append("요리 음식 레시피 한식 집밥")
+    # ----------------------------------------------------
+    # 3) 어휘 후보 (BM25: 이름 / 재료 / 양념 / 조리 방법)
+    # ----------------------------------------------------
+    k = min(max(int(top_k), 1), MAX_TOP_K)
 
-    query_text = " ".join(query_parts)
+    lexical_rows = lexical_scores = None
+    if HYBRID_SEARCH != "off" and snapshot.lexical_index is not None:
+        lexical_rows, lexical_scores = snapshot.lexical_index.search(
+            " ".join([user_query, *ingredients]), LEXICAL_SHORTLIST,
+            allowed_rows=candidate_rows, excluded=seen_mask,
+        )
+    hybrid = lexical_rows is not None and len(lexical_rows) > 0
+    depth = max(k, FUSION_DEPTH) if hybrid else k
 
-    query_vec = get_embedding(query_text)
+    # ----------------------------------------------------
+    # 4) 유사도 계산
+    # ----------------------------------------------------
+    pool = len(recipe_ids) if candidate_rows is None else len(candidate_rows)
+
+    if hybrid and pool >= LEXICAL_SHORTLIST_MIN_ROWS and len(lexical_rows) >= depth:
+        # 큰 카탈로그: 어휘 shortlist 안에서만 코사인 계산
+        shortlist = np.sort(lexical_rows)
+        scores = cosine_scores(recipe_vectors[shortlist], query_vec)
+        top = top_k_indices(scores, depth)
+        dense_rows, dense_scores = shortlist[top], scores[top]
+    else:
+        dense_rows, dense_scores = dense_top_k(snapshot, query_vec, depth, candidate_rows, seen_mask)
 
     # ----------------------------------------------------
-    # 3) 유사도 계산
+    # 5) 어휘 + 의미 순위 합치기 (점수는 코사인 그대로 → softmax 척도 유지)
     # ----------------------------------------------------
-    scores = np.dot(filtered_vecs, query_vec) / (
-        norm(query_vec) * norm(filtered_vecs, axis=1)
-    )
+    if hybrid:
+        top_rows = fuse_rows(recipe_vectors, query_vec, dense_rows, lexical_rows[:depth], lexical_scores[:depth], k)
+        top_scores = cosine_scores(recipe_vectors[top_rows], query_vec)
+    else:
+        top_rows, top_scores = dense_rows, dense_scores
 
-    TOP_K = 10
-    k = min(TOP_K, len(scores))
+    top_ids = list(recipe_ids[top_rows])
+    top_scores = list(top_scores)
 
-    top_idx = np.argsort(scores)[::-1][:k]
-    top_ids = list(filtered_ids[top_idx])
-    top_scores = list(scores[top_idx])
-    
-    print("🔥 filtered_ids count:", len(filtered_ids))
+    print("🔥 filtered_ids count:", len(recipe_ids) if candidate_rows is None else len(candidate_rows))
 
     return top_ids, top_scores
    
@@ -161,18 +215,32 @@ def softmax(x):
     return e_x / e_x.sum()
 
 
-def get_next_recipe(user_query: str, tags: dict, seen_ids):
+def get_next_recipe(
+    user_query: str,
+    tags: dict,
+    seen_ids,
+    top_k: int = TOP_K,
+    snapshot: RecipeSnapshot | None = None,
+    candidates: tuple | None = None,
+):
+    """
+    candidates: 같은 query / tags / snapshot 으로 미리 계산한 get_candidates 결과 (있으면 재사용)
+    """
+
+    # 요청 하나는 처음 잡은 snapshot 만 사용 (도중에 교체돼도 일관성 유지)
+    snapshot = snapshot or snapshot_holder.current()
 
     if tags.get("mode") == "fridge":
-        return get_next_recipe_by_fridge(tags, seen_ids)
+        return get_next_recipe_by_fridge(tags, seen_ids, snapshot)
     
-    user_query = normalize_query(user_query)
-    candidates, scores = get_candidates(user_query, tags)
+    if candidates is None:
+        candidates = get_candidates(normalize_query(user_query), tags, top_k, snapshot, seen_ids)
+    candidates, scores = candidates
 
     if not candidates:
         return None
 
-    # 이미 본 레시피 제거
+    # 후보는 이미 본 레시피를 빼고 골랐지만, 미리 계산한 후보는 그 뒤 기록이 섞였을 수 있음
     filtered_ids = []
     filtered_scores = []
 
@@ -195,7 +263,7 @@ def get_next_recipe(user_query: str, tags: dict, seen_ids):
     # ================================
     # 🔥 여기!!!! (핵심 수정 포인트)
     # ================================
-    recipe = get_recipe_by_id(rid)
+    recipe = snapshot.get_recipe(rid)
     print("🔥 RETURN RECIPE =", recipe)
     if not recipe:
         return None
@@ -206,76 +274,26 @@ def get_next_recipe(user_query: str, tags: dict, seen_ids):
 
     return recipe
 
-def get_next_recipe_by_fridge(tags: dict, seen_ids):
+def get_next_recipe_by_fridge(tags: dict, seen_ids, snapshot: RecipeSnapshot | None = None):
+    snapshot = snapshot or snapshot_holder.current()
+
     ingredients = tags.get("ingredients", [])
     if not ingredients:
         return None
 
-    INGREDIENT_MAP = {
-        "고기": ["고기", "돼지고기", "소고기", "쇠고기", "닭", "닭고기"],
-        "달걀": ["달걀", "계란"],
-        "계란": ["달걀", "계란"],
-        "파": ["파", "대파", "쪽파"],
-        "고추": ["고추", "청양고추", "홍고추"],
-        "면": ["면", "국수", "라면", "파스타", "짜파게티"],
-        "밥": ["밥", "쌀"],
-        "해산물": ["새우", "오징어", "조개", "게"],
-    }
-
-    def ingredient_match(text: str, ing: str) -> bool:
-        candidates = INGREDIENT_MAP.get(ing, [ing])
-        return any(c in text for c in candidates)
-
-    scored = []
-
-    for rid in recipe_ids:
-        if rid in seen_ids:
-            continue
-
-        recipe = get_recipe_by_id(rid)
-        if not recipe:
-            continue
-
-        text = (
-            (recipe.get("ingredient") or "") + " " +
-            (recipe.get("spicy_ingredient") or "")
-        )
-
-        # 🔹 재료 매칭 개수 (핵심)
-        match_count = sum(
-            ingredient_match(text, ing)
-            for ing in ingredients
-        )
-
-        # ❌ 진짜 하나도 안 맞으면만 탈락
-        if match_count == 0:
-            continue
+    # 🔹 재료 역색인으로 매칭 개수 계산 (점수 = 매칭 개수)
+    top = snapshot.ingredient_index.top_matches(ingredients, seen_ids)
+    print("🧊 FRIDGE FILTER RESULT COUNT =", len(top))
 
-        # 🔹 면 요리 제약 (면 관련 재료 없으면 제외)
-        if ingredient_match(text, "면") and not any(
-            ing in ["면", "라면", "파스타"] for ing in ingredients
-        ):
-            continue
-
-        # 🔹 점수 = 매칭 개수 (단순하고 안정적)
-        score = match_count
-
-        scored.append((score, rid))
-        print("🧊 FRIDGE FILTER RESULT COUNT =", len(scored))
-
-    if not scored:
+    if not top:
         return None
 
     # 🔥 점수 높은 것 우선, 동점은 랜덤
-    scored.sort(reverse=True)
-    best_score = scored[0][0]
-    top = [rid for s, rid in scored if s == best_score]
-
     rid = random.choice(top)
-    recipe = get_recipe_by_id(rid)
+    recipe = snapshot.get_recipe(rid)
 
     if recipe and "recipe_id" not in recipe and "id" in recipe:
         recipe["recipe_id"] = recipe["id"]
 
     print("🔥 FRIDGE RETURN RECIPE =", recipe)
-    return recipe
\ No newline at end of file
+    return recipe
@@ -0,0 +1,167 @@
+import os
+import re
+from collections import Counter
+
+from app.services.recipe_store import recipe_text
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.normalize import INGREDIENT_MAP, SYNONYM_MAP
+
+# ==============================
+# 규칙 기반 태그 추출 (LLM 앞단 fast path)
+# ==============================
+# 0 이면 항상 LLM 사용
+RULE_TAGGER = os.getenv("RULE_TAGGER", "1") != "0"
+
+# LLM 프롬프트의 허용 category 목록과 동일 ("기타" 는 사용자가 말할 일이 없으므로 제외)
+ALLOWED_CATEGORIES = [
+    "밑반찬", "메인반찬", "국-탕", "찌개", "면", "파스타", "밥", "볶음밥", "덮밥",
+    "양식", "샐러드", "빵", "떡볶이", "간식", "디저트",
+]
+
+# 프롬프트의 [카테고리 추론 힌트] 와 동일
+CATEGORY_HINTS = {
+    "찌개": "찌개",
+    "국": "국-탕", "탕": "국-탕", "국물": "국-탕",
+    "라면": "면", "국수": "면", "칼국수": "면", "우동": "면", "냉면": "면",
+    "파스타": "파스타", "알리오올리오": "파스타", "스파게티": "파스타",
+    "볶음밥": "볶음밥",
+    "덮밥": "덮밥",
+    "샌드위치": "빵", "토스트": "빵",
+    "떡볶이": "떡볶이",
+}
+
+# 여러 개 잡히면 rule_adjust 와 같은 우선순위로 1개만
+CATEGORY_PRIORITY = ["찌개", "국-탕", "면", "볶음밥", "덮밥"]
+
+# 재료로 취급하지 않는 단어 (프롬프트의 추상 단어 + 레시피 텍스트의 단위 / 수식어)
+ABSTRACT_WORDS = {
+    "재료", "주재료", "부재료", "양념", "음식", "요리", "메뉴", "기타", "추천",
+}
+UNIT_WORDS = {
+    "포기", "큰술", "작은술", "숟가락", "스푼", "컵", "개", "약간", "적당량", "조금",
+    "줌", "쪽", "톨", "장", "모", "마리", "대", "봉지", "캔", "팩", "인분", "공기",
+    "그램", "방울", "꼬집", "기호", "또는", "선택", "다진", "썬", "삶은", "데친",
+    "불린", "손질한", "냉동", "생",
+}
+
+# 질의에 흔한 요청 / 수식 표현 (태그에는 영향 없음, 매칭되면 "이해한" 부분으로 침)
+FILLER_WORDS = [
+    "먹고싶", "먹고 싶", "먹을", "먹자", "먹어", "먹기", "먹는", "먹지", "해먹", "해 먹",
+    "싶어", "싶다", "싶은", "싶네", "싶음", "땡겨", "땡기는", "당기는", "당겨",
+    "추천", "알려", "해줘", "해 줘", "해주세요", "주세요", "줘", "부탁",
+    "수 있는", "할 수", "있는데", "있는",
+    "뭐", "뭘", "무엇", "있어", "있을까", "있나", "없나", "할까", "어때", "좋을까", "좋은",
+    "오늘", "내일", "저녁", "점심", "아침", "야식", "메뉴", "요리", "음식", "레시피", "재료",
+    "거", "것", "걸", "하나", "만들", "만드는", "간단", "쉬운", "빠르게", "빨리",
+    "맛있는", "든든한", "가벼운", "따뜻한", "시원한", "달달한", "담백한", "짭짤한",
+    "매운", "매콤", "칼칼", "얼큰", "이런", "저런", "그런", "다른", "종류", "들어간", "넣은",
+]
+
+# 제외 의도 → 규칙으로는 재료를 뺄 수 없으므로 함께 나오면 LLM 에 맡김
+NEGATION_WORDS = ["말고", "빼고", "없이", "싫어", "제외"]
+
+# 매칭되지 않고 남아도 되는 조각 (조사 / 어미)
+PARTICLES = [
+    "이랑", "으로", "에서", "하고", "처럼", "보다", "이나", "같은", "하는",
+    "은", "는", "이", "가", "을", "를", "에", "로", "랑", "과", "와", "도", "만",
+    "의", "나", "요", "좀", "고", "해", "한", "된", "들", "게", "면",
+    "어", "다", "지", "래", "까",
+]
+_PARTICLE_RE = re.compile("(?:" + "|".join(PARTICLES) + ")+")
+_IGNORED_RE = re.compile(r"[\s0-9?!.,~^…]+")
+
+# 카탈로그에서 이 레시피 수 이상 등장한 토큰만 재료로 등록 (오타 / 설명 문구 제외)
+INGREDIENT_MIN_DF = 2
+MAX_INGREDIENTS = 5
+
+CATEGORY, INGREDIENT, FILLER, NEGATION = "category", "ingredient", "filler", "negation"
+
+
+def _catalog_ingredients(recipes: dict[int, dict]) -> set[str]:
+    df = Counter()
+    for recipe in recipes.values():
+        df.update(set(re.findall(r"[가-힣]{2,}", recipe_text(recipe))))
+    return {tok for tok, n in df.items() if n >= INGREDIENT_MIN_DF}
+
+
+class RuleTagger:
+    """
+    카탈로그 카테고리 / 재료 사전 + Aho-Corasick 매칭으로 태그 추출
+
+    - 질의 전체가 사전 단어 + 요청 표현 + 조사로 설명될 때만 결과를 돌려줌
+    - 모르는 단어가 하나라도 남으면 None → LLM 으로
+    - 매칭은 원문 기준 (normalize_query 의 부분 치환이 "파스타" 를 "대파스타" 로 바꾸므로)
+      → 잡힌 재료만 SYNONYM_MAP 으로 정규화
+    """
+
+    def __init__(self, recipes: dict[int, dict], category_names: list[str]):
+        self.matcher = AhoCorasick()
+
+        # 우선순위: 재료 < 카테고리 (같은 단어면 나중에 넣은 것이 이김)
+        ingredients = (
+            _catalog_ingredients(recipes)
+            | set(INGREDIENT_MAP)
+            | {s for synonyms in INGREDIENT_MAP.values() for s in synonyms if len(s) > 1}
+            | set(SYNONYM_MAP)
+            | set(SYNONYM_MAP.values())
+        ) - ABSTRACT_WORDS - UNIT_WORDS
+        self.ingredients = ingredients
+
+        for word in FILLER_WORDS:
+            self.matcher.add(word, (FILLER, None))
+        for word in sorted(ingredients):
+            self.matcher.add(word, (INGREDIENT, SYNONYM_MAP.get(word, word)))
+
+        categories = {c: c for c in category_names if c in ALLOWED_CATEGORIES}
+        categories.update(CATEGORY_HINTS)
+        for word, category in categories.items():
+            self.matcher.add(word, (CATEGORY, category))
+        self.categories = categories
+
+        for word in NEGATION_WORDS:
+            self.matcher.add(word, (NEGATION, None))
+
+        self.matcher.build()
+
+    def __len__(self) -> int:
+        return len(self.matcher)
+
+    def extract(self, user_query: str, strict: bool = True) -> dict | None:
+        """
+        확신할 수 있으면 {"category": [...], "ingredients": [...]}, 아니면 None
+        strict=False: 모르는 단어가 남아도 잡힌 사전 단어로 추정치를 돌려줌 (투기적 후보 계산용)
+        """
+        text = " ".join(user_query.lower().split())
+        if not text:
+            return None
+
+        matches = self.matcher.find(text)
+
+        # 매칭되지 않은 조각은 조사 / 어미 / 숫자 / 기호만 허용
+        covered = bytearray(len(text))
+        for start, end, _, _ in matches:
+            covered[start:end] = b"\x01" * (end - start)
+        leftover = "".join(ch if not covered[i] else " " for i, ch in enumerate(text))
+        for piece in _IGNORED_RE.split(leftover):
+            if strict and piece and not _PARTICLE_RE.fullmatch(piece):
+                return None
+
+        category: list[str] = []
+        ingredients: list[str] = []
+        negated = False
+        for _, _, _, (kind, value) in matches:
+            if kind == CATEGORY and value not in category:
+                category.append(value)
+            elif kind == INGREDIENT and value not in ingredients:
+                ingredients.append(value)
+            elif kind == NEGATION:
+                negated = True
+
+        if strict and negated and (category or ingredients):
+            return None
+
+        if len(category) > 1:
+            picked = next((p for p in CATEGORY_PRIORITY if p in category), category[0])
+            category = [picked]
+
+        return {"category": category, "ingredients": ingredients[:MAX_INGREDIENTS]}
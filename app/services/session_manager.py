@@ -1,60 +1,313 @@
+import heapq
+import itertools
+import os
+import threading
 import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 
 # ==============================
 # In-memory session storage
 # ==============================
-SESSION = {}
 TTL = 60 * 60 * 12   # 12시간 (초)
 
+# 메모리 상한: 세션(사용자) 수 / 세션당 기록 수
+SESSION_MAX_USERS = int(os.getenv("SESSION_MAX_USERS", "100000"))
+SESSION_MAX_ITEMS = int(os.getenv("SESSION_MAX_ITEMS", "500"))
 
-def _cleanup(user_id: str):
+# 만료 세션 정리 주기 (초)
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+# 락 분할 개수 (사용자 id 해시로 나눔 → 서로 다른 사용자는 거의 경합하지 않음)
+SESSION_STRIPES = 64
+
+
+class _Session:
+    """
+    사용자 한 명의 seen 기록
+    - ring: (seen_at, recipe_id) 시간순 링 버퍼 (가득 차면 가장 오래된 것부터 밀려남)
+    - counts: recipe_id → ring 안의 개수 (포함 여부 O(1))
+    - gen: 이 세션의 유효한 만료 힙 항목 번호 (힙에 다시 넣을 때마다 새 번호
+      → 같은 user_id 가 제거 후 다시 생겨도, 재구성 전 항목이 남아도 세션당 유효 항목은 하나)
+    """
+
+    __slots__ = ("ring", "counts", "gen")
+
+    def __init__(self, max_items: int, gen: int):
+        self.ring: deque = deque(maxlen=max_items)
+        self.counts: dict[int, int] = {}
+        self.gen = gen
+
+    def add(self, recipe_id: int, now: float):
+        if len(self.ring) == self.ring.maxlen:
+            self._forget(self.ring[0][1])
+        self.ring.append((now, recipe_id))
+        self.counts[recipe_id] = self.counts.get(recipe_id, 0) + 1
+
+    def expire(self, cutoff: float):
+        # 앞쪽(가장 오래된 것)부터 TTL 지난 것만 제거 → 전체를 다시 만들지 않음
+        ring = self.ring
+        while ring and ring[0][0] < cutoff:
+            _, recipe_id = ring.popleft()
+            self._forget(recipe_id)
+
+    def _forget(self, recipe_id: int):
+        n = self.counts[recipe_id] - 1
+        if n:
+            self.counts[recipe_id] = n
+        else:
+            del self.counts[recipe_id]
+
+    @property
+    def expires_at(self) -> float:
+        return self.ring[-1][0] + TTL if self.ring else 0.0
+
+
+class SessionBackend(ABC):
     """
-    TTL(12시간) 지난 seen 기록 제거
+    세션 저장소 인터페이스
+    - memory: 프로세스 안 (기본, 워커 1개일 때)
+    - sqlite: 같은 호스트의 여러 uvicorn 워커가 공유 (app.services.session_sqlite)
     """
-    now = time.time()
 
-    if user_id not in SESSION:
-        return
+    @abstractmethod
+    def get_seen(self, user_id: str) -> frozenset:
+        ...
+
+    @abstractmethod
+    def add_seen(self, user_id: str, recipe_id: int):
+        ...
 
-    SESSION[user_id] = [
-        item
-        for item in SESSION[user_id]
-        if now - item["seen_at"] < TTL
-    ]
+    @abstractmethod
+    def get_last_seen(self, user_id: str) -> dict | None:
+        ...
 
-    if not SESSION[user_id]:
-        del SESSION[user_id]
+    def flush(self):
+        # 모아 둔 쓰기를 즉시 반영 (버퍼가 없는 저장소는 할 일 없음)
+        pass
 
+    def stats(self) -> dict:
+        return {}
 
-def get_seen(user_id: str) -> list[int]:
+
+class MemorySessionStore(SessionBackend):
     """
-    TTL 적용 후, recipe_id 리스트 반환
+    사용자별 seen 기록 (스레드 안전)
+
+    - 락 분할: 사용자 id 해시 → stripe 하나 (stripe 마다 OrderedDict + Lock)
+    - 메모리 상한: stripe 별 세션 수 제한, 넘치면 가장 오래 안 쓴 세션 통째로 제거 (LRU)
+    - 만료: 요청 시 해당 세션 앞부분만 정리 + 백그라운드 sweeper 가
+      전역 만료 힙(세션 마지막 기록 + TTL)을 보고 방치된 세션(게스트 등)을 제거
     """
-    _cleanup(user_id)
 
-    if user_id not in SESSION:
-        return []
+    def __init__(
+        self,
+        max_users: int = SESSION_MAX_USERS,
+        max_items: int = SESSION_MAX_ITEMS,
+        stripes: int = SESSION_STRIPES,
+    ):
+        self.max_items = max_items
+        self.stripes = stripes
+        self._max_per_stripe = max(1, -(-max_users // stripes))
+        self._sessions = [OrderedDict() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        # (만료 시각, gen, user_id) — 세션이 생길 때 한 번, sweeper 가 아직 살아 있는 세션을 만나면 다시
+        # LRU 로 제거된 세션의 항목은 남아 있다가 (stale) 절반을 넘으면 힙을 다시 만듦
+        # 락 순서: _heap_lock → stripe 락 (stripe 락을 잡은 채 _heap_lock 을 잡지 않음)
+        self._heap: list[tuple[float, int, str]] = []
+        self._heap_lock = threading.Lock()
+        self._stale = 0
+        self._gen = itertools.count()
+        self._sweeper: threading.Thread | None = None
+
+        self.evictions = 0
+        self.expirations = 0
+
+    def _stripe(self, user_id: str) -> int:
+        return hash(user_id) % self.stripes
+
+    # --------------------------------------------------------
+    # 조회 / 기록
+    # --------------------------------------------------------
+    def get_seen(self, user_id: str) -> frozenset:
+        """
+        TTL 적용 후 recipe_id 집합
+        """
+        i = self._stripe(user_id)
+        with self._locks[i]:
+            session = self._sessions[i].get(user_id)
+            if session is None:
+                return frozenset()
+            self._sessions[i].move_to_end(user_id)
+            session.expire(time.time() - TTL)
+            return frozenset(session.counts)
+
+    def add_seen(self, user_id: str, recipe_id: int):
+        now = time.time()
+        i = self._stripe(user_id)
+        created = None
+        evicted = 0
+
+        with self._locks[i]:
+            sessions = self._sessions[i]
+            session = sessions.get(user_id)
+            if session is None:
+                session = created = sessions[user_id] = _Session(self.max_items, next(self._gen))
+                while len(sessions) > self._max_per_stripe:
+                    sessions.popitem(last=False)
+                    evicted += 1
+            else:
+                sessions.move_to_end(user_id)
+            session.add(recipe_id, now)
 
-    return [item["recipe_id"] for item in SESSION[user_id]]
+        if created is not None:
+            with self._heap_lock:
+                heapq.heappush(self._heap, (now + TTL, created.gen, user_id))
+                if evicted:
+                    self.evictions += evicted
+                    self._stale += evicted
+                    if self._stale * 2 > len(self._heap):
+                        self._rebuild_heap()
+            self._ensure_sweeper()
+
+    def get_last_seen(self, user_id: str) -> dict | None:
+        i = self._stripe(user_id)
+        with self._locks[i]:
+            session = self._sessions[i].get(user_id)
+            if session is None or not session.ring:
+                return None
+            seen_at, recipe_id = session.ring[-1]
+            if seen_at < time.time() - TTL:
+                return None
+            return {"recipe_id": recipe_id, "seen_at": seen_at}
+
+    # --------------------------------------------------------
+    # 백그라운드 만료
+    # --------------------------------------------------------
+    def _rebuild_heap(self):
+        """
+        살아 있는 세션만으로 만료 힙 재구성 (_heap_lock 을 잡은 상태에서 호출)
+        LRU 제거가 세션 수만큼 쌓일 때 한 번 → 제거 1건당 O(1) 로 분할 상환
+        """
+        heap = []
+        for i in range(self.stripes):
+            with self._locks[i]:
+                for user_id, session in self._sessions[i].items():
+                    session.gen = next(self._gen)
+                    heap.append((session.expires_at, session.gen, user_id))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._stale = 0
+
+    def sweep(self, now: float | None = None) -> int:
+        """
+        만료 시각이 지난 세션 제거 (제거한 세션 수)
+        """
+        now = time.time() if now is None else now
+        removed = 0
+
+        while True:
+            with self._heap_lock:
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, gen, user_id = heapq.heappop(self._heap)
+
+            i = self._stripe(user_id)
+            with self._locks[i]:
+                session = self._sessions[i].get(user_id)
+                stale = session is None or session.gen != gen
+                if not stale:
+                    expires_at = session.expires_at
+                    if expires_at <= now:
+                        del self._sessions[i][user_id]
+                        self.expirations += 1
+                        removed += 1
+                        continue
+                    session.gen = gen = next(self._gen)
+
+            with self._heap_lock:
+                if stale:
+                    # LRU 로 제거됐거나 (다시 생긴 세션은 자기 항목이 따로 있음) 힙 재구성 전 항목
+                    self._stale = max(0, self._stale - 1)
+                else:
+                    # 그 사이 새 기록이 있었음 → 실제 만료 시각으로 다시 등록
+                    heapq.heappush(self._heap, (expires_at, gen, user_id))
+
+        return removed
+
+    def _sweep_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                removed = self.sweep()
+                if removed:
+                    print(f"🧹 SESSION sweep: {removed} expired")
+            except Exception as e:
+                print(f"[ERROR] Session sweeper: {e}")
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or SESSION_SWEEP_INTERVAL <= 0:
+            return
+        with self._heap_lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, args=(SESSION_SWEEP_INTERVAL,),
+                    name="session-sweeper", daemon=True,
+                )
+                self._sweeper.start()
+
+    def stats(self) -> dict:
+        users = items = 0
+        for i in range(self.stripes):
+            with self._locks[i]:
+                users += len(self._sessions[i])
+                items += sum(len(s.ring) for s in self._sessions[i].values())
+        return {
+            "users": users,
+            "items": items,
+            "heap": len(self._heap),
+            "heap_stale": self._stale,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# 저장소 선택: memory (기본) | sqlite
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB = os.getenv("SESSION_DB", "sessions.db")
+
+
+def make_session_store(backend: str = SESSION_BACKEND) -> SessionBackend:
+    if backend == "sqlite":
+        from app.services.session_sqlite import SqliteSessionStore
+        return SqliteSessionStore(SESSION_DB)
+    if backend != "memory":
+        raise ValueError(f"unknown SESSION_BACKEND: {backend}")
+    return MemorySessionStore()
+
+
+# 서버 프로세스 당 하나
+session_store = make_session_store()
+
+
+def get_seen(user_id: str) -> frozenset:
+    """
+    TTL 적용 후, recipe_id 집합 반환
+    """
+    return session_store.get_seen(user_id)
 
 
 def add_seen(user_id: str, recipe_id: int):
     """
     새 recipe_id 기록
     """
-    now = time.time()
+    session_store.add_seen(user_id, recipe_id)
 
-    if user_id not in SESSION:
-        SESSION[user_id] = []
 
-    SESSION[user_id].append({
-        "recipe_id": recipe_id,
-        "seen_at": now
-    })
+def get_last_seen(user_id: str):
+    return session_store.get_last_seen(user_id)   # dict 반환
 
 
-def get_last_seen(user_id: str):
-    seen = SESSION.get(user_id, [])
-    if seen:
-        return seen[-1]   # dict 반환
-    return None
\ No newline at end of file
+def get_session_stats() -> dict:
+    return {"backend": type(session_store).__name__, **session_store.stats()}
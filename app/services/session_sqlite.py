@@ -0,0 +1,228 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from app.services.session_manager import SESSION_MAX_ITEMS, SESSION_SWEEP_INTERVAL, TTL, SessionBackend
+from app.utils.ttl_cache import TTLCache
+
+# ==============================
+# SQLite(WAL) 공유 세션 저장소 (같은 호스트의 여러 uvicorn 워커)
+# ==============================
+# 쓰기는 모아서 이 주기(초)마다 한 트랜잭션으로 (요청 스레드는 기다리지 않음)
+SESSION_FLUSH_INTERVAL = float(os.getenv("SESSION_FLUSH_INTERVAL", "0.02"))
+SESSION_FLUSH_BATCH = 256
+
+# 읽기 캐시 유지 시간 (초) — 이 워커가 그 사용자를 마지막으로 읽거나 기록한 뒤 이만큼 지나면 DB 에서 다시 읽음
+# → 다른 워커의 기록은 최대 이만큼 늦게 보임
+# (후속 발화는 사용자가 답변을 읽은 뒤라 보통 이보다 훨씬 늦게 옴)
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "5.0"))
+SESSION_CACHE_SIZE = 50000
+
+
+class _CachedSession:
+    __slots__ = ("ids", "last")
+
+    def __init__(self):
+        self.ids: set[int] = set()
+        self.last: tuple[float, int] | None = None   # (seen_at, recipe_id)
+
+    def add(self, recipe_id: int, seen_at: float):
+        self.ids.add(recipe_id)
+        if self.last is None or seen_at >= self.last[0]:
+            self.last = (seen_at, recipe_id)
+
+
+class SqliteSessionStore(SessionBackend):
+    """
+    seen 기록을 SQLite 파일(WAL)에 저장 → 워커 간 공유
+
+    - 쓰기: 요청 스레드는 버퍼에 넣고 바로 반환, 백그라운드 writer 가 모아서 executemany
+    - 읽기: 사용자별 로컬 캐시 (짧은 TTL, 이 워커의 기록이 들어오면 연장) → 없을 때만 DB 조회
+      아직 반영 전인 이 워커의 쓰기는 조회 결과에 합쳐서 돌려줌 (자기 기록은 항상 보임)
+      DB 조회는 스레드마다 자기 연결 (WAL 이라 읽기끼리 / 읽기-쓰기 사이에 서로 막지 않음)
+    - 만료: writer 가 주기적으로 TTL 지난 행 삭제 (전역)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = SESSION_FLUSH_INTERVAL,
+        cache_ttl: float = SESSION_CACHE_TTL,
+        max_items: int = SESSION_MAX_ITEMS,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_items = max_items
+
+        self._write_conn = self._connect()
+        self._write_conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen (
+                user_id   TEXT    NOT NULL,
+                recipe_id INTEGER NOT NULL,
+                seen_at   REAL    NOT NULL
+            )
+            """
+        )
+        self._write_conn.execute("CREATE INDEX IF NOT EXISTS seen_user ON seen (user_id, seen_at)")
+        self._write_conn.execute("CREATE INDEX IF NOT EXISTS seen_time ON seen (seen_at)")
+        self._write_conn.commit()
+        self._write_lock = threading.Lock()
+
+        self._local = threading.local()
+
+        # 버퍼 / 쓰는 중인 묶음 / 캐시는 하나의 락으로 (조회 결과와 합칠 때 빠짐없이)
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, int, float]] = []
+        self._inflight: list[tuple[str, int, float]] = []
+        self._flush_seq = 0
+        self._cache = TTLCache(SESSION_CACHE_SIZE, ttl=cache_ttl)
+
+        self.db_reads = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.expired_rows = 0
+
+        self._wake = threading.Event()
+        self._last_sweep = time.time()
+        threading.Thread(target=self._writer, name="session-writer", daemon=True).start()
+        # 워커 종료 시 버퍼에 남은 기록도 반영
+        atexit.register(self.flush)
+
+    def _connect(self, check_same_thread: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=check_same_thread, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _read_conn(self) -> sqlite3.Connection:
+        # 요청 스레드(스레드풀)마다 하나씩 만들어 재사용
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(check_same_thread=True)
+        return conn
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+    def _load(self, user_id: str) -> _CachedSession:
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        while True:
+            seq = self._flush_seq
+            cutoff = time.time() - TTL
+            rows = self._read_conn().execute(
+                "SELECT recipe_id, seen_at FROM seen WHERE user_id = ? AND seen_at >= ? "
+                "ORDER BY seen_at DESC LIMIT ?",
+                (user_id, cutoff, self.max_items),
+            ).fetchall()
+            self.db_reads += 1
+
+            with self._lock:
+                # 조회하는 사이에 writer 가 묶음을 반영했으면 그 묶음이 빠졌을 수 있음 → 다시
+                if seq != self._flush_seq:
+                    continue
+
+                session = _CachedSession()
+                for recipe_id, seen_at in rows:
+                    session.add(recipe_id, seen_at)
+                for uid, recipe_id, seen_at in self._inflight + self._pending:
+                    if uid == user_id:
+                        session.add(recipe_id, seen_at)
+                self._cache.set(user_id, session)
+                return session
+
+    def get_seen(self, user_id: str) -> frozenset:
+        session = self._load(user_id)
+        with self._lock:
+            return frozenset(session.ids)
+
+    def get_last_seen(self, user_id: str) -> dict | None:
+        session = self._load(user_id)
+        with self._lock:
+            last = session.last
+        if last is None or last[0] < time.time() - TTL:
+            return None
+        return {"recipe_id": last[1], "seen_at": last[0]}
+
+    # --------------------------------------------------------
+    # 기록 (버퍼 → writer)
+    # --------------------------------------------------------
+    def add_seen(self, user_id: str, recipe_id: int):
+        row = (user_id, int(recipe_id), time.time())
+        with self._lock:
+            self._pending.append(row)
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                # 자기 기록이 들어온 항목은 그대로 유효 → TTL 연장 (DB 다시 읽지 않음)
+                cached.add(row[1], row[2])
+                self._cache.set(user_id, cached)
+            full = len(self._pending) >= SESSION_FLUSH_BATCH
+
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._inflight, self._pending = self._pending, []
+                batch = self._inflight
+
+            try:
+                self._write_conn.executemany(
+                    "INSERT INTO seen (user_id, recipe_id, seen_at) VALUES (?, ?, ?)", batch
+                )
+                self._write_conn.commit()
+            except Exception:
+                # 다음 주기에 다시 시도
+                with self._lock:
+                    self._pending = batch + self._pending
+                    self._inflight = []
+                raise
+
+            with self._lock:
+                self._inflight = []
+                self._flush_seq += 1
+            self.flushes += 1
+            self.rows_written += len(batch)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._write_lock:
+            cur = self._write_conn.execute("DELETE FROM seen WHERE seen_at < ?", (now - TTL,))
+            self._write_conn.commit()
+        self.expired_rows += cur.rowcount
+        return cur.rowcount
+
+    def _writer(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if SESSION_SWEEP_INTERVAL > 0 and time.time() - self._last_sweep >= SESSION_SWEEP_INTERVAL:
+                    self._last_sweep = time.time()
+                    removed = self.sweep()
+                    if removed:
+                        print(f"🧹 SESSION sweep: {removed} expired rows")
+            except Exception as e:
+                print(f"[ERROR] Session writer: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "path": self.path,
+            "pending": pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "db_reads": self.db_reads,
+            "expired_rows": self.expired_rows,
+            "cache": self._cache.stats(),
+        }
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.embed_service import get_embedding
+from app.services.llm_client import PROMPT_VERSION, analyze_text, analyze_text_async, normalize_tags
+from app.services.recipe_snapshot import snapshot_holder
+from app.services.rule_tagger import RULE_TAGGER
+from app.utils.counters import Counters
+from app.utils.normalize import normalize_query
+from app.utils.sqlite_cache import SqliteCache
+from app.utils.ttl_cache import TTLCache
+
+# ==============================
+# LLM 태그 추출 캐시
+# ==============================
+TAG_CACHE_SIZE = 8192
+TAG_CACHE_TTL = 60 * 60 * 24 * 7   # 7일 (초) — 프롬프트가 바뀌면 키가 바뀜
+
+# 디스크 캐시 경로 (비어 있으면 메모리 캐시만 사용)
+TAG_CACHE_DB = os.getenv("TAG_CACHE_DB", "")
+
+# 의미 유사 질의 재사용: 코사인 유사도 기준 (0 이면 사용 안 함)
+TAG_SEMANTIC_THRESHOLD = float(os.getenv("TAG_SEMANTIC_THRESHOLD", "0.95"))
+TAG_SEMANTIC_SIZE = 2048
+
+# 임베딩은 비슷해도 뜻이 뒤집히는 표현 → 양쪽에 같이 있을 때만 재사용
+NEGATION_WORDS = ["말고", "빼고", "없이", "싫어", "제외"]
+
+tag_cache = TTLCache(TAG_CACHE_SIZE, ttl=TAG_CACHE_TTL)
+disk_cache = (
+    SqliteCache(TAG_CACHE_DB, namespace=f"tags:{PROMPT_VERSION}", ttl=TAG_CACHE_TTL)
+    if TAG_CACHE_DB else None
+)
+
+
+def tag_cache_key(user_query: str) -> str:
+    # LLM 에 실제로 들어가는 문장 기준 (동의어 치환 + 공백 정리)
+    return " ".join(normalize_query(user_query).split())
+
+
+def _copy_tags(tags: dict) -> dict:
+    # rule_adjust 등이 리스트를 직접 수정하므로 캐시 원본은 건드리지 않게
+    return {k: list(v) if isinstance(v, list) else v for k, v in tags.items()}
+
+
+def _compatible(query: str, cached_query: str, tags: dict, rule_tagger) -> bool:
+    """
+    의미 유사 질의의 태그를 그대로 써도 되는지
+    - 캐시된 재료가 새 질의에 전부 등장
+    - 부정 표현 유무가 같음
+    - 사전으로 잡히는 카테고리 힌트 / 재료가 같음 ("김치찌개" ↔ "김치볶음밥" 은 임베딩이 가까워도 다름)
+    """
+    if any(ing not in query for ing in tags.get("ingredients", [])):
+        return False
+    if not all((w in query) == (w in cached_query) for w in NEGATION_WORDS):
+        return False
+
+    hint = rule_tagger.extract(query, strict=False) or {}
+    cached_hint = rule_tagger.extract(cached_query, strict=False) or {}
+    return (
+        hint.get("category") == cached_hint.get("category")
+        and set(hint.get("ingredients", [])) == set(cached_hint.get("ingredients", []))
+    )
+
+
+class SemanticTagIndex:
+    """
+    최근 질의 임베딩(정규화) 행렬 → 가장 가까운 질의의 캐시 키
+    - 고정 크기 링 버퍼 (가장 오래된 것부터 덮어씀)
+    - 조회는 행렬-벡터 곱 한 번
+    """
+
+    def __init__(self, size: int = TAG_SEMANTIC_SIZE, dim: int = 768):
+        self.size = size
+        self.vectors = np.zeros((size, dim), dtype=np.float32)
+        self.keys: list[str | None] = [None] * size
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: str, vector: np.ndarray):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        with self._lock:
+            self.vectors[self._next] = vector / norm
+            self.keys[self._next] = key
+            self._next = (self._next + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+    def nearest(self, vector: np.ndarray) -> tuple[str | None, float]:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        with self._lock:
+            if self._count == 0 or norm == 0:
+                return None, 0.0
+            scores = self.vectors[:self._count] @ (vector / norm)
+            row = int(np.argmax(scores))
+            return self.keys[row], float(scores[row])
+
+
+semantic_index = SemanticTagIndex()
+
+stats = Counters("rule_hits", "exact_hits", "disk_hits", "semantic_hits", "llm_calls")
+
+
+def _rule_lookup(user_query: str) -> dict | None:
+    # 사전으로 완전히 설명되는 질의는 LLM / 캐시 없이 바로 (스냅샷 교체 시 사전도 같이 바뀜)
+    if not RULE_TAGGER:
+        return None
+    tags = snapshot_holder.current().rule_tagger.extract(user_query)
+    if tags is not None:
+        stats.incr("rule_hits")
+    return tags
+
+
+def _lookup(key: str) -> dict | None:
+    tags = tag_cache.get(key)
+    if tags is not None:
+        stats.incr("exact_hits")
+        return tags
+
+    if disk_cache is not None:
+        raw = disk_cache.get(key)
+        if raw is not None:
+            tags = json.loads(raw)
+            tag_cache.set(key, tags)
+            stats.incr("disk_hits")
+            return tags
+
+    return None
+
+
+def _semantic_lookup(key: str) -> dict | None:
+    if TAG_SEMANTIC_THRESHOLD <= 0:
+        return None
+
+    # 추천 단계에서도 같은 문장을 임베딩하므로 여기서 계산해 두면 임베딩 캐시에서 재사용됨
+    near_key, score = semantic_index.nearest(get_embedding(key))
+    if near_key is None or score < TAG_SEMANTIC_THRESHOLD:
+        return None
+
+    tags = tag_cache.get(near_key)
+    if tags is None or not _compatible(key, near_key, tags, snapshot_holder.current().rule_tagger):
+        return None
+
+    # 다음부터는 정확 일치로 바로 찾도록
+    tag_cache.set(key, tags)
+    stats.incr("semantic_hits")
+    print(f"🏷 TAG CACHE semantic hit ({score:.3f}): {key!r} ← {near_key!r}")
+    return tags
+
+
+def _store(key: str, raw: dict) -> dict:
+    tags = normalize_tags(raw)
+
+    # 파싱 실패는 캐시하지 않음 (다음 요청에서 다시 시도)
+    if isinstance(raw, dict) and "error" not in raw:
+        tag_cache.set(key, tags)
+        if disk_cache is not None:
+            disk_cache.set(key, json.dumps(tags, ensure_ascii=False).encode("utf-8"))
+        if TAG_SEMANTIC_THRESHOLD > 0:
+            semantic_index.add(key, get_embedding(key))
+
+    return tags
+
+
+def extract_tags(user_query: str) -> dict:
+    """
+    analyze_text + normalize_tags (규칙 사전 → 캐시: 메모리 → 디스크 → 의미 유사 → LLM)
+    """
+    tags = _rule_lookup(user_query)
+    if tags is not None:
+        return tags
+
+    key = tag_cache_key(user_query)
+
+    tags = _lookup(key) or _semantic_lookup(key)
+    if tags is None:
+        stats.incr("llm_calls")
+        tags = _store(key, analyze_text(user_query))
+
+    return _copy_tags(tags)
+
+
+async def extract_tags_async(user_query: str) -> dict:
+    tags = _rule_lookup(user_query)
+    if tags is not None:
+        return tags
+
+    key = tag_cache_key(user_query)
+
+    tags = _lookup(key)
+    if tags is None:
+        # 임베딩은 CPU 작업이라 스레드풀에서
+        tags = await run_in_threadpool(_semantic_lookup, key)
+    if tags is None:
+        stats.incr("llm_calls")
+        raw = await analyze_text_async(user_query)
+        tags = await run_in_threadpool(_store, key, raw)
+
+    return _copy_tags(tags)
+
+
+def get_tag_cache_stats() -> dict:
+    return {**tag_cache.stats(), **stats.snapshot(), "prompt_version": PROMPT_VERSION}
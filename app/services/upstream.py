@@ -0,0 +1,361 @@
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.counters import Counters
+
+# ==============================
+# Upstream 설정 (Ollama / Spring)
+# ==============================
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+SPRING_BASE_URL = os.getenv("SPRING_BASE_URL", "http://localhost:8080")
+
+# 재시도할 응답 코드 (일시적인 과부하 / 게이트웨이 오류)
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class UpstreamUnavailable(requests.exceptions.ConnectionError):
+    """
+    서킷이 열려 있어 호출하지 않고 바로 실패
+    (기존 requests 예외 처리에 그대로 걸리도록 ConnectionError 상속)
+    """
+
+
+class UpstreamConfig:
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float,
+        connect_timeout: float = 3.0,
+        max_connections: int = 20,
+        max_concurrency: int = 8,
+        retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout                    # 읽기 타임아웃 (초)
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections    # keep-alive 커넥션 풀 크기
+        # 동시에 보낼 수 있는 요청 수 (풀보다 크면 httpx 풀 내부 대기열에서 CPU 를 많이 씀)
+        self.max_concurrency = min(max_concurrency, max_connections)
+        self.retries = retries                    # 첫 시도 외 추가 시도 횟수
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+
+def _config_from_env(name: str, base_url: str, **defaults) -> UpstreamConfig:
+    """
+    기본값 + 환경 변수 ({NAME}_TIMEOUT, {NAME}_POOL_SIZE, {NAME}_RETRIES ...)
+    """
+    prefix = name.upper()
+
+    def env(key, cast, default):
+        return cast(os.getenv(f"{prefix}_{key}", default))
+
+    return UpstreamConfig(
+        name,
+        base_url,
+        timeout=env("TIMEOUT", float, defaults["timeout"]),
+        connect_timeout=env("CONNECT_TIMEOUT", float, defaults.get("connect_timeout", 3.0)),
+        max_connections=env("POOL_SIZE", int, defaults["max_connections"]),
+        max_concurrency=env("MAX_CONCURRENCY", int, defaults["max_concurrency"]),
+        retries=env("RETRIES", int, defaults["retries"]),
+        backoff_base=env("BACKOFF_BASE", float, defaults.get("backoff_base", 0.2)),
+        backoff_max=env("BACKOFF_MAX", float, defaults.get("backoff_max", 2.0)),
+        failure_threshold=env("BREAKER_FAILURES", int, defaults.get("failure_threshold", 5)),
+        reset_timeout=env("BREAKER_RESET", float, defaults.get("reset_timeout", 10.0)),
+    )
+
+
+UPSTREAMS = {
+    # LLM 은 GPU 하나가 처리하므로 동시 요청을 많이 보내봐야 줄만 길어짐
+    # 생성 요청은 오래 걸리므로 재시도는 1번만 (연결 실패 / 게이트웨이 오류일 때)
+    "ollama": _config_from_env(
+        "ollama", OLLAMA_BASE_URL,
+        timeout=30, max_connections=8, max_concurrency=4, retries=1,
+    ),
+    "spring": _config_from_env(
+        "spring", SPRING_BASE_URL,
+        timeout=5, max_connections=20, max_concurrency=16, retries=2,
+    ),
+}
+
+
+# ==============================
+# 재시도 / 서킷 공통
+# ==============================
+def backoff_delay(config: UpstreamConfig, attempt: int) -> float:
+    # exponential backoff + full jitter (동시에 실패한 요청들이 한꺼번에 재시도하지 않도록)
+    return random.uniform(0, min(config.backoff_max, config.backoff_base * (2 ** attempt)))
+
+
+def _retryable_error(method: str, read_timeout: bool) -> bool:
+    # 연결 실패는 항상 재시도, 읽기 타임아웃은 GET 만 (LLM 생성은 다시 보내면 시간만 두 배)
+    return method == "GET" or not read_timeout
+
+
+class _UpstreamBase:
+    def __init__(self, config: UpstreamConfig, breaker: CircuitBreaker):
+        self.config = config
+        self.breaker = breaker
+
+        # 요청 스레드 여러 개(동기) / 이벤트 루프(비동기)가 동시에 올림
+        self.counters = Counters("requests", "retries", "failures")
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            raise UpstreamUnavailable(f"{self.config.name} circuit open")
+
+    def _record_status(self, status: int):
+        if status >= 500 or status == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def stats(self) -> dict:
+        return self.counters.snapshot()
+
+
+# ==============================
+# 동기 클라이언트 (requests.Session, keep-alive 풀)
+# ==============================
+class Upstream(_UpstreamBase):
+    """
+    upstream 하나당 requests.Session 하나 (스레드 간 공유, 커넥션 재사용)
+    """
+
+    def __init__(self, config: UpstreamConfig, breaker: CircuitBreaker):
+        super().__init__(config, breaker)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.max_connections,
+            max_retries=0,      # 재시도는 아래에서 직접 (backoff + jitter + 서킷)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, timeout: float | None = None, **kwargs) -> requests.Response:
+        cfg = self.config
+        url = cfg.base_url + path
+        timeout = (cfg.connect_timeout, timeout if timeout is not None else cfg.timeout)
+        self.counters.incr("requests")
+
+        attempt = 0
+        while True:
+            self._check_breaker()
+            try:
+                res = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.RequestException as e:
+                self.breaker.record_failure()
+                read_timeout = isinstance(e, requests.ReadTimeout)
+                if attempt >= cfg.retries or not _retryable_error(method, read_timeout):
+                    self.counters.incr("failures")
+                    raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self._record_status(res.status_code)
+                if res.status_code not in RETRY_STATUSES or attempt >= cfg.retries:
+                    return res
+                res.close()
+
+            time.sleep(backoff_delay(cfg, attempt))
+            attempt += 1
+            self.counters.incr("retries")
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+
+# ==============================
+# 비동기 클라이언트 (httpx, keep-alive 풀)
+# ==============================
+# httpx(httpcore) 풀은 요청 배정 때마다 커넥션과 대기 요청을 전부 훑어서
+# 커넥션이 수십 개를 넘거나 풀 안에 대기열이 생기면 요청당 CPU 가 급격히 늘어남
+# (64개: 요청당 ~16ms) → 풀을 작게 쪼개고, 진행 중 요청이 가장 적은 쪽으로 보낸다
+POOL_SHARD_SIZE = 8
+
+
+class AsyncUpstream(_UpstreamBase):
+    """
+    upstream 하나당 AsyncClient 묶음 + 동시 요청 수 제한(Semaphore)
+    - Semaphore 가 전체 커넥션 수 이하로 막으므로 httpx 풀 내부에서는 대기하지 않음
+    - 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다
+    - 재시도 / 서킷 브레이커는 동기 클라이언트와 같은 규칙, 서킷 상태는 공유
+    """
+
+    def __init__(self, config: UpstreamConfig, breaker: CircuitBreaker):
+        super().__init__(config, breaker)
+        self._loop = None
+        self._clients: list[httpx.AsyncClient] = []
+        self._in_flight: list[int] = []
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _ensure(self):
+        loop = asyncio.get_running_loop()
+        if not self._clients or self._loop is not loop:
+            cfg = self.config
+            shards = max(1, -(-cfg.max_connections // POOL_SHARD_SIZE))
+            per_shard = -(-cfg.max_connections // shards)
+
+            self._loop = loop
+            self._clients = [
+                httpx.AsyncClient(
+                    base_url=cfg.base_url,
+                    timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+                    limits=httpx.Limits(
+                        max_connections=per_shard,
+                        max_keepalive_connections=per_shard,
+                    ),
+                )
+                for _ in range(shards)
+            ]
+            self._in_flight = [0] * shards
+            self._semaphore = asyncio.Semaphore(cfg.max_concurrency)
+        return self._semaphore
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        semaphore = self._ensure()
+        async with semaphore:
+            # 슬롯을 잡은 뒤에 서킷 확인 (stream 과 같은 순서, 대기 중에 half-open 시험 슬롯을 붙잡고 있지 않도록)
+            self._check_breaker()
+
+            # 단일 이벤트 루프 안이라 카운터에 락이 필요 없음
+            shard = min(range(len(self._clients)), key=self._in_flight.__getitem__)
+            self._in_flight[shard] += 1
+            try:
+                return await self._clients[shard].request(method, path, **kwargs)
+            except httpx.TransportError:
+                raise
+            except BaseException:
+                # 취소(CancelledError) 등 결과를 모르는 채 끝나면 half-open 시험 슬롯을 반납
+                # (안 그러면 동기 클라이언트와 공유하는 서킷이 계속 막힘)
+                self.breaker.release_probe()
+                raise
+            finally:
+                self._in_flight[shard] -= 1
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        cfg = self.config
+        self.counters.incr("requests")
+
+        attempt = 0
+        while True:
+            try:
+                res = await self._send(method, path, **kwargs)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                read_timeout = isinstance(e, httpx.ReadTimeout)
+                if attempt >= cfg.retries or not _retryable_error(method, read_timeout):
+                    self.counters.incr("failures")
+                    raise
+            else:
+                self._record_status(res.status_code)
+                if res.status_code not in RETRY_STATUSES or attempt >= cfg.retries:
+                    return res
+
+            await asyncio.sleep(backoff_delay(cfg, attempt))
+            attempt += 1
+            self.counters.incr("retries")
+
+    @asynccontextmanager
+    async def stream(self, method: str, path: str, **kwargs):
+        """
+        응답 본문을 조각으로 읽는 요청 (LLM 토큰 스트리밍)
+        - 이미 토큰을 내보낸 뒤에는 다시 보낼 수 없으므로 재시도 없음
+        - 스트림이 끝날 때까지 동시 요청 슬롯을 잡고 있음
+        """
+        semaphore = self._ensure()
+        self.counters.incr("requests")
+
+        async with semaphore:
+            # 슬롯을 잡은 뒤에 서킷 확인 (대기 중에 half-open 시험 슬롯을 붙잡고 있지 않도록)
+            self._check_breaker()
+            shard = min(range(len(self._clients)), key=self._in_flight.__getitem__)
+            self._in_flight[shard] += 1
+            try:
+                client = self._clients[shard]
+                try:
+                    res = await client.send(client.build_request(method, path, **kwargs), stream=True)
+                except httpx.TransportError:
+                    self.breaker.record_failure()
+                    self.counters.incr("failures")
+                    raise
+                except BaseException:
+                    self.breaker.release_probe()
+                    raise
+
+                self._record_status(res.status_code)
+                try:
+                    yield res
+                finally:
+                    await res.aclose()
+            finally:
+                self._in_flight[shard] -= 1
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def aclose(self):
+        clients, self._clients = self._clients, []
+        for client in clients:
+            await client.aclose()
+
+
+# ==============================
+# 프로세스 당 하나씩 (서킷 상태는 동기 / 비동기 공유)
+# ==============================
+_breakers = {
+    name: CircuitBreaker(cfg.failure_threshold, cfg.reset_timeout)
+    for name, cfg in UPSTREAMS.items()
+}
+_upstreams = {name: Upstream(cfg, _breakers[name]) for name, cfg in UPSTREAMS.items()}
+_async_upstreams = {name: AsyncUpstream(cfg, _breakers[name]) for name, cfg in UPSTREAMS.items()}
+
+
+def upstream(name: str) -> Upstream:
+    return _upstreams[name]
+
+
+def async_upstream(name: str) -> AsyncUpstream:
+    return _async_upstreams[name]
+
+
+async def close_async_upstreams():
+    for client in _async_upstreams.values():
+        await client.aclose()
+
+
+def upstream_stats() -> dict:
+    return {
+        name: {
+            "base_url": cfg.base_url,
+            "breaker": _breakers[name].stats(),
+            "sync": _upstreams[name].stats(),
+            "async": _async_upstreams[name].stats(),
+        }
+        for name, cfg in UPSTREAMS.items()
+    }
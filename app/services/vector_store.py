@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+VECTORS_PATH = "models/recipe_vectors.npy"
+IDS_PATH = "models/recipe_ids.npy"
+HASHES_PATH = "models/recipe_text_hashes.npy"   # 증분 빌드용 (레시피 텍스트 해시)
+
+# 유사도 계산 시 한 번에 float32로 올릴 행 수 (float16 행렬용)
+SCORE_CHUNK_ROWS = 16384
+
+# 벡터 파일 검증용 해시에 넣을 행 수 (전체를 읽지 않도록 고르게 뽑음)
+DIGEST_SAMPLE_ROWS = 4096
+
+
+def meta_path(vectors_path: str = VECTORS_PATH) -> str:
+    """
+    models/recipe_vectors.npy → models/recipe_vectors.meta.json
+    """
+    return os.path.splitext(vectors_path)[0] + ".meta.json"
+
+
+def load_vector_meta(vectors_path: str = VECTORS_PATH) -> dict:
+    path = meta_path(vectors_path)
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ids_digest(recipe_ids: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(recipe_ids, dtype=np.int32).tobytes()).hexdigest()
+
+
+def vectors_digest(vectors: np.ndarray) -> str:
+    """
+    shape / dtype + 고르게 뽑은 행(처음·마지막 포함)의 해시
+    mmap 그대로 계산 (샘플 행의 페이지만 읽음)
+    """
+    h = hashlib.sha1(f"{vectors.shape}|{vectors.dtype}".encode())
+    if len(vectors):
+        rows = np.unique(np.linspace(0, len(vectors) - 1, min(len(vectors), DIGEST_SAMPLE_ROWS)).astype(np.int64))
+        h.update(np.ascontiguousarray(vectors[rows]).tobytes())
+    return h.hexdigest()
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def load_recipe_vectors(vectors_path: str = VECTORS_PATH, ids_path: str = IDS_PATH):
+    """
+    레시피 임베딩 로드
+    - 정규화된 파일(meta.normalized) → mmap 으로 열기 (워커 간 페이지 공유)
+    - 예전 형식(정규화 안 됨) → 메모리에 올려서 정규화
+    - 파일은 하나씩 교체되므로 meta 의 ids / vectors 해시와 맞을 때만 한 세트로 인정
+    """
+    meta = load_vector_meta(vectors_path)
+    recipe_ids = np.load(ids_path)
+
+    if meta.get("normalized"):
+        recipe_vectors = np.load(vectors_path, mmap_mode="r")
+    else:
+        print("⚠ 정규화되지 않은 벡터 파일 → 메모리에서 정규화 (build_recipe_vectors --convert 권장)")
+        recipe_vectors = l2_normalize(np.load(vectors_path).astype(np.float32))
+
+    # 빌드가 파일을 교체하는 도중에 읽었으면 행 수가 어긋남
+    if len(recipe_ids) != len(recipe_vectors) or meta.get("count", len(recipe_ids)) != len(recipe_ids):
+        raise RuntimeError(
+            f"❌ 벡터 파일 불일치: ids={len(recipe_ids)}, vectors={len(recipe_vectors)}, meta={meta.get('count')}"
+        )
+    if meta.get("ids_sha1") and meta["ids_sha1"] != ids_digest(recipe_ids):
+        raise RuntimeError("❌ 벡터 파일 불일치: recipe_ids 가 meta 와 다름 (빌드 중?)")
+    if meta.get("vectors_sha1") and meta["vectors_sha1"] != vectors_digest(recipe_vectors):
+        raise RuntimeError("❌ 벡터 파일 불일치: recipe_vectors 가 meta 와 다름 (빌드 중?)")
+
+    return recipe_vectors, recipe_ids, meta
+
+
+def cosine_scores(recipe_vectors: np.ndarray, query_vec: np.ndarray) -> np.ndarray:
+    """
+    정규화된 행렬 · 정규화된 질의 = 코사인 유사도 (float32)
+    """
+    q = l2_normalize(np.asarray(query_vec, dtype=np.float32))
+
+    if recipe_vectors.dtype == np.float32:
+        return recipe_vectors @ q
+
+    # float16 은 BLAS 를 못 타므로 블록 단위로 float32 변환 후 계산
+    scores = np.empty(len(recipe_vectors), dtype=np.float32)
+    for start in range(0, len(recipe_vectors), SCORE_CHUNK_ROWS):
+        block = recipe_vectors[start:start + SCORE_CHUNK_ROWS].astype(np.float32)
+        scores[start:start + len(block)] = block @ q
+    return scores
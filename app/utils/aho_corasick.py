@@ -0,0 +1,91 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    여러 단어를 문장에서 한 번의 스캔으로 찾는 매처
+    - add(word, payload) 로 단어 등록 후 build() 한 번
+    - find(text): 겹치지 않는 가장 왼쪽-가장 긴 매치 목록
+      (예: "볶음밥" 이 등록돼 있으면 "밥" 보다 우선)
+    """
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._words: list[list[tuple[str, object]]] = [[]]   # 노드에서 끝나는 등록 단어 (add 로 넣은 것만)
+        self._out: list[list[tuple[str, object]]] = [[]]     # + 실패 링크로 이어받은 단어 (build 에서 계산)
+        self._built = False
+
+    def add(self, word: str, payload=None):
+        if not word:
+            return
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._words.append([])
+                self._out.append([])
+            node = nxt
+        # 노드 하나 = 단어 하나 → 같은 단어를 다시 넣으면 payload 만 교체
+        self._words[node] = [(word, payload)]
+        self._built = False
+
+    def build(self):
+        # 출력은 등록 단어에서 매번 새로 계산 → 여러 번 호출해도 같은 결과
+        self._out = [list(words) for words in self._words]
+
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+
+                # 접미사로 끝나는 단어들도 이 노드에서 출력
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._built = True
+
+    def iter_all(self, text: str):
+        """
+        (start, end, word, payload) — 겹치는 매치 포함 전부
+        """
+        if not self._built:
+            self.build()
+
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for word, payload in self._out[node]:
+                yield i + 1 - len(word), i + 1, word, payload
+
+    def find(self, text: str) -> list[tuple[int, int, str, object]]:
+        matches = sorted(self.iter_all(text), key=lambda m: (m[0], m[0] - m[1]))
+
+        picked = []
+        end = 0
+        for m in matches:
+            if m[0] >= end:
+                picked.append(m)
+                end = m[1]
+        return picked
+
+    def __len__(self) -> int:
+        # 등록된 단어 수 (실패 링크로 이어받은 출력은 세지 않음)
+        return sum(len(words) for words in self._words)
@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커 (스레드 안전)
+    - closed: 정상 호출, 연속 실패가 failure_threshold 에 도달하면 open
+    - open: reset_timeout(초) 동안 호출 없이 바로 실패
+    - half-open: reset_timeout 이 지나면 시험 호출 1개만 통과
+      → 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = time.time()
+                self._probing = False
+
+    def release_probe(self):
+        # 시험 호출이 결과 없이 끝난 경우 (취소 / 예상 밖 예외) → 다음 호출이 다시 시험하도록 슬롯만 반납
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
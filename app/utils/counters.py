@@ -0,0 +1,23 @@
+import threading
+
+
+class Counters:
+    """
+    이름별 누적 카운터 (스레드 안전)
+    - 스레드풀 / 이벤트 루프 / 백그라운드 스레드가 같은 모듈 카운터를 동시에 올려도 빠지지 않음
+    """
+
+    def __init__(self, *names: str):
+        self._counts = {name: 0 for name in names}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + n
+
+    def __getitem__(self, name: str) -> int:
+        return self._counts[name]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
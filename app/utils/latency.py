@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+
+
+class LatencyStats:
+    """
+    최근 N개 지연 시간(초) 링 버퍼 → p50 / p90 / p99 (스레드 안전)
+    """
+
+    def __init__(self, size: int = 2048):
+        self.size = size
+        self._samples = np.zeros(size, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples[self._next] = seconds
+            self._next = (self._next + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+            self.total += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = self._samples[:self._count].copy()
+            total = self.total
+
+        if not len(samples):
+            return {"count": total}
+
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99]) * 1000
+        return {
+            "count": total,
+            "p50_ms": round(float(p50), 2),
+            "p90_ms": round(float(p90), 2),
+            "p99_ms": round(float(p99), 2),
+        }
+
+
+class LatencyRegistry:
+    """
+    이름별 LatencyStats 묶음 (없으면 처음 기록할 때 생성)
+    """
+
+    def __init__(self, size: int = 2048):
+        self.size = size
+        self._metrics: dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> LatencyStats:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, LatencyStats(self.size))
+        return metric
+
+    def record(self, name: str, seconds: float):
+        self.get(name).record(seconds)
+
+    def stats(self) -> dict:
+        return {name: metric.stats() for name, metric in sorted(self._metrics.items())}
+
+
+# 서버 프로세스 당 하나 (/admin/latency)
+latency_metrics = LatencyRegistry()
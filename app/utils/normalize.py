@@ -1,3 +1,5 @@
+import re
+
 SYNONYM_MAP = {
     # 계란 계열
     "계란": "달걀",
@@ -13,4 +15,106 @@ SYNONYM_MAP = {
 def normalize_query(q: str) -> str:
     for src, dst in SYNONYM_MAP.items():
         q = q.replace(src, dst)
-    return q
\ No newline at end of file
+    return q
+
+# 냉장고 모드 재료 매칭용 (대표 재료 → 레시피 텍스트에서 찾을 동의어)
+INGREDIENT_MAP = {
+    "고기": ["고기", "돼지고기", "소고기", "쇠고기", "닭", "닭고기"],
+    "달걀": ["달걀", "계란"],
+    "계란": ["달걀", "계란"],
+    "파": ["파", "대파", "쪽파"],
+    "고추": ["고추", "청양고추", "홍고추"],
+    "면": ["면", "국수", "라면", "파스타", "짜파게티"],
+    "밥": ["밥", "쌀"],
+    "해산물": ["새우", "오징어", "조개", "게"],
+}
+
+
+# ==============================
+# 냉장고 재료 한 항목 정규화 (사전 우선, LLM 은 모르는 항목만)
+# ==============================
+
+# 항목 단위 동의어 → 대표 재료명 (SYNONYM_MAP 확장)
+# "고추" 는 INGREDIENT_MAP 이 청양/홍고추까지 매칭하므로 그대로 둠
+ITEM_SYNONYMS = {
+    **SYNONYM_MAP,
+    "고추": "고추",
+    "달걀": "달걀",
+    "계란후라이": "달걀",
+    "쇠고기": "소고기",
+    "한우": "소고기",
+    "돼지": "돼지고기",
+    "돈육": "돼지고기",
+    "닭": "닭고기",
+    "생닭": "닭고기",
+    "닭가슴살": "닭가슴살",
+    "다진마늘": "마늘",
+    "간마늘": "마늘",
+    "깐마늘": "마늘",
+    "통마늘": "마늘",
+    "실파": "쪽파",
+    "양송이": "양송이버섯",
+    "팽이": "팽이버섯",
+    "표고": "표고버섯",
+    "새송이": "새송이버섯",
+    "케찹": "케첩",
+    "토마토케찹": "케첩",
+    "밥": "밥",
+    "햇반": "밥",
+    "공기밥": "밥",
+    "쌀밥": "밥",
+}
+
+# 수량 / 단위 / 상태 표현 (재료명이 아님)
+ITEM_UNITS = [
+    "kg", "g", "ml", "l", "그램", "킬로", "개", "단", "모", "알", "봉지", "봉", "팩", "캔",
+    "병", "쪽", "톨", "줌", "컵", "큰술", "작은술", "스푼", "마리", "포기", "통", "장",
+    "조각", "근", "덩이", "대",
+]
+ITEM_COUNTS = ["한", "두", "세", "네", "다섯", "여섯", "반", "몇"]
+ITEM_STOPWORDS = {
+    "약간", "조금", "적당량", "정도", "쯤", "약", "남은", "신선한", "냉동", "냉장",
+    "다진", "썬", "손질된", "손질한", "있음", "있어요", "있어", "및",
+}
+
+_PAREN_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_UNIT_ALT = "|".join(sorted(ITEM_UNITS, key=len, reverse=True))
+# 단위 뒤에 글자가 바로 이어지면 단위가 아니라 재료명의 첫 글자 ("1 대파", "2 장어", "1 모짜렐라")
+# (한글 단위는 한글이, 영문 단위는 영문이 이어질 때만 → "200g돼지고기" 는 그대로 단위)
+_NUMBER_UNIT_RE = re.compile(
+    r"\d+(?:[./]\d+)?\s*(?:(?:" + _UNIT_ALT + r")(?<=[가-힣])(?![가-힣])|(?:" + _UNIT_ALT + r")(?<=[a-z])(?![a-z]))?",
+    re.IGNORECASE,
+)
+_COUNT_UNIT_RE = re.compile(
+    "^(?:" + "|".join(ITEM_COUNTS) + ")?(?:" + _UNIT_ALT + ")?$"
+)
+
+
+def clean_ingredient_item(item: str) -> str:
+    """
+    "대파 한 단" → "대파", "돼지고기 200g" → "돼지고기", "계란(2개)" → "계란"
+    수량 / 단위 / 상태 표현을 지우고 공백 없이 붙인 형태 (캐시 키 겸용)
+    """
+    s = _PAREN_RE.sub(" ", item.lower())
+    s = _NUMBER_UNIT_RE.sub(" ", s)
+    s = re.sub(r"[^가-힣a-z\s]", " ", s)
+
+    tokens = [
+        tok for tok in s.split()
+        if tok not in ITEM_STOPWORDS and not _COUNT_UNIT_RE.fullmatch(tok)
+    ]
+    return "".join(tokens)
+
+
+def dictionary_ingredient(core: str, known: set[str] | frozenset = frozenset()) -> str | None:
+    """
+    사전으로 해결되는 항목이면 대표 재료명, 아니면 None
+    known: 레시피 카탈로그에 실제로 등장하는 재료명 (있으면 그대로 사용)
+    """
+    if core in ITEM_SYNONYMS:
+        return ITEM_SYNONYMS[core]
+    if core in INGREDIENT_MAP or core in known:
+        return core
+    if any(core in synonyms for synonyms in INGREDIENT_MAP.values()):
+        return core
+    return None
@@ -0,0 +1,113 @@
+import atexit
+import sqlite3
+import threading
+import time
+
+# 쓰기 묶음: 이 개수가 모이거나 이 시간(초)이 지나면 한 트랜잭션으로 반영
+COMMIT_BATCH = 64
+COMMIT_INTERVAL = 1.0
+
+# 만료 행 정리 주기 (초)
+PURGE_INTERVAL = 60 * 10
+
+
+class SqliteCache:
+    """
+    재시작 후에도 남는 디스크 캐시 (key → bytes)
+    - 여러 용도가 한 파일을 같이 쓸 수 있도록 namespace 로 구분
+    - ttl(초)이 지난 항목은 조회 시 무시하고 삭제, 주기적으로 만료 행 일괄 삭제
+    - 쓰기는 메모리에 모았다가 묶어서 commit (행마다 fsync 하지 않음)
+      반영 전 항목도 조회에는 보임, 프로세스 종료 시 남은 것 반영
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: float | None = None):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key       TEXT NOT NULL,
+                value     BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._pending: dict[str, tuple[bytes, float]] = {}
+        self._flushed_at = time.time()
+        self._purged_at = 0.0
+
+        self.commits = 0
+        self.purged = 0
+
+        atexit.register(self.flush)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at >= self.ttl
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending[0]
+
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, stored_at = row
+            if self._expired(stored_at, now):
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+                )
+                self._conn.commit()
+                return None
+            return value
+
+    def set(self, key: str, value: bytes):
+        now = time.time()
+        with self._lock:
+            self._pending[key] = (value, now)
+            if len(self._pending) >= COMMIT_BATCH or now - self._flushed_at >= COMMIT_INTERVAL:
+                self._flush_locked(now)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked(time.time())
+
+    def _flush_locked(self, now: float):
+        if self._pending:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                [(self.namespace, key, value, stored_at) for key, (value, stored_at) in self._pending.items()],
+            )
+            self._pending.clear()
+            self.commits += 1
+
+        if self.ttl is not None and now - self._purged_at >= PURGE_INTERVAL:
+            cur = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND stored_at < ?", (self.namespace, now - self.ttl)
+            )
+            self.purged += cur.rowcount
+            self._purged_at = now
+
+        self._conn.commit()
+        self._flushed_at = now
+
+    def close(self):
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._flush_locked(time.time())
+            self._conn.close()
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from app.utils.latency import latency_metrics
+
+# 단계 실행용 스레드 수 (요청 스레드와 별개, 프로세스 전체 공유)
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(PIPELINE_WORKERS, thread_name_prefix="stage")
+
+
+class StagePipeline:
+    """
+    요청 하나의 단계(stage) DAG 실행기
+
+    - stage(name, fn, *deps): 의존 단계가 모두 끝나면 스레드풀에서 fn(*의존 단계 결과) 실행
+      → 서로 의존하지 않는 단계는 동시에 진행
+    - call(name, fn, *args): 현재 스레드에서 바로 실행 (LLM 처럼 오래 기다리는 단계 → 풀 스레드를 잡지 않음)
+    - cancel(name): 시작 전이면 실행 안 함 (의존 단계도 같이 취소), 실행 중이면 결과만 버림
+    - 단계별 시작 시점 / 소요 시간 기록 → finish() 때 latency_metrics "{prefix}.{stage}"
+    """
+
+    def __init__(self, prefix: str, executor: ThreadPoolExecutor = _executor):
+        self.prefix = prefix
+        self._executor = executor
+        self._started = time.perf_counter()
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.timings: dict[str, dict] = {}
+
+    # --------------------------------------------------------
+    # 실행
+    # --------------------------------------------------------
+    def stage(self, name: str, fn, *deps: str) -> Future:
+        future = Future()
+        self._futures[name] = future
+        dep_futures = [self._futures[d] for d in deps]
+
+        if not dep_futures:
+            self._launch(name, future, fn, dep_futures)
+            return future
+
+        remaining = [len(dep_futures)]
+
+        def on_dep_done(_):
+            with self._lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._launch(name, future, fn, dep_futures)
+
+        for dep in dep_futures:
+            dep.add_done_callback(on_dep_done)
+        return future
+
+    def _launch(self, name: str, future: Future, fn, dep_futures: list[Future]):
+        if any(d.cancelled() for d in dep_futures):
+            future.cancel()
+            self._record(name, None, None)
+            return
+
+        failed = next((d.exception() for d in dep_futures if d.exception() is not None), None)
+        if failed is not None:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(failed)
+            return
+
+        args = [d.result() for d in dep_futures]
+        self._executor.submit(self._run, name, future, fn, args)
+
+    def _run(self, name: str, future: Future, fn, args: list):
+        if not future.set_running_or_notify_cancel():
+            self._record(name, None, None)
+            return
+
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def call(self, name: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    # --------------------------------------------------------
+    # 결과 / 취소
+    # --------------------------------------------------------
+    def result(self, name: str, timeout: float | None = None):
+        return self._futures[name].result(timeout)
+
+    def optional_result(self, name: str, timeout: float | None = None):
+        """
+        투기적 단계용: 실패 / 취소면 None
+        """
+        try:
+            return self._futures[name].result(timeout)
+        except CancelledError:
+            return None
+        except Exception as e:
+            print(f"[WARN] stage {name} failed: {e}")
+            return None
+
+    def cancel(self, name: str):
+        future = self._futures[name]
+        if not future.cancel():
+            # 이미 실행 중 → 끝까지 돌지만 결과는 쓰지 않음
+            with self._lock:
+                timing = self.timings.setdefault(name, {})
+                timing["discarded"] = True
+
+    # --------------------------------------------------------
+    # 기록
+    # --------------------------------------------------------
+    def _record(self, name: str, start: float | None, end: float | None):
+        with self._lock:
+            timing = self.timings.setdefault(name, {})
+            if start is None:
+                timing["cancelled"] = True
+                return
+            timing["start_ms"] = round((start - self._started) * 1000, 2)
+            timing["ms"] = round((end - start) * 1000, 2)
+            duration = end - start
+        latency_metrics.record(f"{self.prefix}.{name}", duration)
+
+    def finish(self) -> dict:
+        total = time.perf_counter() - self._started
+        latency_metrics.record(f"{self.prefix}.total", total)
+        with self._lock:
+            timings = dict(self.timings)
+        timings["total_ms"] = round(total * 1000, 2)
+        return timings
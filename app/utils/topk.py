@@ -0,0 +1,28 @@
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    점수 상위 k개 인덱스 (내림차순)
+    - argpartition O(N) + 상위 k개만 정렬 O(k log k)
+    - 동점은 인덱스가 작은 쪽 우선 (항상 같은 결과)
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < n:
+        part = np.argpartition(-scores, k - 1)[:k]
+        kth = scores[part].min()
+
+        # 경계값(kth) 동점은 argpartition 이 임의로 고르므로 인덱스 순으로 다시 채움
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        idx = np.concatenate([above, ties])
+    else:
+        idx = np.arange(n)
+
+    order = np.lexsort((idx, -scores[idx]))
+    return idx[order]
@@ -0,0 +1,138 @@
+"""
+/recommend/chat · /recommend/fridge: 동기 엔드포인트 vs 비동기 엔드포인트 처리량
+
+가짜 Spring / Ollama(응답 지연 + 동시 처리 수 제한 흉내)와 uvicorn 앱을
+각각 별도 프로세스로 띄운 뒤 동시 클라이언트 수를 늘려가며 req/s, p50, p99 를 잰다.
+(같은 프로세스에서 돌리면 GIL 경쟁 때문에 측정값이 왜곡됨)
+
+    python -m benchmarks.bench_async_pipeline
+    python -m benchmarks.bench_async_pipeline --llm-latency-ms 500 --llm-parallel 8 --requests 200
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import requests
+
+SPRING_PORT = 18080
+OLLAMA_PORT = 21434
+APP_PORT = 18000
+
+CLIENTS = [1, 8, 32, 64]
+
+ROUTES = {
+    "chat": ("GET", "/api/recommend/chat", "/api/recommend/chat/async"),
+    "fridge": ("POST", "/api/recommend/fridge", "/api/recommend/fridge/async"),
+}
+
+
+def _wait_ready(url: str, timeout: float = 300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"not ready: {url}")
+
+
+def start_servers(llm_latency_ms: float, llm_parallel: int) -> list[subprocess.Popen]:
+    stub = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.stub_upstreams",
+        "--spring-port", str(SPRING_PORT),
+        "--ollama-port", str(OLLAMA_PORT),
+        "--llm-latency-ms", str(llm_latency_ms),
+        "--llm-parallel", str(llm_parallel),
+    ])
+    _wait_ready(f"http://127.0.0.1:{SPRING_PORT}/api/recipes/categories")
+
+    env = dict(
+        os.environ,
+        SPRING_BASE_URL=f"http://127.0.0.1:{SPRING_PORT}",
+        OLLAMA_BASE_URL=f"http://127.0.0.1:{OLLAMA_PORT}",
+        SNAPSHOT_WATCH_INTERVAL="0",
+    )
+    app = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(APP_PORT), "--log-level", "warning", "--timeout-keep-alive", "60",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    _wait_ready(f"http://127.0.0.1:{APP_PORT}/")
+    return [stub, app]
+
+
+def run(method: str, path: str, clients: int, total: int) -> tuple[float, list[float]]:
+    """
+    클라이언트마다 스레드 + 커넥션 1개 (부하 생성기가 병목이 되지 않도록)
+    """
+    latencies: list[float] = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+    url = f"http://127.0.0.1:{APP_PORT}{path}"
+
+    def client(cid: int):
+        session = requests.Session()
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            if method == "GET":
+                res = session.get(url, params={"query": "김치찌개 먹고싶어", "user_id": f"bench-{cid}-{i}"})
+            else:
+                res = session.post(url, json={"ingredients": ["계란 2개", "대파"], "user_id": f"bench-{cid}-{i}"})
+            res.raise_for_status()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return total / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-parallel", type=int, default=4, help="가짜 Ollama 동시 처리 수 (0 = 무제한)")
+    parser.add_argument("--requests", type=int, default=128, help="측정 구간당 요청 수")
+    parser.add_argument("--route", choices=list(ROUTES), default=None)
+    args = parser.parse_args()
+
+    procs = start_servers(args.llm_latency_ms, args.llm_parallel)
+    try:
+        routes = [args.route] if args.route else list(ROUTES)
+
+        print(f"LLM latency {args.llm_latency_ms:.0f}ms / request, parallel {args.llm_parallel or 'unlimited'} (stub)")
+        print(f"{'route':>6} | {'clients':>7} | {'mode':>5} | {'req/s':>7} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+        for route in routes:
+            method, sync_path, async_path = ROUTES[route]
+            run(method, async_path, 1, 2)   # 워밍업
+            for clients in CLIENTS:
+                for mode, path in [("sync", sync_path), ("async", async_path)]:
+                    rps, lat = run(method, path, clients, max(args.requests, clients))
+                    p50, p99 = np.percentile(lat, [50, 99]) * 1000
+                    print(f"{route:>6} | {clients:>7} | {mode:>5} | {rps:>7.1f} | {p50:>8.1f} | {p99:>8.1f}")
+    finally:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+get_candidates 필터 + 유사도: 기존 Python 루프 vs 사전 계산 마스크 비교
+
+    python -m benchmarks.bench_candidate_filter
+"""
+import time
+
+import numpy as np
+from numpy.linalg import norm
+
+from app.services.category_index import CategoryIndex
+from app.services.category_service import CategoryTable
+from app.services.ingredient_index import IngredientIndex
+from app.services.recipe_store import recipe_text
+from benchmarks.synthetic import make_catalog, make_vectors
+
+SIZES = [10_000, 50_000, 100_000]
+QUERIES = [
+    ("찌개", ["김치"]),
+    ("국-탕", []),
+    ("면", ["달걀", "대파"]),
+    ("밥", ["돼지고기"]),
+]
+REPEAT = 3
+
+
+def legacy_scores(recipe_ids, recipe_vectors, recipes, category_map, target_cat, ingredients, query_vec):
+    new_ids = []
+    new_vecs = []
+    for rid, vec in zip(recipe_ids, recipe_vectors):
+        cat_list = category_map.get(str(rid), [])
+        if not any(target_cat in c or c in target_cat for c in cat_list):
+            continue
+        if ingredients:
+            recipe = recipes.get(int(rid))
+            if not recipe or not all(ing in recipe_text(recipe) for ing in ingredients):
+                continue
+        new_ids.append(rid)
+        new_vecs.append(vec)
+
+    filtered_ids, filtered_vecs = recipe_ids, recipe_vectors
+    if new_ids:
+        filtered_ids = np.array(new_ids)
+        filtered_vecs = np.array(new_vecs)
+
+    scores = np.dot(filtered_vecs, query_vec) / (
+        norm(query_vec) * norm(filtered_vecs, axis=1)
+    )
+    return filtered_ids, scores
+
+
+def masked_scores(recipe_ids, recipe_vectors, recipe_norms, cat_index, ing_index, target_cat, ingredients, query_vec):
+    mask = cat_index.mask_for(target_cat)
+    if ingredients:
+        mask = mask & ing_index.contains_all_mask(ingredients)
+    rows = np.flatnonzero(mask)
+
+    scores = np.dot(recipe_vectors, query_vec) / (norm(query_vec) * recipe_norms)
+    if len(rows):
+        return recipe_ids[rows], scores[rows]
+    return recipe_ids, scores
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    print(f"{'N':>9} | {'loop(ms)':>9} | {'mask(ms)':>9} | speedup")
+    for n in SIZES:
+        recipe_ids, recipes, category_map = make_catalog(n)
+        recipe_vectors = make_vectors(n)
+        recipe_norms = norm(recipe_vectors, axis=1)
+        query_vec = make_vectors(1, seed=1)[0]
+
+        cat_index = CategoryIndex(recipe_ids, CategoryTable(category_map))
+        ing_index = IngredientIndex(recipe_ids, recipes)
+
+        loop_ms = mask_ms = 0.0
+        for cat, ings in QUERIES:
+            t, (ids_a, sc_a) = timed(lambda: legacy_scores(
+                recipe_ids, recipe_vectors, recipes, category_map, cat, ings, query_vec), REPEAT)
+            loop_ms += t
+            t, (ids_b, sc_b) = timed(lambda: masked_scores(
+                recipe_ids, recipe_vectors, recipe_norms, cat_index, ing_index, cat, ings, query_vec), REPEAT)
+            mask_ms += t
+            assert np.array_equal(ids_a, ids_b)
+            assert np.allclose(sc_a, sc_b, atol=1e-5)
+
+        loop_ms /= len(QUERIES)
+        mask_ms /= len(QUERIES)
+        print(f"{n:>9} | {loop_ms:>9.1f} | {mask_ms:>9.2f} | {loop_ms / mask_ms:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+질의 인코더: torch (SentenceTransformer) vs onnx (int8, onnxruntime)
+
+백엔드마다 새 프로세스에서 (다른 백엔드의 import / 메모리가 섞이지 않도록)
+- 로딩 시간 / 로딩 후 RSS / 최대 RSS
+- 문장 하나씩 encode 지연 시간 p50 / p99 (API 요청 경로)
+- 32개 묶음 encode 문장당 시간 (micro-batching 경로)
+- torch 대비 코사인 유사도 (min / mean)
+
+먼저 python -m models.export_onnx_encoder 로 ONNX 모델을 만들어 둘 것
+
+    python -m benchmarks.bench_embed_backend
+    python -m benchmarks.bench_embed_backend --threads 1 2 4 --queries 500
+"""
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import time
+
+import numpy as np
+
+QUERY_TEMPLATES = [
+    "얼큰한 {} 찌개 먹고싶어",
+    "{} 들어간 간단한 반찬 추천해줘",
+    "{} 로 만들 수 있는 덮밥",
+    "비 오는 날 {} 국물 요리",
+    "{}",
+]
+INGREDIENTS = ["김치", "돼지고기", "두부", "계란", "애호박", "어묵", "소고기", "참치", "감자", "콩나물"]
+BATCH = 32
+
+
+def make_queries(n: int, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    return [rng.choice(QUERY_TEMPLATES).format(rng.choice(INGREDIENTS)) for _ in range(n)]
+
+
+def rss_mib() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(backend: str, threads: int, queries: list[str], out):
+    os.environ["EMBED_BACKEND"] = backend
+    os.environ["ONNX_INTRA_OP_THREADS"] = str(threads)
+
+    base_rss = rss_mib()
+    start = time.perf_counter()
+    from app.services.embed_service import model
+    load_s = time.perf_counter() - start
+    load_rss = rss_mib()
+
+    model.encode("워밍업")
+
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        model.encode(q)
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for i in range(0, len(queries), BATCH):
+        model.encode(queries[i:i + BATCH], batch_size=BATCH)
+    batch_ms = (time.perf_counter() - t0) / len(queries) * 1000
+
+    out.put({
+        "load_s": load_s,
+        "rss": load_rss - base_rss,
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50": np.percentile(latencies, 50) * 1000,
+        "p99": np.percentile(latencies, 99) * 1000,
+        "batch_ms": batch_ms,
+        "vectors": np.asarray(model.encode(queries[:100], batch_size=BATCH), dtype=np.float32),
+    })
+
+
+def run(backend: str, threads: int, queries: list[str]) -> dict:
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    p = ctx.Process(target=worker, args=(backend, threads, queries, out))
+    p.start()
+    result = out.get()
+    p.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4], help="onnx intra-op 스레드 수")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+
+    rows = [("torch", 0, run("torch", 0, queries))]
+    for threads in args.threads:
+        rows.append(("onnx", threads, run("onnx", threads, queries)))
+
+    reference = rows[0][2]["vectors"]
+
+    print(f"{'backend':>9} | {'load(s)':>7} | {'+RSS(MiB)':>9} | {'maxRSS':>7} | "
+          f"{'p50(ms)':>7} | {'p99(ms)':>7} | {'batch/q(ms)':>11} | {'cos min':>7} | {'cos mean':>8}")
+    for backend, threads, r in rows:
+        v = r["vectors"]
+        cosine = (reference * v).sum(axis=1) / (np.linalg.norm(reference, axis=1) * np.linalg.norm(v, axis=1))
+        name = backend if backend == "torch" else f"onnx/{threads}t"
+        print(f"{name:>9} | {r['load_s']:>7.1f} | {r['rss']:>9.0f} | {r['max_rss']:>7.0f} | "
+              f"{r['p50']:>7.2f} | {r['p99']:>7.2f} | {r['batch_ms']:>11.2f} | "
+              f"{cosine.min():>7.4f} | {cosine.mean():>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
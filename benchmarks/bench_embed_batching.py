@@ -0,0 +1,86 @@
+"""
+질의 임베딩: 요청마다 encode vs EmbeddingBatcher (동시 클라이언트 1~64)
+
+    python -m benchmarks.bench_embed_batching
+    python -m benchmarks.bench_embed_batching --max-wait-ms 5 --max-batch 64
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from app.services.embed_service import MODEL_NAME, EmbeddingBatcher
+
+CLIENTS = [1, 2, 4, 8, 16, 32, 64]
+QUERIES_PER_CLIENT = 20
+
+QUERY_TEMPLATES = [
+    "얼큰한 {} 찌개 먹고싶어",
+    "{} 들어간 간단한 반찬 추천해줘",
+    "{} 로 만들 수 있는 덮밥",
+    "비 오는 날 {} 국물 요리",
+]
+INGREDIENTS = ["김치", "돼지고기", "두부", "계란", "애호박", "어묵", "소고기", "참치"]
+
+
+def make_queries(n: int, seed: int) -> list[str]:
+    rng = np.random.default_rng(seed)
+    return [
+        rng.choice(QUERY_TEMPLATES).format(rng.choice(INGREDIENTS)) + f" {i}"
+        for i in range(n)
+    ]
+
+
+def run(clients: int, encode) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def client(seed):
+        local = []
+        for q in make_queries(QUERIES_PER_CLIENT, seed):
+            start = time.perf_counter()
+            encode(q)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return clients * QUERIES_PER_CLIENT / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=3)
+    args = parser.parse_args()
+
+    model = SentenceTransformer(MODEL_NAME)
+    model.encode("워밍업")
+
+    batcher = EmbeddingBatcher(
+        lambda texts: model.encode(texts, batch_size=len(texts)),
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+
+    print(f"{'clients':>7} | {'mode':>7} | {'qps':>7} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+    for clients in CLIENTS:
+        for mode, encode in [("single", model.encode), ("batched", batcher.encode)]:
+            qps, lat = run(clients, encode)
+            p50, p99 = np.percentile(lat, [50, 99]) * 1000
+            print(f"{clients:>7} | {mode:>7} | {qps:>7.1f} | {p50:>8.1f} | {p99:>8.1f}")
+
+    print("batcher:", batcher.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+냉장고 모드: 기존 전체 스캔 vs 재료 역색인 비교
+
+    python -m benchmarks.bench_fridge_index
+"""
+import time
+
+from app.services.ingredient_index import IngredientIndex
+from app.services.recipe_store import recipe_text
+from app.utils.normalize import INGREDIENT_MAP
+from benchmarks.synthetic import make_catalog
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUERIES = [
+    ["달걀", "파"],
+    ["고기", "김치", "두부"],
+    ["라면", "달걀", "파"],
+    ["해산물", "고추"],
+]
+REPEAT = 5
+
+
+def legacy_top_matches(recipe_ids, recipes, ingredients, seen_ids):
+    """
+    기존 get_next_recipe_by_fridge 스캔 로직 (Spring 조회 대신 dict)
+    """
+    def ingredient_match(text, ing):
+        return any(c in text for c in INGREDIENT_MAP.get(ing, [ing]))
+
+    scored = []
+    for rid in recipe_ids:
+        if rid in seen_ids:
+            continue
+        recipe = recipes.get(int(rid))
+        if not recipe:
+            continue
+        text = recipe_text(recipe)
+        match_count = sum(ingredient_match(text, ing) for ing in ingredients)
+        if match_count == 0:
+            continue
+        if ingredient_match(text, "면") and not any(
+            ing in ["면", "라면", "파스타"] for ing in ingredients
+        ):
+            continue
+        scored.append((match_count, rid))
+
+    if not scored:
+        return []
+    scored.sort(reverse=True)
+    best = scored[0][0]
+    return [rid for s, rid in scored if s == best]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    print(f"{'N':>9} | {'build(s)':>8} | {'cold(ms)':>8} | {'scan(ms)':>9} | {'index(ms)':>9} | speedup")
+    for n in SIZES:
+        recipe_ids, recipes, _ = make_catalog(n)
+        seen_ids = list(recipe_ids[:50])
+
+        start = time.perf_counter()
+        index = IngredientIndex(recipe_ids, recipes)
+        build = time.perf_counter() - start
+
+        # 첫 질의에서 계산되는 비사전 재료를 미리 채움 (웜업, 질의당 평균 = cold)
+        start = time.perf_counter()
+        for q in QUERIES:
+            index.top_matches(q, seen_ids)
+        cold_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        scan_ms = index_ms = 0.0
+        scan_repeat = 1 if n >= 1_000_000 else REPEAT
+        for q in QUERIES:
+            t, legacy = timed(lambda: legacy_top_matches(recipe_ids, recipes, q, seen_ids), scan_repeat)
+            scan_ms += t
+            t, fast = timed(lambda: index.top_matches(q, seen_ids), REPEAT)
+            index_ms += t
+            assert list(legacy) == list(fast), f"ranking mismatch for {q}"
+
+        scan_ms /= len(QUERIES)
+        index_ms /= len(QUERIES)
+        print(f"{n:>9} | {build:>8.2f} | {cold_ms:>8.2f} | {scan_ms:>9.1f} | {index_ms:>9.2f} | {scan_ms / index_ms:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+세션 저장소: 기존 dict-of-list vs MemorySessionStore
+
+1) 조회: 세션 기록 S개일 때 get_seen + 후보 필터 (rid not in seen_ids)
+2) 동시성: 스레드 여러 개가 서로 다른 사용자에 get_seen / add_seen
+3) 게스트 누적: 익명 요청마다 새 user_id → 기존은 영원히 남고, 새 저장소는 만료 / LRU
+
+    python -m benchmarks.bench_session_store
+"""
+import threading
+import time
+import tracemalloc
+
+from app.services import session_manager
+from app.services.session_manager import MemorySessionStore
+
+SEEN_SIZES = [10, 100, 500]
+CANDIDATES = 100
+REPEAT = 2000
+THREADS = [1, 8, 32]
+OPS_PER_THREAD = 5000
+GUESTS = 100_000
+
+
+class LegacyStore:
+    """
+    기존 session_manager 로직 (조회마다 리스트 재생성, 전역 만료 없음, 락 없음)
+    """
+
+    def __init__(self):
+        self.sessions = {}
+
+    def get_seen(self, user_id):
+        now = time.time()
+        if user_id not in self.sessions:
+            return []
+        self.sessions[user_id] = [
+            item for item in self.sessions[user_id] if now - item["seen_at"] < session_manager.TTL
+        ]
+        return [item["recipe_id"] for item in self.sessions[user_id]]
+
+    def add_seen(self, user_id, recipe_id):
+        self.sessions.setdefault(user_id, []).append({"recipe_id": recipe_id, "seen_at": time.time()})
+
+
+def bench_lookup():
+    print(f"{'seen':>5} | {'legacy(us)':>10} | {'store(us)':>10}")
+    candidates = list(range(0, CANDIDATES * 7, 7))
+    for size in SEEN_SIZES:
+        legacy, store = LegacyStore(), MemorySessionStore()
+        for rid in range(size):
+            legacy.add_seen("u", rid)
+            store.add_seen("u", rid)
+
+        row = []
+        for s in (legacy, store):
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                seen = s.get_seen("u")
+                [rid for rid in candidates if rid not in seen]
+            row.append((time.perf_counter() - start) / REPEAT * 1e6)
+        print(f"{size:>5} | {row[0]:>10.1f} | {row[1]:>10.1f}")
+
+
+def bench_threads():
+    print(f"\n{'threads':>7} | {'ops/s':>10}")
+    store = MemorySessionStore()
+
+    def worker(t):
+        for i in range(OPS_PER_THREAD):
+            user = f"user-{t}-{i % 50}"
+            store.get_seen(user)
+            store.add_seen(user, i)
+
+    for n in THREADS:
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        ops = n * OPS_PER_THREAD * 2 / (time.perf_counter() - start)
+        print(f"{n:>7} | {ops:>10.0f}")
+
+
+def bench_guests():
+    print(f"\n{GUESTS} guest requests (one recipe each)")
+    for name, s in [("legacy", LegacyStore()), ("store", MemorySessionStore(max_users=10_000))]:
+        tracemalloc.start()
+        for i in range(GUESTS):
+            s.add_seen(f"guest-{i}", i)
+        if isinstance(s, MemorySessionStore):
+            # TTL 이 지난 시점의 sweeper 한 번
+            s.sweep(now=time.time() + session_manager.TTL + 1)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        users = len(s.sessions) if isinstance(s, LegacyStore) else s.stats()["users"]
+        print(f"{name:>7}: {users:>7} sessions left, {current / 2**20:6.1f} MiB")
+
+
+def main():
+    bench_lookup()
+    bench_threads()
+    bench_guests()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+/recommend/chat/async (답변까지 한 번에) vs /recommend/chat/stream (SSE)
+클라이언트 기준 첫 바이트(TTFB) / 첫 답변 토큰 / 전체 완료 시간
+
+    python -m benchmarks.bench_stream_ttfb
+    python -m benchmarks.bench_stream_ttfb --llm-latency-ms 2000 --clients 8
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+import requests
+
+from benchmarks.bench_async_pipeline import APP_PORT, start_servers
+
+QUERY = "김치찌개 먹고싶어"
+
+
+def blocking(session: requests.Session, i: int) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    res = session.get(
+        f"http://127.0.0.1:{APP_PORT}/api/recommend/chat/async",
+        params={"query": QUERY, "user_id": f"bench-b-{i}"},
+    )
+    res.raise_for_status()
+    done = time.perf_counter() - start
+    # 답변과 레시피가 함께 도착하므로 세 값이 같음
+    return done, done, done
+
+
+def streaming(session: requests.Session, i: int) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    ttfb = first_token = None
+    with session.get(
+        f"http://127.0.0.1:{APP_PORT}/api/recommend/chat/stream",
+        params={"query": QUERY, "user_id": f"bench-s-{i}"},
+        stream=True,
+    ) as res:
+        res.raise_for_status()
+        for line in res.iter_lines(decode_unicode=True):
+            if line == "event: recipe" and ttfb is None:
+                ttfb = time.perf_counter() - start
+            elif line == "event: token" and first_token is None:
+                first_token = time.perf_counter() - start
+    return ttfb, first_token, time.perf_counter() - start
+
+
+def run(fn, clients: int, total: int) -> np.ndarray:
+    results = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        session = requests.Session()
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            local.append(fn(session, i))
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.array(results) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-latency-ms", type=float, default=1000)
+    parser.add_argument("--llm-parallel", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=32)
+    args = parser.parse_args()
+
+    procs = start_servers(args.llm_latency_ms, args.llm_parallel)
+    try:
+        run(streaming, 1, 2)   # 워밍업
+        print(f"LLM latency {args.llm_latency_ms:.0f}ms (stub), {args.clients} clients")
+        print(f"{'mode':>9} | {'ttfb p50':>9} | {'ttfb p99':>9} | {'token p50':>9} | {'total p50':>9} | {'total p99':>9}")
+        for mode, fn in [("blocking", blocking), ("stream", streaming)]:
+            ms = run(fn, args.clients, args.requests)
+            ttfb, token, total = ms[:, 0], ms[:, 1], ms[:, 2]
+            print(
+                f"{mode:>9} | {np.percentile(ttfb, 50):>9.1f} | {np.percentile(ttfb, 99):>9.1f} | "
+                f"{np.percentile(token, 50):>9.1f} | {np.percentile(total, 50):>9.1f} | {np.percentile(total, 99):>9.1f}"
+            )
+    finally:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+상위 k 선택: 전체 argsort vs argpartition(top_k_indices)
+
+    python -m benchmarks.bench_topk
+"""
+import time
+
+import numpy as np
+
+from app.utils.topk import top_k_indices
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+KS = [10, 50]
+REPEAT = 20
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'N':>9} | {'k':>3} | {'argsort(ms)':>11} | {'topk(ms)':>8} | speedup")
+    for n in SIZES:
+        scores = rng.random(n, dtype=np.float32)
+        for k in KS:
+            t_sort, full = timed(lambda: np.argsort(scores)[::-1][:k], REPEAT)
+            t_topk, fast = timed(lambda: top_k_indices(scores, k), REPEAT)
+            assert np.array_equal(scores[full], scores[fast])
+            print(f"{n:>9} | {k:>3} | {t_sort:>11.3f} | {t_topk:>8.3f} | {t_sort / t_topk:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
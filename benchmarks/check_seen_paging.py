@@ -0,0 +1,92 @@
+"""
+한 사용자가 같은 질의로 계속 "다른 거"를 눌러 150개 넘게 넘겨 볼 때
+
+- 기존: 전체 상위 10개를 고른 뒤 본 레시피 제거 → 10개를 다 보면 다시 같은 것
+- 현재: 본 레시피를 마스크로 빼고 상위 k개 선택 → 매번 새 레시피
+
+정확 탐색 / IVF 근사 탐색 각각, 필터 없음 / 카테고리 필터 질의로 확인한다.
+(임베딩 모델 없이 랭킹만 보려고 query 벡터는 고정된 값을 사용)
+
+    python -m benchmarks.check_seen_paging
+    python -m benchmarks.check_seen_paging --n 60000 --pages 300
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from app.services import recommend_engine
+from benchmarks.synthetic_snapshot import SyntheticSnapshot
+
+QUERIES = [
+    ("오늘 뭐 먹지", {"category": [], "ingredients": []}),
+    ("찌개 추천", {"category": ["찌개"], "ingredients": []}),
+    ("김치 들어간 찌개", {"category": ["찌개"], "ingredients": ["김치"]}),
+]
+
+
+def legacy_next_recipe(query, tags, seen_ids, snapshot):
+    # 기존 방식: seen 없이 상위 k개 → 본 것 제거 → 다 봤으면 다시 전체
+    ids, scores = recommend_engine.get_candidates(query, tags, snapshot=snapshot)
+    fresh = [(rid, sc) for rid, sc in zip(ids, scores) if rid not in seen_ids] or list(zip(ids, scores))
+    rid = int(fresh[0][0])
+    return {"recipeId": rid}
+
+
+def page_through(next_recipe, query, tags, snapshot, pages: int):
+    seen: set[int] = set()
+    repeats = 0
+    latencies = []
+
+    for _ in range(pages):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            recipe = next_recipe(query, tags, frozenset(seen), snapshot)
+        latencies.append(time.perf_counter() - t0)
+
+        rid = int(recipe["recipeId"])
+        if rid in seen:
+            repeats += 1
+        seen.add(rid)
+
+    return repeats, np.percentile(latencies, 50) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--pages", type=int, default=150)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    query_vecs = {q: rng.standard_normal(args.dim).astype(np.float32) for q, _ in QUERIES}
+    recommend_engine.build_query_vector = lambda q, categories, ingredients: query_vecs[q]
+
+    def current_next_recipe(query, tags, seen_ids, snapshot):
+        return recommend_engine.get_next_recipe(query, tags, seen_ids, snapshot=snapshot)
+
+    print(f"{args.n} recipes, {args.pages} pages per user")
+    print(f"{'search':>6} | {'query':<16} | {'legacy repeats':>14} | {'repeats':>7} | {'p50(ms)':>7}")
+
+    failed = False
+    for ann in (False, True):
+        snapshot = SyntheticSnapshot(args.n, args.dim, ann)
+        for query, tags in QUERIES:
+            legacy_repeats, _ = page_through(legacy_next_recipe, query, tags, snapshot, args.pages)
+            repeats, p50 = page_through(current_next_recipe, query, tags, snapshot, args.pages)
+            failed |= repeats > 0
+            print(
+                f"{'ivf' if ann else 'exact':>6} | {query:<16} | {legacy_repeats:>14} | "
+                f"{repeats:>7} | {p50:>7.2f}"
+            )
+
+    if failed:
+        raise SystemExit("❌ 이미 본 레시피가 다시 나옴")
+    print("✅ 모든 페이지에서 새 레시피")
+
+
+if __name__ == "__main__":
+    main()
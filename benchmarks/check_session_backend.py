@@ -0,0 +1,103 @@
+"""
+세션 저장소: 워커 간 공유 확인 + 요청당 비용
+
+1) 두 프로세스(워커 A / B)가 같은 SQLite 파일을 공유
+   A 가 add_seen → B 가 처음 조회할 때 보이는지, 보이기까지 걸린 시간
+   (후속 발화 "다른 거"가 다른 워커로 가는 상황)
+2) 요청 한 번 (get_seen + get_last_seen + add_seen) 지연 시간: memory vs sqlite
+
+    python -m benchmarks.check_session_backend
+"""
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+
+USERS = 200
+OPS = 5000
+
+
+def worker_a(path: str, ready, done):
+    from app.services.session_sqlite import SqliteSessionStore
+    store = SqliteSessionStore(path)
+    ready.wait()
+    for i in range(USERS):
+        store.add_seen(f"user-{i}", 1000 + i)
+        store.add_seen(f"user-{i}", 2000 + i)
+    done.value = time.time()
+
+
+def worker_b(path: str, ready, done, out):
+    from app.services.session_sqlite import SqliteSessionStore
+    store = SqliteSessionStore(path)
+    ready.set()
+    while not done.value:
+        time.sleep(0.001)
+
+    # 사용자별로 B 가 처음 보는 시점 (B 캐시에는 아직 없음 → DB 조회)
+    lags, missing = [], 0
+    for i in range(USERS):
+        user = f"user-{i}"
+        deadline = time.time() + 2
+        while True:
+            seen = store.get_seen(user)
+            last = store.get_last_seen(user)
+            if {1000 + i, 2000 + i} <= seen and last and last["recipe_id"] == 2000 + i:
+                lags.append(time.time() - done.value)
+                break
+            if time.time() > deadline:
+                missing += 1
+                break
+            store._cache.clear()   # 다음 시도는 다시 DB 에서
+            time.sleep(0.002)
+    out.put((lags, missing))
+
+
+def check_cross_worker(path: str):
+    ctx = mp.get_context("spawn")
+    ready, done, out = ctx.Event(), ctx.Value("d", 0.0), ctx.Queue()
+    a = ctx.Process(target=worker_a, args=(path, ready, done))
+    b = ctx.Process(target=worker_b, args=(path, ready, done, out))
+    b.start()
+    a.start()
+    lags, missing = out.get(timeout=60)
+    a.join()
+    b.join()
+
+    print(f"cross-worker: {len(lags)}/{USERS} users visible on B, {missing} missing")
+    if lags:
+        p50, p99 = np.percentile(lags, [50, 99]) * 1000
+        print(f"  visibility lag after A's last write: p50 {p50:.1f}ms, p99 {p99:.1f}ms")
+
+
+def bench_request_cost(path: str):
+    from app.services.session_manager import MemorySessionStore
+    from app.services.session_sqlite import SqliteSessionStore
+
+    print(f"\n{'backend':>8} | {'p50(us)':>8} | {'p99(us)':>8} | extra")
+    for name, store in [("memory", MemorySessionStore()), ("sqlite", SqliteSessionStore(path))]:
+        latencies = []
+        for i in range(OPS):
+            user = f"bench-{i % 50}"
+            t0 = time.perf_counter()
+            store.get_seen(user)
+            store.get_last_seen(user)
+            store.add_seen(user, i)
+            latencies.append(time.perf_counter() - t0)
+        store.flush()
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        extra = {k: v for k, v in store.stats().items() if k in ("db_reads", "flushes", "rows_written")}
+        print(f"{name:>8} | {p50:>8.1f} | {p99:>8.1f} | {extra}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        check_cross_worker(os.path.join(tmp, "cross.db"))
+        bench_request_cost(os.path.join(tmp, "bench.db"))
+
+
+if __name__ == "__main__":
+    main()
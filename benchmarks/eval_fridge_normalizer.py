@@ -0,0 +1,109 @@
+"""
+냉장고 재료 정규화: 사전 / 항목 캐시 / LLM 비율과 요청당 지연 시간
+
+가짜 Spring / Ollama 를 같은 프로세스에 띄우고, 자주 나오는 재료 + 드문 재료(긴 꼬리)에
+수량·단위 표현을 섞은 냉장고 요청을 순서대로 보낸다.
+
+    python -m benchmarks.eval_fridge_normalizer
+    python -m benchmarks.eval_fridge_normalizer --requests 2000 --llm-latency-ms 800
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+SPRING_PORT = 18081
+OLLAMA_PORT = 21435
+
+COMMON_ITEMS = [
+    "계란", "대파", "양파", "돼지고기", "두부", "김치", "감자", "마늘", "당근", "애호박",
+    "소고기", "닭고기", "버섯", "우유", "치즈", "콩나물", "어묵", "청양고추", "시금치", "참치",
+]
+# 카탈로그 / 사전에 없는 재료 → 처음 한 번은 LLM
+RARE_ITEMS = [
+    "스팸", "베이컨", "고등어", "연어", "브로콜리", "파프리카", "깻잎", "숙주", "비엔나소시지",
+    "떡국떡", "만두", "닭가슴살", "알배추", "유부", "메추리알", "건새우", "미역", "쌈장",
+]
+QUANTITIES = ["", " 1개", " 2개", " 한 단", " 반 모", " 200g", " 1팩", " 약간", "(남은거)", " 300g"]
+
+# 항목 정리 규칙 확인 (앞에 수량 + 단위 글자로 시작하는 재료: 첫 글자를 단위로 먹으면 안 됨)
+CLEAN_CASES = [
+    ("대파 한 단", "대파"), ("돼지고기 200g", "돼지고기"), ("계란(2개)", "계란"), ("두부 반 모", "두부"),
+    ("200g돼지고기", "돼지고기"), ("우유 1L", "우유"),
+    ("1 대파", "대파"), ("2 장어", "장어"), ("1 모짜렐라", "모짜렐라"), ("3 알배추", "알배추"),
+    ("1 통마늘", "통마늘"), ("2 단호박", "단호박"), ("1 봉어묵", "봉어묵"), ("2개 장어", "장어"),
+]
+
+
+def check_clean_cases():
+    from app.utils.normalize import clean_ingredient_item
+
+    failed = [(item, clean_ingredient_item(item), want) for item, want in CLEAN_CASES
+              if clean_ingredient_item(item) != want]
+    for item, got, want in failed:
+        print(f"❌ {item!r} → {got!r} (expected {want!r})")
+    if failed:
+        raise SystemExit("❌ 항목 정리 규칙 실패")
+    print(f"✅ 항목 정리 규칙 {len(CLEAN_CASES)}개 통과")
+
+
+def make_requests(n: int, seed: int = 0) -> list[list[str]]:
+    rng = np.random.default_rng(seed)
+    common_p = 1 / np.arange(1, len(COMMON_ITEMS) + 1)
+    common_p /= common_p.sum()
+
+    requests_ = []
+    for _ in range(n):
+        items = list(rng.choice(COMMON_ITEMS, size=rng.integers(2, 6), replace=False, p=common_p))
+        if rng.random() < 0.3:
+            items.append(str(rng.choice(RARE_ITEMS)))
+        requests_.append([item + str(rng.choice(QUANTITIES)) for item in items])
+    return requests_
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--llm-latency-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    check_clean_cases()
+
+    # 앱 모듈 import 전에 upstream 주소를 가짜 서버로
+    os.environ["SPRING_BASE_URL"] = f"http://127.0.0.1:{SPRING_PORT}"
+    os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{OLLAMA_PORT}"
+
+    from benchmarks.stub_upstreams import start_stub_upstreams
+    start_stub_upstreams(SPRING_PORT, OLLAMA_PORT, args.llm_latency_ms / 1000, llm_parallel=4)
+
+    from app.services import ingredient_llm_mapper as mapper
+    from app.services.recipe_snapshot import snapshot_holder
+    snapshot_holder.current()
+
+    print(f"LLM latency {args.llm_latency_ms:.0f}ms (stub), {args.requests} fridge requests")
+    print(f"{'window':>11} | {'no-LLM req':>10} | {'dict':>6} | {'cache':>6} | {'llm items':>9} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+
+    window = max(args.requests // 5, 1)
+    reqs = make_requests(args.requests)
+    for start in range(0, len(reqs), window):
+        before = mapper.stats.snapshot()
+        latencies = []
+        for items in reqs[start:start + window]:
+            t0 = time.perf_counter()
+            mapper.normalize_ingredients_with_llm(items)
+            latencies.append(time.perf_counter() - t0)
+
+        delta = {k: mapper.stats[k] - before[k] for k in before}
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(
+            f"{start:>5}-{start + len(latencies):<5} | "
+            f"{1 - delta['llm_calls'] / delta['requests']:>10.1%} | {delta['dict_hits']:>6} | "
+            f"{delta['cache_hits']:>6} | {delta['llm_items']:>9} | {p50:>8.2f} | {p99:>8.1f}"
+        )
+
+    print("\nexample:", reqs[0], "→", mapper.normalize_ingredients_with_llm(reqs[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+BM25 + SBERT 하이브리드 검색: 지연 시간 / recall (전수 계산 대비)
+
+- dense        : 코사인 전수 상위 k (기존 경로)
+- bm25         : 어휘 점수만
+- hybrid-full  : 코사인 전수 + BM25 → RRF (기준)
+- hybrid-short : BM25 상위 LEXICAL_SHORTLIST 개 안에서만 코사인 → RRF (큰 카탈로그 경로)
+
+recall@k = hybrid-short 결과 중 hybrid-full 상위 k 에 든 비율
+
+임베딩 모델 없이 흉내:
+- 레시피 이름 = 주제(임베딩 군집)마다 정한 요리 이름 + 조리법 → 어휘와 의미가 같은 방향
+- 질의 벡터 = 정답 레시피 벡터 + 잡음, 질의 문장 = 그 레시피 요리 이름 + 재료 1개
+
+    python -m benchmarks.eval_hybrid_search
+    python -m benchmarks.eval_hybrid_search --n 200000 --shortlist 1000 2000 5000
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from app.services import recommend_engine
+from app.services.lexical_index import LexicalIndex
+from app.services.vector_store import l2_normalize
+from benchmarks.synthetic_snapshot import SyntheticSnapshot
+
+K = 10
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주")
+STYLES = ["볶음", "조림", "무침", "구이", "찜", "전", "탕", "국"]
+
+
+def name_by_topic(snapshot, seed: int = 2):
+    """
+    주제마다 가짜 요리 이름(3글자) → 레시피 이름에 반영 후 BM25 인덱스 다시 생성
+    """
+    rng = np.random.default_rng(seed)
+    dish = {}
+    for topic in np.unique(snapshot.topics):
+        dish[int(topic)] = "".join(rng.choice(SYLLABLES, size=3))
+
+    for row, rid in enumerate(snapshot.recipe_ids):
+        recipe = snapshot.recipes[int(rid)]
+        recipe["name"] = f"{dish[int(snapshot.topics[row])]}{rng.choice(STYLES)}"
+    snapshot.lexical_index = LexicalIndex.build(snapshot.recipe_ids, snapshot.recipes)
+
+
+def make_queries(snapshot, n: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    queries = []
+    for row in rng.choice(len(snapshot.recipe_ids), size=n, replace=False):
+        recipe = snapshot.recipes[int(snapshot.recipe_ids[row])]
+        ingredients = recipe["ingredient"].split()[::2]   # "재료 수량" 반복 → 재료 이름만
+        text = f"{recipe['name'][:3]} {rng.choice(ingredients)}"
+        vec = np.asarray(snapshot.recipe_vectors[row], dtype=np.float32)
+        vec = l2_normalize(vec + 0.05 * rng.standard_normal(vec.shape, dtype=np.float32))
+        queries.append((text, vec))
+    return queries
+
+
+def run(snapshot, queries, mode: str, shortlist_min_rows: int):
+    recommend_engine.HYBRID_SEARCH = mode
+    recommend_engine.LEXICAL_SHORTLIST_MIN_ROWS = shortlist_min_rows
+
+    results, latencies = [], []
+    for text, vec in queries:
+        recommend_engine.build_query_vector = lambda q, categories, ingredients, vec=vec: vec
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ids, _ = recommend_engine.get_candidates(text, {}, K, snapshot)
+        latencies.append(time.perf_counter() - t0)
+        results.append(set(int(i) for i in ids))
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return results, p50, p99
+
+
+def recall(results, truth) -> float:
+    return sum(len(r & t) for r, t in zip(results, truth)) / sum(len(t) for t in truth)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--shortlist", type=int, nargs="+", default=[500, 2000, 5000])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = SyntheticSnapshot(args.n, args.dim)
+    name_by_topic(snapshot)
+    index = snapshot.lexical_index
+    print(f"build: {args.n} recipes, bm25 terms={len(index)}, postings={len(index.rows)}, "
+          f"{time.perf_counter() - start:.1f}s")
+
+    queries = make_queries(snapshot, args.queries)
+
+    t0 = time.perf_counter()
+    for text, _ in queries:
+        index.search(text, recommend_engine.LEXICAL_SHORTLIST)
+    bm25_ms = (time.perf_counter() - t0) / len(queries) * 1000
+
+    no_shortlist = len(snapshot.recipe_ids) + 1
+    dense, dense_p50, dense_p99 = run(snapshot, queries, "off", no_shortlist)
+    truth, full_p50, full_p99 = run(snapshot, queries, "rrf", no_shortlist)
+
+    print(f"\n{'path':>20} | {'p50(ms)':>8} | {'p99(ms)':>8} | {f'recall@{K}':>9}")
+    print(f"{'bm25 only':>20} | {bm25_ms:>8.2f} | {'':>8} | {'':>9}")
+    print(f"{'dense (brute)':>20} | {dense_p50:>8.2f} | {dense_p99:>8.2f} | {recall(dense, truth):>9.3f}")
+    print(f"{'hybrid-full':>20} | {full_p50:>8.2f} | {full_p99:>8.2f} | {1.0:>9.3f}")
+
+    for size in args.shortlist:
+        recommend_engine.LEXICAL_SHORTLIST = size
+        short, p50, p99 = run(snapshot, queries, "rrf", 0)
+        print(f"{f'hybrid-short {size}':>20} | {p50:>8.2f} | {p99:>8.2f} | {recall(short, truth):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
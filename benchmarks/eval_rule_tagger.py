@@ -0,0 +1,163 @@
+"""
+규칙 기반 태그 추출: 질의 코퍼스에서 적중률(LLM 생략 비율) / 지연 시간
+
+    python -m benchmarks.eval_rule_tagger
+    python -m benchmarks.eval_rule_tagger --spring          # 실제 카탈로그 (Spring 필요)
+    python -m benchmarks.eval_rule_tagger --compare-llm     # 적중한 질의를 LLM 결과와 비교 (Ollama 필요)
+    python -m benchmarks.eval_rule_tagger --queries my_queries.txt
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.rule_tagger import RuleTagger
+from benchmarks.synthetic import make_catalog
+
+# 실제 로그에서 흔한 형태를 흉내낸 질의 (LLM 이 필요한 것도 섞음)
+SAMPLE_QUERIES = [
+    "김치찌개 먹고싶어",
+    "된장찌개 추천해줘",
+    "얼큰한 국물 요리 추천",
+    "매운 거 먹고 싶다",
+    "계란이랑 대파로 만들 수 있는 요리",
+    "돼지고기 김치 볶음밥",
+    "두부 들어간 반찬",
+    "오늘 저녁 뭐 먹지",
+    "간단한 파스타 알려줘",
+    "라면 말고 다른 거",
+    "이거 말고 다른 거 추천해줘",
+    "김치 빼고 찌개",
+    "비 오는 날 생각나는 음식",
+    "다이어트 중인데 가벼운 거",
+    "부대찌개 레시피",
+    "제육볶음 먹고싶어",
+    "감자랑 양파 있는데 뭐 해먹지",
+    "새우 들어간 덮밥",
+    "떡볶이 먹고싶다",
+    "토스트 만들래",
+    "소고기 미역국",
+    "닭고기로 할 수 있는 메인반찬",
+    "시원한 냉면 먹고싶어",
+    "애호박 된장국",
+    "아이랑 먹을 간식",
+    "칼칼한 찌개",
+    "어묵탕 해줘",
+    "버섯 크림 파스타",
+    "spicy noodle",
+    "고기 요리 추천",
+]
+
+QUERY_TEMPLATES = [
+    "{} 찌개 먹고싶어",
+    "{} 들어간 반찬",
+    "{} 로 만들 수 있는 덮밥",
+    "{}랑 {} 로 요리 추천해줘",
+    "매콤한 {} 볶음밥",
+    "{} 국물 요리",
+    "{} 넣은 파스타 알려줘",
+]
+TEMPLATE_INGREDIENTS = [
+    "김치", "돼지고기", "두부", "계란", "애호박", "어묵", "소고기", "참치", "감자", "양파",
+    "버섯", "새우", "콩나물", "스팸", "고등어",
+]
+
+
+def make_queries(n: int, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    queries = list(SAMPLE_QUERIES)
+    while len(queries) < n:
+        template = str(rng.choice(QUERY_TEMPLATES))
+        picks = rng.choice(TEMPLATE_INGREDIENTS, size=template.count("{}"), replace=False)
+        queries.append(template.format(*picks))
+    return queries[:n]
+
+
+def load_catalog(spring: bool, n: int) -> tuple[dict, list[str]]:
+    if spring:
+        from app.services.category_service import category_service
+        from app.services.recipe_store import recipe_store
+
+        category_service.refresh()   # 조회는 메모리만 읽으므로 직접 받아옴
+        return recipe_store.all(), category_service.table().names
+
+    _, recipes, categories = make_catalog(n)
+    names = sorted({c for cats in categories.values() for c in cats})
+    return recipes, names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spring", action="store_true", help="Spring 카탈로그로 사전 생성")
+    parser.add_argument("--catalog", type=int, default=5000, help="가짜 카탈로그 레시피 수")
+    parser.add_argument("--queries", default=None, help="질의 파일 (한 줄에 하나)")
+    parser.add_argument("--n", type=int, default=500, help="생성할 질의 수 (--queries 없을 때)")
+    parser.add_argument("--repeat", type=int, default=20, help="지연 측정 반복 횟수")
+    parser.add_argument("--compare-llm", action="store_true")
+    parser.add_argument("--show", type=int, default=15, help="예시 출력 개수")
+    args = parser.parse_args()
+
+    recipes, category_names = load_catalog(args.spring, args.catalog)
+
+    start = time.perf_counter()
+    tagger = RuleTagger(recipes, category_names)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"lexicon: {len(tagger)} words from {len(recipes)} recipes, build {build_ms:.1f}ms")
+
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = make_queries(args.n)
+
+    results = [tagger.extract(q) for q in queries]
+    hits = [(q, tags) for q, tags in zip(queries, results) if tags is not None]
+    misses = [q for q, tags in zip(queries, results) if tags is None]
+
+    latencies = []
+    for _ in range(args.repeat):
+        for q in queries:
+            t0 = time.perf_counter()
+            tagger.extract(q)
+            latencies.append(time.perf_counter() - t0)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+
+    print(f"queries: {len(queries)}")
+    print(f"rule hit rate: {len(hits) / len(queries):.1%} ({len(hits)} resolved, {len(misses)} → LLM)")
+    print(f"rule latency: p50 {p50:.1f}us, p99 {p99:.1f}us")
+
+    print("\n[resolved]")
+    for q, tags in hits[:args.show]:
+        print(f"  {q!r:40} → {tags}")
+    print("\n[fallback → LLM]")
+    for q in misses[:args.show]:
+        print(f"  {q!r}")
+
+    if args.compare_llm:
+        from app.services.llm_client import analyze_text, normalize_tags
+        from app.services.rule_adjust import rule_adjust
+
+        # 실제 파이프라인처럼 rule_adjust 까지 적용한 뒤 비교
+        same_cat = same_ing = 0
+        llm_latencies = []
+        for q, tags in hits:
+            t0 = time.perf_counter()
+            llm_tags = normalize_tags(analyze_text(q))
+            llm_latencies.append(time.perf_counter() - t0)
+
+            ours = rule_adjust({k: list(v) for k, v in tags.items()}, q)
+            theirs = rule_adjust(llm_tags, q)
+            same_cat += ours["category"] == theirs["category"]
+            same_ing += set(ours["ingredients"]) == set(theirs["ingredients"])
+            if ours != theirs:
+                print(f"  diff {q!r}: rule={ours} llm={theirs}")
+
+        if hits:
+            lp50, lp99 = np.percentile(llm_latencies, [50, 99]) * 1000
+            print(f"\nagreement with LLM on resolved queries: category {same_cat / len(hits):.1%}, "
+                  f"ingredients {same_ing / len(hits):.1%}")
+            print(f"LLM latency skipped: p50 {lp50:.0f}ms, p99 {lp99:.0f}ms per resolved query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+로컬 가짜 Spring / Ollama 서버 (벤치마크 전용)
+
+- Spring: /api/recipes/all (ETag), /api/recipes?page=&size=, /api/recipes/categories, /api/recipes/{id}
+- Ollama: /v1/chat/completions, /api/chat (stream 포함)
+- LLM 응답 지연은 --llm-latency-ms, 동시 처리 수는 --llm-parallel 로 흉내 낸다
+  (Ollama 기본 OLLAMA_NUM_PARALLEL 처럼 넘치는 요청은 서버 쪽에서 대기)
+
+    python -m benchmarks.stub_upstreams --llm-latency-ms 300 --llm-parallel 4
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from app.services.vector_store import IDS_PATH
+from benchmarks.synthetic import make_catalog
+
+STREAM_TOKENS = ["오늘은 ", "이 요리 ", "한번 ", "만들어 ", "보는 건 ", "어때요?"]
+
+
+class StubState:
+    def __init__(self, recipe_ids: np.ndarray, llm_latency: float, llm_parallel: int):
+        _, recipes, categories = make_catalog(len(recipe_ids))
+        # 실제 벡터 파일의 id 를 그대로 사용 → 서버 snapshot 과 맞물림
+        self.recipes = []
+        self.categories = {}
+        for rid, (fake_id, recipe) in zip(recipe_ids, recipes.items()):
+            rid = int(rid)
+            self.recipes.append(dict(recipe, recipeId=rid, name=f"레시피{rid}"))
+            self.categories[str(rid)] = categories[str(fake_id)]
+        self.by_id = {r["recipeId"]: r for r in self.recipes}
+        self.llm_latency = llm_latency
+        self.llm_slots = threading.Semaphore(llm_parallel) if llm_parallel > 0 else None
+
+    def generate(self, seconds: float):
+        if self.llm_slots is None:
+            time.sleep(seconds)
+            return
+        with self.llm_slots:
+            time.sleep(seconds)
+
+
+def _make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+        disable_nagle_algorithm = True   # 헤더/본문 분할 전송 시 delayed ACK 지연 방지
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, obj, status=200, headers=None):
+            body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        # ---------------- Spring ----------------
+        def do_GET(self):
+            url = urlparse(self.path)
+
+            if url.path == "/api/recipes/all":
+                if self.headers.get("If-None-Match") == '"stub"':
+                    self.send_response(304)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                return self._send_json(state.recipes, headers={"ETag": '"stub"'})
+
+            if url.path == "/api/recipes/categories":
+                return self._send_json(state.categories)
+
+            if url.path == "/api/recipes":
+                q = parse_qs(url.query)
+                page = int(q.get("page", [0])[0])
+                size = int(q.get("size", [1000])[0])
+                items = state.recipes[page * size:(page + 1) * size]
+                return self._send_json({"content": items, "last": (page + 1) * size >= len(state.recipes)})
+
+            if url.path.startswith("/api/recipes/"):
+                rid = url.path.rsplit("/", 1)[-1]
+                recipe = state.by_id.get(int(rid)) if rid.isdigit() else None
+                if recipe is None:
+                    return self._send_json({}, status=404)
+                return self._send_json(recipe)
+
+            self._send_json({}, status=404)
+
+        # ---------------- Ollama ----------------
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            url = urlparse(self.path)
+
+            system = body.get("messages", [{}])[0].get("content", "")
+            if "태그" in system:
+                content = '{"category": ["찌개"], "ingredients": ["김치", "돼지고기"]}'
+            elif "정규화" in system:
+                # 항목 → 표준 재료명 객체 (입력 그대로 돌려줌)
+                user = body["messages"][-1]["content"]
+                items = json.loads(user[user.find("["):user.rfind("]") + 1] or "[]")
+                content = json.dumps({item: item for item in items}, ensure_ascii=False)
+            else:
+                content = "오늘은 이 요리 한번 만들어 보는 건 어때요?"
+
+            if body.get("stream"):
+                return self._stream(url.path)
+
+            state.generate(state.llm_latency)
+            if url.path == "/api/chat":
+                return self._send_json({"message": {"content": content}, "done": True})
+            return self._send_json({"choices": [{"message": {"content": content}}]})
+
+        def _stream(self, path: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            # 첫 토큰까지는 지연의 절반, 나머지는 토큰마다 균등하게
+            state.generate(state.llm_latency / 2)
+            per_token = state.llm_latency / 2 / len(STREAM_TOKENS)
+            for tok in STREAM_TOKENS:
+                if path == "/api/chat":
+                    line = json.dumps({"message": {"content": tok}, "done": False}, ensure_ascii=False) + "\n"
+                else:
+                    line = "data: " + json.dumps({"choices": [{"delta": {"content": tok}}]}, ensure_ascii=False) + "\n\n"
+                self._send_chunk(line.encode("utf-8"))
+                state.generate(per_token)
+
+            if path != "/api/chat":
+                self._send_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256   # 동기 클라이언트는 요청마다 새 커넥션 → backlog 넉넉히
+
+
+def start_stub_upstreams(
+    spring_port: int = 18080,
+    ollama_port: int = 21434,
+    llm_latency: float = 0.3,
+    llm_parallel: int = 4,
+) -> StubState:
+    """
+    백그라운드 스레드로 두 서버 기동
+    → OLLAMA_BASE_URL / SPRING_BASE_URL 을 이 주소로 맞추고 앱을 import 할 것
+    """
+    state = StubState(np.load(IDS_PATH), llm_latency, llm_parallel)
+    handler = _make_handler(state)
+
+    for port in (spring_port, ollama_port):
+        server = _Server(("127.0.0.1", port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spring-port", type=int, default=18080)
+    parser.add_argument("--ollama-port", type=int, default=21434)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-parallel", type=int, default=4, help="0 이면 무제한")
+    args = parser.parse_args()
+
+    start_stub_upstreams(args.spring_port, args.ollama_port, args.llm_latency_ms / 1000, args.llm_parallel)
+    print(f"stub spring :{args.spring_port}, ollama :{args.ollama_port}")
+    while True:
+        time.sleep(3600)
@@ -0,0 +1,59 @@
+import numpy as np
+
+# 벤치마크용 가짜 카탈로그 (Spring 없이 실행)
+INGREDIENT_VOCAB = [
+    "돼지고기", "소고기", "닭고기", "달걀", "계란", "대파", "쪽파", "양파", "마늘",
+    "청양고추", "홍고추", "김치", "두부", "감자", "당근", "애호박", "버섯", "쌀",
+    "국수", "라면", "파스타", "새우", "오징어", "조개", "치즈", "버터", "우유",
+    "간장", "된장", "고추장", "설탕", "참기름", "깨", "시금치", "콩나물", "어묵",
+]
+SPICY_VOCAB = ["고춧가루", "고추장", "후추", "소금", "식초", "올리고당", "맛술"]
+CATEGORY_VOCAB = [
+    "밑반찬", "메인반찬", "국-탕", "찌개", "면", "파스타", "밥", "볶음밥", "덮밥",
+    "양식", "샐러드", "빵", "떡볶이", "간식", "디저트", "기타",
+]
+
+
+def make_catalog(n: int, seed: int = 0):
+    """
+    n개 레시피 + recipe_ids + 카테고리 맵 생성
+    """
+    rng = np.random.default_rng(seed)
+    recipe_ids = np.arange(1, n + 1, dtype=np.int32)
+
+    recipes = {}
+    categories = {}
+    for rid in recipe_ids:
+        rid = int(rid)
+        ing = rng.choice(INGREDIENT_VOCAB, size=rng.integers(3, 9), replace=False)
+        spicy = rng.choice(SPICY_VOCAB, size=rng.integers(0, 4), replace=False)
+        recipes[rid] = {
+            "recipeId": rid,
+            "name": f"레시피{rid}",
+            "ingredient": " ".join(f"{x} {rng.integers(1, 300)}g" for x in ing),
+            "spicyIngredient": " ".join(spicy),
+            "method": "볶는다 끓인다",
+        }
+        categories[str(rid)] = list(
+            rng.choice(CATEGORY_VOCAB, size=rng.integers(1, 3), replace=False)
+        )
+
+    return recipe_ids, recipes, categories
+
+
+def make_vectors(n: int, dim: int = 768, seed: int = 0, dtype=np.float32):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim), dtype=np.float32).astype(dtype, copy=False)
+
+
+def make_clustered_vectors(n: int, dim: int = 768, n_topics: int = 200, noise: float = 0.6, seed: int = 0):
+    """
+    주제(요리 종류)별로 뭉친 임베딩 흉내 (정규화된 float32)
+    """
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim), dtype=np.float32)
+    labels = rng.integers(0, n_topics, size=n)
+
+    vectors = topics[labels] + noise * rng.standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors, labels
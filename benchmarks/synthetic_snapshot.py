@@ -0,0 +1,28 @@
+import numpy as np
+
+from app.services.ann_index import IVFIndex
+from app.services.category_index import CategoryIndex
+from app.services.category_service import CategoryTable
+from app.services.ingredient_index import IngredientIndex
+from app.services.lexical_index import LexicalIndex
+from app.services.recipe_snapshot import RecipeSnapshot
+from benchmarks.synthetic import make_catalog, make_clustered_vectors
+
+
+class SyntheticSnapshot(RecipeSnapshot):
+    """
+    파일 / Spring 없이 만든 snapshot (검색에 쓰는 필드만)
+    """
+
+    def __init__(self, n: int, dim: int, ann: bool = False):
+        self.version = 0
+        self.recipe_ids, self.recipes, category_map = make_catalog(n)
+        self.recipe_vectors, self.topics = make_clustered_vectors(n, dim)
+
+        self._id_order = np.argsort(self.recipe_ids, kind="stable")
+        self._sorted_ids = self.recipe_ids[self._id_order]
+
+        self.ann_index = IVFIndex.build(self.recipe_vectors) if ann else None
+        self.category_index = CategoryIndex(self.recipe_ids, CategoryTable(category_map))
+        self.ingredient_index = IngredientIndex(self.recipe_ids, self.recipes)
+        self.lexical_index = LexicalIndex.build(self.recipe_ids, self.recipes)
@@ -0,0 +1,29 @@
+import argparse
+import time
+
+from app.services.ann_index import ANN_PATH, IVFIndex, default_nlist
+from app.services.vector_store import load_recipe_vectors
+
+
+def build_ann_index(nlist: int | None = None):
+    """
+    recipe_vectors.npy 옆에 IVF 인덱스(recipe_ivf.npz) 생성
+    벡터를 다시 만들면 이것도 다시 만들어야 함 (recipe_ids 가 다르면 서버가 무시)
+    """
+    recipe_vectors, recipe_ids, _ = load_recipe_vectors()
+    nlist = nlist or default_nlist(len(recipe_vectors))
+
+    start = time.perf_counter()
+    index = IVFIndex.build(recipe_vectors, nlist=nlist, recipe_ids=recipe_ids)
+    index.save(ANN_PATH)
+
+    print(f"✅ ANN 인덱스 생성 완료: rows={index.count}, nlist={index.nlist}, "
+          f"{time.perf_counter() - start:.1f}s → {ANN_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nlist", type=int, default=None, help="클러스터 수 (기본: 4·√N)")
+    args = parser.parse_args()
+
+    build_ann_index(args.nlist)
@@ -0,0 +1,43 @@
+import argparse
+import time
+
+import numpy as np
+
+from app.services.lexical_index import LEXICAL_PATH, LexicalIndex
+from app.services.recipe_store import recipe_id_of
+from app.services.vector_store import IDS_PATH
+from models.recipe_loader_spring import iter_recipes_from_spring
+
+
+def build_lexical_index(page_size: int = 1000):
+    """
+    recipe_ids.npy 옆에 BM25 역색인(recipe_bm25.npz) 생성
+    행 순서는 벡터 파일과 같음 → 벡터를 다시 만들면 이것도 다시 만들어야 함 (ids 가 다르면 서버가 무시)
+    """
+    recipe_ids = np.load(IDS_PATH)
+
+    recipes = {}
+    for page in iter_recipes_from_spring(page_size):
+        for r in page:
+            rid = recipe_id_of(r)
+            if rid is not None:
+                recipes[rid] = r
+
+    missing = sum(1 for rid in recipe_ids if int(rid) not in recipes)
+    if missing:
+        print(f"⚠ 카탈로그에 없는 레시피 {missing}개 → 빈 문서로 색인")
+
+    start = time.perf_counter()
+    index = LexicalIndex.build(recipe_ids, recipes)
+    index.save(LEXICAL_PATH)
+
+    print(f"✅ BM25 인덱스 생성 완료: rows={index.count}, terms={len(index)}, "
+          f"postings={len(index.rows)}, {time.perf_counter() - start:.1f}s → {LEXICAL_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    build_lexical_index(args.page_size)
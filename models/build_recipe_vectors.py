@@ -1,39 +1,259 @@
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import time
+
 import numpy as np
-from app.services.embed_service import get_embedding
-from models.recipe_loader_spring import get_all_recipes_from_spring
+from app.services.ann_index import ANN_PATH
+from app.services.lexical_index import LEXICAL_PATH
+from app.services.recipe_store import recipe_id_of
+from app.services.vector_store import (
+    HASHES_PATH,
+    IDS_PATH,
+    VECTORS_PATH,
+    ids_digest,
+    l2_normalize,
+    meta_path,
+    vectors_digest,
+)
+from models.recipe_loader_spring import iter_recipes_from_spring
 
-def build_recipe_vectors():
-    recipes = get_all_recipes_from_spring()
-    print(f"레시피 개수: {len(recipes)}")
+MODEL_NAME = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+DTYPES = {"float32": np.float32, "float16": np.float16}
 
-    if not recipes:
-        raise RuntimeError("❌ Spring에서 레시피를 불러오지 못했습니다.")
+BATCH_SIZE = 256
+PAGE_SIZE = 1000
+
+
+# --------------------------------------------------------
+# 저장 (원자적 교체)
+# --------------------------------------------------------
+def _atomic_save_npy(path: str, array: np.ndarray):
+    """
+    임시 파일에 쓴 뒤 os.replace → 읽는 쪽은 이전 파일 또는 새 파일만 본다
+    (Linux 에서는 서버가 mmap 으로 열어 둔 이전 파일도 그대로 유효,
+     Windows 는 열려 있는 파일을 교체하지 못하므로 서버를 내린 뒤 빌드)
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _atomic_save_json(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save_recipe_vectors(
+    vectors: np.ndarray,
+    ids: np.ndarray,
+    dtype: str = "float32",
+    text_hashes: np.ndarray | None = None,
+):
+    """
+    L2 정규화 + dtype 변환 후 저장, 메타데이터(meta.json) 함께 기록
+    → 서버는 mmap 으로 열고 내적만으로 코사인 유사도 계산
+    meta.json 을 마지막에 교체 → 서버는 meta 의 count / ids / vectors 해시가 파일과 맞을 때만 사용
+    (파일별 교체는 원자적이지만 세트 전체는 아님 → 섞인 상태는 해시로 걸러냄)
+    """
+    vectors = l2_normalize(np.asarray(vectors, dtype=np.float32)).astype(DTYPES[dtype])
+    ids = np.asarray(ids, dtype=np.int32)
+
+    _atomic_save_npy(VECTORS_PATH, vectors)
+    _atomic_save_npy(IDS_PATH, ids)
+    if text_hashes is not None:
+        _atomic_save_npy(HASHES_PATH, np.asarray(text_hashes, dtype=np.uint64))
+
+    meta = {
+        "model": MODEL_NAME,
+        "dtype": dtype,
+        "dim": int(vectors.shape[1]),
+        "count": int(vectors.shape[0]),
+        "normalized": True,
+        "ids_sha1": ids_digest(ids),
+        "vectors_sha1": vectors_digest(vectors),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    _atomic_save_json(meta_path(VECTORS_PATH), meta)
+
+    return vectors
+
+
+# --------------------------------------------------------
+# 임베딩 텍스트
+# --------------------------------------------------------
+def recipe_embed_text(r: dict) -> str:
+    return " ".join([
+        r.get("name", "") or "",
+        r.get("ingredient", "") or "",
+        r.get("spicyIngredient", "") or r.get("spicy_ingredient", "") or "",
+        r.get("method", "") or ""
+    ]).strip()
+
+
+def text_hash(text: str) -> int:
+    # 모델 이름까지 포함 → 모델이 바뀌면 전부 다시 임베딩
+    digest = hashlib.sha1(f"{MODEL_NAME}\n{text}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+# --------------------------------------------------------
+# 인코딩 (배치 + 멀티 프로세스)
+# --------------------------------------------------------
+_worker_model = None
+
+
+def _init_worker():
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(MODEL_NAME)
+
+
+def _encode_chunk(texts: list[str]) -> np.ndarray:
+    return np.asarray(_worker_model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+
+
+def encode_texts(texts: list[str], batch_size: int = BATCH_SIZE, workers: int = 1) -> np.ndarray:
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    if workers <= 1:
+        _init_worker()
+        encoded = []
+        for i, chunk in enumerate(chunks, 1):
+            encoded.append(_encode_chunk(chunk))
+            print(f"  … {min(i * batch_size, len(texts))}/{len(texts)}")
+        return np.vstack(encoded)
+
+    # torch 는 fork 와 궁합이 나빠서 spawn 사용, 워커마다 모델 1회 로딩
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker) as pool:
+        encoded = []
+        for i, vecs in enumerate(pool.imap(_encode_chunk, chunks), 1):
+            encoded.append(vecs)
+            print(f"  … {min(i * batch_size, len(texts))}/{len(texts)}")
+    return np.vstack(encoded)
+
+
+# --------------------------------------------------------
+# 빌드
+# --------------------------------------------------------
+def _load_previous() -> dict[int, tuple[int, np.ndarray]]:
+    """
+    이전 빌드의 id → (텍스트 해시, 벡터)
+    mmap 없이 메모리로 읽음 → 같은 파일을 os.replace 로 덮어쓸 때 열린 핸들이 남지 않도록
+    """
+    if not (os.path.exists(HASHES_PATH) and os.path.exists(IDS_PATH)):
+        return {}
+
+    ids = np.load(IDS_PATH)
+    hashes = np.load(HASHES_PATH)
+    vectors = np.load(VECTORS_PATH)
+
+    if not (len(ids) == len(hashes) == len(vectors)):
+        print("⚠ 이전 빌드 파일 행 수 불일치 → 전체 재생성")
+        return {}
+
+    return {int(rid): (int(h), vectors[i]) for i, (rid, h) in enumerate(zip(ids, hashes))}
+
+
+def build_recipe_vectors(
+    dtype: str = "float32",
+    batch_size: int = BATCH_SIZE,
+    workers: int = 1,
+    page_size: int = PAGE_SIZE,
+    incremental: bool = False,
+):
+    previous = _load_previous() if incremental else {}
 
-    vectors = []
     ids = []
+    hashes = []
+    reuse_rows = {}        # 결과 행 번호 → 이전 벡터
+    encode_rows = []       # 새로 임베딩할 행 번호
+    encode_texts_list = []
+
+    seen_ids = set()
+
+    for page in iter_recipes_from_spring(page_size):
+        for r in page:
+            rid = recipe_id_of(r)
+            text = recipe_embed_text(r)
+            # 페이지 경계에서 같은 레시피가 두 번 오면 첫 번째만 (ids 중복 → 행 번호 조회가 어긋남)
+            if rid is None or not text or rid in seen_ids:
+                continue
+            seen_ids.add(rid)
+
+            h = text_hash(text)
+            row = len(ids)
+            ids.append(rid)
+            hashes.append(h)
+
+            prev = previous.get(rid)
+            if prev is not None and prev[0] == h:
+                reuse_rows[row] = prev[1]
+            else:
+                encode_rows.append(row)
+                encode_texts_list.append(text)
 
-    for r in recipes:
-        text = " ".join([
-            r.get("name", ""),
-            r.get("ingredient", "") or "",
-            r.get("spicyIngredient", "") or "",
-            r.get("method", "") or ""
-        ]).strip()
+    print(f"레시피 개수: {len(ids)} (재사용 {len(reuse_rows)}, 새로 임베딩 {len(encode_rows)})")
 
-        if not text:
-            continue
+    if not ids:
+        raise RuntimeError("❌ Spring에서 레시피를 불러오지 못했습니다.")
+
+    new_vectors = encode_texts(encode_texts_list, batch_size, workers)
+    dim = new_vectors.shape[1] if len(encode_rows) else len(next(iter(reuse_rows.values())))
+
+    vectors = np.empty((len(ids), dim), dtype=np.float32)
+    for row, vec in reuse_rows.items():
+        vectors[row] = vec
+    if encode_rows:
+        vectors[encode_rows] = new_vectors
 
-        emb = get_embedding(text)
-        vectors.append(emb)
-        ids.append(int(r["recipeId"]))  # 🔥 Spring 기준
+    vectors = save_recipe_vectors(vectors, np.array(ids), dtype, np.array(hashes, dtype=np.uint64))
 
-    vectors = np.vstack(vectors)
-    ids = np.array(ids, dtype=np.int32)
+    print("✅ 임베딩 생성 완료:", vectors.shape, vectors.dtype)
+    if os.path.exists(ANN_PATH):
+        print("⚠ ANN 인덱스도 다시 만들어야 합니다: python -m models.build_ann_index")
+    if os.path.exists(LEXICAL_PATH):
+        print("⚠ BM25 인덱스도 다시 만들어야 합니다: python -m models.build_lexical_index")
 
-    np.save("models/recipe_vectors.npy", vectors)
-    np.save("models/recipe_ids.npy", ids)
 
-    print("✅ 임베딩 생성 완료:", vectors.shape)
+def convert_recipe_vectors(dtype: str = "float32"):
+    """
+    기존 npy 를 다시 임베딩하지 않고 정규화/dtype 만 변환
+    """
+    vectors = save_recipe_vectors(np.load(VECTORS_PATH), np.load(IDS_PATH), dtype)
+    print("✅ 벡터 변환 완료:", vectors.shape, vectors.dtype)
+
 
 if __name__ == "__main__":
-    build_recipe_vectors()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dtype", choices=list(DTYPES), default="float32")
+    parser.add_argument("--convert", action="store_true", help="기존 벡터 파일만 정규화/변환")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="인코딩 프로세스 수")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--incremental", action="store_true", help="텍스트가 바뀐 레시피만 다시 임베딩")
+    args = parser.parse_args()
+
+    if args.convert:
+        convert_recipe_vectors(args.dtype)
+    else:
+        build_recipe_vectors(
+            args.dtype,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            page_size=args.page_size,
+            incremental=args.incremental,
+        )
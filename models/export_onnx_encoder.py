@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from app.services.onnx_encoder import (
+    ENCODER_CONFIG_FILE,
+    ONNX_COSINE_TOLERANCE,
+    ONNX_MODEL_DIR,
+    ONNX_MODEL_FILE,
+    OnnxEncoder,
+)
+from models.build_recipe_vectors import MODEL_NAME
+
+OPSET = 17
+
+# 원본과 비교할 문장 (질의 / 재료 / 카테고리 키워드 섞어서)
+CHECK_SENTENCES = [
+    "김치찌개 먹고싶어",
+    "얼큰한 국물 요리 추천해줘",
+    "돼지고기 두부 애호박",
+    "냉장고에 계란이랑 대파밖에 없어",
+    "비 오는 날 먹기 좋은 부침개",
+    "다이어트 중인데 가벼운 샐러드",
+    "아이들이 좋아하는 간식",
+    "찌개 얼큰 자작 국물 진한 맛 칼칼한 구수한 깊은맛 한식찌개",
+    "밥",
+    "요리 음식 레시피 한식 집밥",
+]
+
+
+def export_onnx_encoder(out_dir: str = ONNX_MODEL_DIR, tolerance: float = ONNX_COSINE_TOLERANCE):
+    """
+    KR-SBERT → ONNX(fp32) → int8 동적 양자화 → 원본과 코사인 비교
+    오차가 허용 범위 안일 때만 encoder.json 을 기록 (없으면 서버가 onnx 백엔드를 거부)
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+
+    os.makedirs(out_dir, exist_ok=True)
+    config_path = os.path.join(out_dir, ENCODER_CONFIG_FILE)
+    if os.path.exists(config_path):
+        os.remove(config_path)
+
+    st_model = SentenceTransformer(MODEL_NAME, device="cpu")
+    transformer = st_model[0]
+    tokenizer = transformer.tokenizer
+    auto_model = transformer.auto_model.eval()
+
+    # ----------------------------------------------------
+    # 1) ONNX export (batch / 길이 가변)
+    # ----------------------------------------------------
+    dummy = tokenizer(["예시 문장입니다", "두 번째"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "seq"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "seq"}
+
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    start = time.perf_counter()
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model,
+            tuple(dummy[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET,
+            dynamo=False,
+        )
+    print(f"✅ ONNX export: {fp32_path} ({time.perf_counter() - start:.1f}s)")
+
+    # ----------------------------------------------------
+    # 2) int8 동적 양자화 (가중치만, 활성값은 실행 시 스케일 계산)
+    # ----------------------------------------------------
+    int8_path = os.path.join(out_dir, ONNX_MODEL_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"✅ int8 양자화: {os.path.getsize(fp32_path) / 2**20:.0f}MiB → "
+          f"{os.path.getsize(int8_path) / 2**20:.0f}MiB")
+
+    tokenizer.save_pretrained(out_dir)
+
+    # ----------------------------------------------------
+    # 3) 원본과 비교 → 통과하면 encoder.json 기록
+    # ----------------------------------------------------
+    config = {
+        "model": MODEL_NAME,
+        "onnx_file": ONNX_MODEL_FILE,
+        "opset": OPSET,
+        "quantization": "dynamic-int8",
+        "pooling": "cls" if st_model[1].pooling_mode_cls_token else "mean",
+        "normalize": any(isinstance(module, Normalize) for module in st_model),
+        "max_seq_length": st_model.max_seq_length,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "min_cosine": 1.0,
+    }
+
+    # 검증용으로 먼저 한 번 로드 (min_cosine 은 아직 모름 → tolerance 0)
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    onnx_model = OnnxEncoder(MODEL_NAME, out_dir, tolerance=0.0)
+
+    expected = np.asarray(st_model.encode(CHECK_SENTENCES), dtype=np.float32)
+    actual = onnx_model.encode(CHECK_SENTENCES)
+    cosine = (expected * actual).sum(axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    )
+    config["min_cosine"] = round(float(cosine.min()), 6)
+    config["mean_cosine"] = round(float(cosine.mean()), 6)
+    config["built_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    if config["min_cosine"] < tolerance:
+        os.remove(config_path)
+        raise RuntimeError(f"❌ 원본과 차이가 큼: min_cosine={config['min_cosine']} < {tolerance}")
+
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    os.remove(fp32_path)
+    print(f"✅ ONNX 인코더 완료: min_cosine={config['min_cosine']}, mean_cosine={config['mean_cosine']} "
+          f"→ {out_dir} (EMBED_BACKEND=onnx 로 사용)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--tolerance", type=float, default=ONNX_COSINE_TOLERANCE, help="최소 코사인 유사도")
+    args = parser.parse_args()
+
+    export_onnx_encoder(args.out_dir, args.tolerance)
@@ -1,7 +1,7 @@
 from typing import List, Dict
 import requests
 
-BACKEND_URL = "http://localhost:8080"
+from app.services.upstream import upstream
 
 
 def get_recipe_by_id(recipe_id: int) -> Dict | None:
@@ -11,8 +11,8 @@ def get_recipe_by_id(recipe_id: int) -> Dict | None:
     recipe_id = int(recipe_id)
 
     try:
-        resp = requests.get(
-            f"{BACKEND_URL}/api/recipes/{recipe_id}",
+        resp = upstream("spring").get(
+            f"/api/recipes/{recipe_id}",
             timeout=3
         )
     except requests.RequestException as e:
@@ -25,8 +25,8 @@ def get_recipe_by_id(recipe_id: int) -> Dict | None:
     return resp.json()
 
 def get_categories_by_recipe_id(recipe_id: int) -> List[str]:
-    resp = requests.get(
-        f"{BACKEND_URL}/api/recipes/{recipe_id}/categories",
+    resp = upstream("spring").get(
+        f"/api/recipes/{recipe_id}/categories",
         timeout=3
     )
 
@@ -36,8 +36,8 @@ def get_categories_by_recipe_id(recipe_id: int) -> List[str]:
     return resp.json()   # ["국-탕", "찌개"]
 
 def load_all_recipe_categories() -> Dict[int, List[str]]:
-    resp = requests.get(
-        f"{BACKEND_URL}/api/recipes/categories",
+    resp = upstream("spring").get(
+        "/api/recipes/categories",
         timeout=5
     )
 
@@ -46,9 +46,31 @@ def load_all_recipe_categories() -> Dict[int, List[str]]:
 
     return resp.json()
 
+def fetch_all_recipe_categories(etag: str | None = None):
+    """
+    카테고리 맵 조건부 조회 (ETag)
+    - 변경 없음(304) → (None, etag)
+    - 변경 있음(200) → (map, 새 etag)
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+
+    resp = upstream("spring").get(
+        "/api/recipes/categories",
+        headers=headers,
+        timeout=5
+    )
+
+    if resp.status_code == 304:
+        return None, etag
+
+    resp.raise_for_status()
+    return resp.json(), resp.headers.get("ETag")
+
 def get_all_recipes() -> List[Dict]:
-    resp = requests.get(
-        f"{BACKEND_URL}/api/recipes",
+    resp = upstream("spring").get(
+        "/api/recipes",
         timeout=5
     )
 
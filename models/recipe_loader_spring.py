@@ -1,9 +1,68 @@
-import requests
 from typing import List, Dict
 
-BACKEND_URL = "http://localhost:8080"
+from app.services.upstream import upstream
 
 def get_all_recipes_from_spring():
-    resp = requests.get("http://localhost:8080/api/recipes/all", timeout=20)
+    resp = upstream("spring").get("/api/recipes/all", timeout=20)
     resp.raise_for_status()
-    return resp.json()
\ No newline at end of file
+    return resp.json()
+
+
+def fetch_all_recipes_from_spring(etag: str | None = None):
+    """
+    전체 레시피 조건부 조회 (ETag)
+    - 변경 없음(304) → (None, etag)
+    - 변경 있음(200) → (recipes, 새 etag)
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+
+    resp = upstream("spring").get(
+        "/api/recipes/all",
+        headers=headers,
+        timeout=20
+    )
+
+    if resp.status_code == 304:
+        return None, etag
+
+    resp.raise_for_status()
+    return resp.json(), resp.headers.get("ETag")
+
+
+def iter_recipes_from_spring(page_size: int = 500):
+    """
+    레시피를 페이지 단위로 조회 (/api/recipes?page=&size=)
+    - Spring Page 응답({"content": [...], "last": bool})과 리스트 응답 모두 지원
+    - 서버가 페이지 파라미터를 무시하고 전체를 주면 한 번만 반환
+      (리스트 응답이 딱 page_size 개여도 다음 페이지 첫 항목이 같으면 거기서 멈춤)
+    """
+    page = 0
+    prev_first = None
+    while True:
+        resp = upstream("spring").get(
+            "/api/recipes",
+            params={"page": page, "size": page_size},
+            timeout=20
+        )
+        resp.raise_for_status()
+        data = resp.json()
+
+        if isinstance(data, dict):
+            items = data.get("content", [])
+            last = data.get("last", len(items) < page_size)
+        else:
+            items = data
+            last = len(items) != page_size
+
+        if not items or items[0] == prev_first:
+            return
+        yield items
+
+        if last:
+            return
+
+        prev_first = items[0]
+
+        page += 1